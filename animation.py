@@ -0,0 +1,122 @@
+"""Keyframe animation engine for Yadon Desktop Pet"""
+
+import os
+import json
+from collections import namedtuple
+
+from config import ANIMATIONS_FILE
+from animation_data import ANIMATIONS
+from sprite_cache import get_sprite
+from clock import get_clock
+from workers import debug_log
+
+# patch is a tuple of (row, column, color) so frames can key the sprite cache
+Frame = namedtuple('Frame', ['duration', 'face_offset', 'patch'])
+
+
+class Animation:
+    def __init__(self, name, frames, loop):
+        self.name = name
+        self.frames = frames
+        self.loop = loop
+        self.length = sum(frame.duration for frame in frames)
+
+
+def parse_animation(name, data):
+    frames = []
+    for frame in data['frames']:
+        patch = tuple(tuple(change) for change in frame.get('patch', ()))
+        frames.append(Frame(int(frame['duration']), int(frame.get('face_offset', 0)), patch))
+    if not frames or any(frame.duration <= 0 for frame in frames):
+        raise ValueError(f"animation {name} needs frames with positive durations")
+    return Animation(name, frames, bool(data.get('loop', False)))
+
+
+_animations = None
+
+
+def load_animations():
+    """Return all named animations, built-in ones overridden by ANIMATIONS_FILE"""
+    global _animations
+    if _animations is not None:
+        return _animations
+    definitions = dict(ANIMATIONS)
+    path = os.path.expanduser(ANIMATIONS_FILE)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                definitions.update(json.load(f))
+        except Exception as e:
+            _debug_log(f"Error reading {ANIMATIONS_FILE}: {e}")
+    _animations = {}
+    for name, data in definitions.items():
+        try:
+            _animations[name] = parse_animation(name, data)
+        except (KeyError, TypeError, ValueError) as e:
+            _debug_log(f"Skipping animation {name}: {e}")
+    return _animations
+
+
+def preload_frames(variant, pixel_size, device_pixel_ratio):
+    """Render every frame of every animation into the sprite cache"""
+    for animation in load_animations().values():
+        for frame in animation.frames:
+            get_sprite(variant, frame.face_offset, pixel_size, device_pixel_ratio, frame.patch)
+
+
+def damaged_rows(old_frame, new_frame, face_rows):
+    """Number of sprite rows from the top that differ between two frames"""
+    rows = 0
+    if old_frame.face_offset != new_frame.face_offset:
+        rows = face_rows
+    if old_frame.patch != new_frame.patch:
+        for row, _, _ in old_frame.patch + new_frame.patch:
+            rows = max(rows, row + 1)
+    return rows
+
+
+class AnimationPlayer:
+    """Play one animation at a time, advancing by elapsed time"""
+    def __init__(self, animations, name='idle', clock=None):
+        self.animations = animations
+        self.clock = clock or get_clock()
+        self.speed = 1.0  # animation milliseconds per real millisecond
+        self.play(name)
+
+    def play(self, name, now=None):
+        self.animation = self.animations.get(name) or self.animations['idle']
+        self.position = 0.0  # milliseconds into the animation
+        self.last_time = self.clock.now() if now is None else now
+
+    def advance(self, now=None):
+        """Move the playhead forward by the time since the last call"""
+        now = self.clock.now() if now is None else now
+        self.position += (now - self.last_time) * 1000 * self.speed
+        self.last_time = now
+        if self.animation.loop:
+            self.position %= self.animation.length
+
+    def finished(self):
+        return not self.animation.loop and self.position >= self.animation.length
+
+    def current_frame(self):
+        elapsed = 0
+        for frame in self.animation.frames:
+            elapsed += frame.duration
+            if self.position < elapsed:
+                return frame
+        return self.animation.frames[-1]
+
+    def time_to_next_frame(self):
+        """Real milliseconds until the current frame ends"""
+        elapsed = 0
+        for frame in self.animation.frames:
+            elapsed += frame.duration
+            if self.position < elapsed:
+                return (elapsed - self.position) / self.speed
+        return 0
+
+
+def _debug_log(message):
+    """Write debug message to log file"""
+    debug_log(message)
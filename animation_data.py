@@ -0,0 +1,74 @@
+"""Keyframe animation data for Yadon Desktop Pet
+
+Each animation is a list of frames. A frame has a duration in
+milliseconds, a face offset (the face rows move by that many logical
+pixels) and a patch: (row, column, color) changes applied on top of the
+base sprite. Colors are either '#RRGGBB' or a color role from
+COLOR_SCHEMES ('body', 'head', 'accent').
+
+Extra or replacement animations can be put in ANIMATIONS_FILE as JSON in
+the same shape.
+"""
+
+BLACK = '#000000'
+
+# Eyes drawn as flat lines
+EYES_CLOSED = [
+    (4, 3, BLACK), (4, 4, BLACK), (4, 5, BLACK),
+    (4, 9, BLACK), (4, 10, BLACK), (4, 11, BLACK),
+]
+
+# Taller eyes
+EYES_WIDE = [(3, 4, BLACK), (3, 10, BLACK)]
+
+# Mouth opened below the mouth line
+MOUTH_OPEN = [(8, 4, BLACK), (8, 5, 'head'), (8, 6, 'head'), (8, 7, 'head'),
+              (8, 8, 'head'), (8, 9, 'head'), (8, 10, BLACK)]
+MOUTH_SMALL = [(8, 6, 'head'), (8, 7, 'head'), (8, 8, 'head')]
+
+ANIMATIONS = {
+    # The original face wobble
+    'idle': {
+        'loop': True,
+        'frames': [
+            {'duration': 500, 'face_offset': 1},
+            {'duration': 500, 'face_offset': 0},
+            {'duration': 500, 'face_offset': -1},
+            {'duration': 500, 'face_offset': 0},
+        ],
+    },
+    'blink': {
+        'loop': False,
+        'frames': [
+            {'duration': 150, 'face_offset': 0, 'patch': EYES_CLOSED},
+            {'duration': 100, 'face_offset': 0},
+        ],
+    },
+    'yawn': {
+        'loop': False,
+        'frames': [
+            {'duration': 300, 'face_offset': 0, 'patch': MOUTH_SMALL},
+            {'duration': 1200, 'face_offset': 0, 'patch': EYES_CLOSED + MOUTH_OPEN},
+            {'duration': 300, 'face_offset': 0, 'patch': EYES_CLOSED + MOUTH_SMALL},
+            {'duration': 200, 'face_offset': 0},
+        ],
+    },
+    # Looped while the Claude session is idle
+    'sleep': {
+        'loop': True,
+        'frames': [
+            {'duration': 2000, 'face_offset': 0, 'patch': EYES_CLOSED},
+            {'duration': 2000, 'face_offset': 1, 'patch': EYES_CLOSED},
+        ],
+    },
+    # Played when a hook arrives
+    'surprised': {
+        'loop': False,
+        'frames': [
+            {'duration': 120, 'face_offset': -1, 'patch': EYES_WIDE},
+            {'duration': 120, 'face_offset': 1, 'patch': EYES_WIDE},
+            {'duration': 600, 'face_offset': 0, 'patch': EYES_WIDE + MOUTH_SMALL},
+            {'duration': 200, 'face_offset': 0},
+        ],
+    },
+}
@@ -0,0 +1,128 @@
+"""Per-pet speech bubble queue for Yadon Desktop Pet
+
+Messages are shown one at a time by priority. Identical messages are
+coalesced into a single "×N" bubble, each bubble stays up for at least the
+minimum dwell time, and under overload the oldest low-priority messages
+are dropped so the amount of UI work stays bounded.
+"""
+
+from PyQt6.QtCore import QObject
+
+from config import BUBBLE_QUEUE_MAX
+from settings import settings
+from clock import get_clock
+from workers import debug_log
+
+# Higher number wins
+PRIORITY_CHATTER = 0  # random messages
+PRIORITY_NOTIFICATION = 1  # notification hooks, welcome/goodbye
+PRIORITY_STOP = 2  # stop hooks
+
+
+class BubbleEvent:
+    def __init__(self, message, bubble_type, priority):
+        self.message = message
+        self.bubble_type = bubble_type
+        self.priority = priority
+        self.count = 1
+
+    def key(self):
+        return (self.message, self.bubble_type)
+
+    def text(self):
+        if self.count > 1:
+            return f"{self.message} ×{self.count}"
+        return self.message
+
+
+class BubbleQueue(QObject):
+    """Decide which message a pet shows and when"""
+    def __init__(self, show_bubble, hide_bubble, clock=None):
+        super().__init__()
+        self.clock = clock or get_clock()
+        self.show_bubble = show_bubble  # callback(text, bubble_type)
+        self.hide_bubble = hide_bubble  # callback()
+        self.pending = []
+        self.current = None
+        self.shown_at = 0.0
+        self.dropped = 0
+
+        self.timer = self.clock.timer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.pump)
+
+    def push(self, message, bubble_type='normal', priority=PRIORITY_CHATTER):
+        """Queue a message for display"""
+        event = BubbleEvent(message, bubble_type, priority)
+
+        # Same message already on screen: just bump its counter
+        if self.current and self.current.key() == event.key():
+            self.current.count += 1
+            self.show_bubble(self.current.text(), self.current.bubble_type)
+            return
+
+        # Same message already waiting: coalesce
+        for queued in self.pending:
+            if queued.key() == event.key():
+                queued.count += 1
+                queued.priority = max(queued.priority, priority)
+                return
+
+        self.pending.append(event)
+        if len(self.pending) > BUBBLE_QUEUE_MAX:
+            self.drop_one()
+        self.pump()
+
+    def drop_one(self):
+        """Drop the oldest event with the lowest priority"""
+        lowest = min(event.priority for event in self.pending)
+        for i, event in enumerate(self.pending):
+            if event.priority == lowest:
+                del self.pending[i]
+                self.dropped += 1
+                self._debug_log(f"Bubble queue full, dropped: {event.message}")
+                return
+
+    def pump(self):
+        """Show the next message or hide the bubble when its time is up"""
+        now = self.clock.now()
+        elapsed_ms = (now - self.shown_at) * 1000
+
+        if self.current:
+            # Rate limit: nothing replaces a bubble before its minimum dwell
+            min_dwell = settings().get('bubble_min_dwell')
+            if self.pending and elapsed_ms < min_dwell:
+                self.timer.start(int(min_dwell - elapsed_ms) + 1)
+                return
+            display_time = settings().get('bubble_display_time')
+            if not self.pending and elapsed_ms < display_time:
+                self.timer.start(int(display_time - elapsed_ms) + 1)
+                return
+
+        if not self.pending:
+            self.current = None
+            self.hide_bubble()
+            return
+
+        # Highest priority first, oldest first within a priority
+        best = max(range(len(self.pending)), key=lambda i: (self.pending[i].priority, -i))
+        self.current = self.pending.pop(best)
+        self.shown_at = now
+        self.show_bubble(self.current.text(), self.current.bubble_type)
+
+        if self.pending:
+            self.timer.start(settings().get('bubble_min_dwell'))
+        else:
+            self.timer.start(settings().get('bubble_display_time'))
+
+    def depth(self):
+        return len(self.pending)
+
+    def clear(self):
+        self.timer.stop()
+        self.pending = []
+        self.current = None
+
+    def _debug_log(self, message):
+        """Write debug message to log file"""
+        debug_log(message)
@@ -0,0 +1,245 @@
+"""Time and process sources for Yadon Desktop Pet
+
+Everything that waits (timers, single shots, "how long ago") asks a
+clock, and the process scan asks a process source, instead of calling
+QTimer, time.monotonic() or `ps` directly. The app uses SystemClock and
+PsProcessSource. fast_forward.py swaps in SimulatedClock and
+FakeProcessSource to run a day of sessions and hooks in seconds with
+exact, repeatable wakeup counts.
+"""
+
+import time
+import heapq
+import itertools
+
+from PyQt6.QtCore import QTimer
+
+
+class SystemClock:
+    """Real time and real Qt timers"""
+    # Background work (process scans, hook polls) runs on the thread pool
+    inline = False
+
+    def now(self):
+        """Monotonic seconds"""
+        return time.monotonic()
+
+    def wall(self):
+        """Seconds since the epoch, for timestamps"""
+        return time.time()
+
+    def timer(self, parent=None):
+        return QTimer(parent)
+
+    def single_shot(self, msec, callback):
+        QTimer.singleShot(msec, callback)
+
+
+class SimulatedSignal:
+    """The connect/disconnect/emit part of a Qt signal"""
+    def __init__(self):
+        self.slots = []
+
+    def connect(self, slot):
+        self.slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self.slots.clear()
+        elif slot in self.slots:
+            self.slots.remove(slot)
+        else:
+            raise TypeError('slot is not connected')
+
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class SimulatedTimer:
+    """The subset of QTimer the pets use, firing on a SimulatedClock"""
+    def __init__(self, clock, parent=None):
+        self.clock = clock
+        self.parent = parent
+        self.timeout = SimulatedSignal()
+        self.interval_ms = 0
+        self.single_shot = False
+        self.due = None  # virtual seconds, None while stopped
+        self.generation = 0  # bumped on every start/stop so stale heap entries are skipped
+
+    def setInterval(self, msec):
+        self.interval_ms = int(msec)
+        if self.due is not None:
+            self.start()
+
+    def interval(self):
+        return self.interval_ms
+
+    def setSingleShot(self, single_shot):
+        self.single_shot = single_shot
+
+    def isSingleShot(self):
+        return self.single_shot
+
+    def setTimerType(self, timer_type):
+        pass
+
+    def start(self, msec=None):
+        if msec is not None:
+            self.interval_ms = int(msec)
+        self.generation += 1
+        self.due = self.clock.current + self.interval_ms / 1000
+        self.clock.schedule(self.due, self, self.generation)
+
+    def stop(self):
+        self.generation += 1
+        self.due = None
+
+    def isActive(self):
+        return self.due is not None
+
+    def remainingTime(self):
+        if self.due is None:
+            return -1
+        return max(0, round((self.due - self.clock.current) * 1000))
+
+    def fire(self, generation):
+        if generation != self.generation or self.due is None:
+            return False
+        if self.single_shot:
+            self.due = None
+        else:
+            # Repeating timers keep their phase, like QTimer
+            self.due += max(self.interval_ms, 1) / 1000
+            self.clock.schedule(self.due, self, self.generation)
+        self.timeout.emit()
+        return True
+
+    def name(self):
+        slot = self.timeout.slots[0] if self.timeout.slots else None
+        return getattr(slot, '__qualname__', None) or repr(slot)
+
+
+class SingleShot:
+    """A one-off callback scheduled with single_shot()"""
+    def __init__(self, callback):
+        self.callback = callback
+
+    def fire(self, generation):
+        self.callback()
+        return True
+
+    def name(self):
+        return getattr(self.callback, '__qualname__', None) or repr(self.callback)
+
+
+class SimulatedClock:
+    """Virtual time that only moves when advance() is called
+
+    Timers fire in due order. Every distinct due time that fires anything
+    counts as one wakeup, the way coinciding Qt timers share one event
+    loop iteration.
+    """
+    # Run background work inline so its results land at a known virtual time
+    inline = True
+
+    def __init__(self, epoch=None):
+        self.current = 0.0  # virtual seconds since the simulation started
+        self.epoch = time.time() if epoch is None else epoch
+        self.queue = []  # heap of (due, sequence, timer, generation)
+        self.sequence = itertools.count()
+        self.wakeups = 0
+        self.fired = 0
+        self.fired_by_name = {}
+        self.on_wakeup = None  # called after each wakeup, e.g. to let Qt paint
+
+    def now(self):
+        return self.current
+
+    def wall(self):
+        return self.epoch + self.current
+
+    def timer(self, parent=None):
+        return SimulatedTimer(self, parent)
+
+    def single_shot(self, msec, callback):
+        self.schedule(self.current + msec / 1000, SingleShot(callback), None)
+
+    def schedule(self, due, timer, generation):
+        heapq.heappush(self.queue, (due, next(self.sequence), timer, generation))
+
+    def advance(self, seconds):
+        """Fire everything due in the next seconds of virtual time"""
+        end = self.current + seconds
+        while self.queue and self.queue[0][0] <= end:
+            due = self.queue[0][0]
+            self.current = max(self.current, due)
+            woke = False
+            # Everything due at this instant, including what it schedules for now
+            while self.queue and self.queue[0][0] <= self.current:
+                _, _, timer, generation = heapq.heappop(self.queue)
+                if timer.fire(generation):
+                    woke = True
+                    self.fired += 1
+                    name = timer.name()
+                    self.fired_by_name[name] = self.fired_by_name.get(name, 0) + 1
+            if woke:
+                self.wakeups += 1
+                if self.on_wakeup:
+                    self.on_wakeup()
+        self.current = end
+
+
+class PsProcessSource:
+    """Claude sessions from `ps aux`"""
+    def scan(self):
+        # Imported here to avoid a circular import with process_monitor
+        from process_monitor import scan_processes
+        return scan_processes()
+
+
+class FakeProcessSource:
+    """Claude sessions that exist only in memory"""
+    # Above PID_MAX_LIMIT (4194304 on 64-bit Linux), so /proc lookups never
+    # find a real process
+    FIRST_PID = 5000000
+
+    def __init__(self):
+        self.pids = []
+        self.next_pid = self.FIRST_PID
+        self.scans = 0
+
+    def spawn(self):
+        pid = self.next_pid
+        self.next_pid += 1
+        self.pids.append(pid)
+        return pid
+
+    def kill(self, pid):
+        if pid in self.pids:
+            self.pids.remove(pid)
+
+    def scan(self):
+        from workers import ProcessScan
+        self.scans += 1
+        return ProcessScan([str(pid) for pid in self.pids], bool(self.pids))
+
+
+_clock = None
+_process_source = None
+
+
+def get_clock():
+    """Return the shared clock, a SystemClock unless a test swapped it"""
+    global _clock
+    if _clock is None:
+        _clock = SystemClock()
+    return _clock
+
+
+def get_process_source():
+    """Return the shared process source, `ps` unless a test swapped it"""
+    global _process_source
+    if _process_source is None:
+        _process_source = PsProcessSource()
+    return _process_source
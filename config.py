@@ -66,19 +66,52 @@ HOOK_RESPONSES = {
     'stop:': "ひとやすみ　する　やぁん！",
     'notification:': "びびっと　きた　やぁん！"
 }
+# Structured hooks (JSON from hook_client): asking to use a tool, and
+# phrases in Claude's notification message
+HOOK_TOOL_RESPONSE = "{tool}　つかって　いい？　やぁん"
+HOOK_MESSAGE_RESPONSES = {
+    'waiting for your input': "まってる　やぁん…",
+}
 
 # UI Constants
-PIXEL_SIZE = 4
+PIXEL_SIZE = 4  # Default; can be changed per run with --pixel-size
+PID_LABEL_HEIGHT = 20  # Extra space for PID display
 WINDOW_WIDTH = 16 * PIXEL_SIZE
-WINDOW_HEIGHT = 16 * PIXEL_SIZE + 20  # Extra space for PID display
+WINDOW_HEIGHT = 16 * PIXEL_SIZE + PID_LABEL_HEIGHT
 
 # Animation Constants
-FACE_ANIMATION_INTERVAL = 500  # milliseconds
+FACE_ANIMATION_INTERVAL = 500  # milliseconds (idle frame length at normal speed)
+# JSON file of extra or replacement animations (see animation_data.py)
+ANIMATIONS_FILE = '~/.config/yadon/animations.json'
 RANDOM_ACTION_MIN_INTERVAL = 45000  # 45 seconds
 RANDOM_ACTION_MAX_INTERVAL = 90000  # 90 seconds
 CLAUDE_CHECK_INTERVAL = 5000  # 5 seconds
 HOOK_CHECK_INTERVAL = 1000  # 1 second
+PROCESS_SCAN_INTERVAL = 5000  # 5 seconds (adds/removes Yadons)
+SCAN_MIN_AGE = 1000  # ms; process scan requests sooner than this reuse the last scan
+# Polls that keep finding nothing new back off up to these intervals (see scheduler.py)
+CLAUDE_CHECK_MAX_INTERVAL = 20000  # ms
+HOOK_CHECK_MAX_INTERVAL = 4000  # ms; the hook socket delivers right away regardless
+PROCESS_SCAN_MAX_INTERVAL = 20000  # ms
+SCHEDULER_SLOT = 250  # ms; due times are rounded up to this grid so wakeups batch
+SCHEDULER_BACKOFF = 2.0  # interval multiplier per idle poll
 MOVEMENT_DURATION = 15000  # 15 seconds (slow movement)
+MOVEMENT_MODE = 'stepped'  # 'stepped' (whole sprite pixels at a low rate) or 'smooth'
+MOVEMENT_STEP_FPS = 6  # maximum steps per second in stepped mode
+
+# Session activity sampling (Linux /proc only)
+SAMPLE_INTERVAL = 2000  # milliseconds between CPU/RSS samples
+SAMPLE_HISTORY = 60  # samples kept per session (2 minutes at the default interval)
+SAMPLE_CHILDREN = False  # include the session's whole process subtree
+BUSY_CPU_PERCENT = 10  # above this the session counts as working
+IDLE_CPU_PERCENT = 1  # below this a sample counts as idle
+IDLE_SAMPLES_BEFORE_DOZE = 30  # consecutive idle samples before Yadon dozes off
+BUSY_ANIMATION_FACTOR = 0.5  # face animation interval multiplier while busy
+
+# Layout: pets fill rows right to left from the bottom-right corner of each screen
+LAYOUT_MARGIN = 20  # pixels from the screen edges
+LAYOUT_SPACING = 10  # pixels between Yadons
+LAYOUT_CELL = 128  # pixels per cell of the overlap index
 
 # Movement Constants
 TINY_MOVEMENT_RANGE = 20  # pixels
@@ -91,6 +124,8 @@ BUBBLE_MIN_WIDTH = 250
 BUBBLE_HEIGHT = 80
 BUBBLE_PADDING = 20
 BUBBLE_DISPLAY_TIME = 5000  # milliseconds
+BUBBLE_MIN_DWELL = 1500  # milliseconds a bubble stays up before a queued one may replace it
+BUBBLE_QUEUE_MAX = 8  # pending bubbles per Yadon before low-priority ones are dropped
 
 # Font Settings
 BUBBLE_FONT_FAMILY = "Monaco"
@@ -115,4 +150,46 @@ HOOK_FILE_PATTERNS = [
 ]
 
 # Debug log location
-DEBUG_LOG = '/tmp/yadon_debug.log'
\ No newline at end of file
+DEBUG_LOG = '/tmp/yadon_debug.log'
+
+# Hook event history (SQLite)
+EVENT_STORE_ENABLED = True
+EVENT_DB = '~/.local/share/yadon/events.db'
+EVENT_FLUSH_INTERVAL = 2.0  # seconds between batched writes
+EVENT_RETENTION_DAYS = 30
+EVENT_MAX_ROWS = 100000
+
+# Runtime control
+# JSON file of setting overrides, e.g. {"hook_interval": 250}; re-read on `ctl reload`
+USER_CONFIG_FILE = '~/.config/yadon/config.json'
+CONTROL_SOCKET = '{runtime_dir}/yadon-control-{uid}.sock'  # runtime_dir is $XDG_RUNTIME_DIR or /tmp; mode 0600
+
+# Event loop watchdog
+WATCHDOG_ENABLED = False  # opt-in: about 9 wakeups/s while on; `yadon_ctl.py watchdog on` arms it at runtime
+WATCHDOG_INTERVAL = 200  # ms between heartbeats on the GUI thread
+STALL_THRESHOLD = 500  # ms the event loop may be blocked before it counts as a stall
+
+# Hook client settings
+HOOK_CLIENT_FILE = '/tmp/claude_hook_{pid}.txt'  # Where the hook client writes events
+HOOK_CLIENT_GENERIC_FILE = '/tmp/claude_hook.txt'  # Used when no Claude ancestor is found
+HOOK_CLIENT_LOG = '/tmp/hook_debug.log'
+HOOK_PID_CACHE = '/tmp/yadon_hook_pids_{uid}.json'
+HOOK_PID_CACHE_SIZE = 64  # entries
+HOOK_INPUT_CHUNK = 4096  # bytes of the hook's stdin JSON read at a time
+HOOK_INPUT_TIMEOUT = 500  # ms to wait for stdin before sending what we have
+HOOK_FIELD_MAX = 200  # characters kept of the event, session, tool and message fields
+
+# Hook socket (datagrams; tried before the hook files, see systemd/)
+HOOK_SOCKET = '{runtime_dir}/yadon-hook-{uid}.sock'  # runtime_dir is $XDG_RUNTIME_DIR or /tmp
+HOOK_SOCKET_MAX_MESSAGE = 4096  # bytes per datagram
+HOOK_INBOX_SIZE = 64  # socket messages kept per Claude PID until its pet reads them
+IDLE_EXIT_TIMEOUT = 600000  # ms without Claude sessions before --idle-exit quits
+
+# Profiling (--profile / YADON_PROFILE=1)
+PROFILE_REPORT = '/tmp/yadon_profile_{pid}.txt'  # written on exit and on SIGUSR1
+PROFILE_TOP = 25  # functions listed from a cProfile window
+
+# Diagnostic HUD (right-click a Yadon, or `yadon_ctl.py hud`)
+HUD_INTERVAL = 1000  # ms between refreshes while shown
+HUD_FONT_SIZE = 9
+HUD_PADDING = 6  # px around the text
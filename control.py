@@ -0,0 +1,193 @@
+"""Local control channel for Yadon Desktop Pet
+
+Listens on a Unix socket for one-line JSON commands from yadon_ctl.py and
+applies them to the running pets. Each request is answered with one JSON line.
+"""
+
+import os
+import json
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtNetwork import QLocalServer
+
+from settings import settings
+from scheduler import scheduler
+from profiling import profiler
+from watchdog import Watchdog
+from hook_handler import hook_inbox
+from workers import debug_log, process_scanner
+from yadon_ctl import control_socket_path, is_server_running
+
+
+class ControlServer(QObject):
+    """Apply control commands to live pets and timers"""
+    # Claude PID a forwarded hook was filed under (None for generic hooks)
+    hook_received = pyqtSignal(object)
+
+    def __init__(self, pets, services, watchdog=None):
+        super().__init__()
+        self.pets = pets
+        self.services = services  # background timers paused along with the pets
+        self.watchdog = watchdog
+        self.paused = False
+        self.server = QLocalServer(self)
+        # The channel can change settings and quit the pet: owner only
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+
+    def start(self):
+        """Start listening; returns False if another instance owns the socket"""
+        path = control_socket_path()
+        if is_server_running(path):
+            self._debug_log(f"Control socket {path} is in use, control channel disabled")
+            return False
+        # Remove a stale socket left by a crashed instance
+        QLocalServer.removeServer(path)
+        if not self.server.listen(path):
+            self._debug_log(f"Could not listen on {path}: {self.server.errorString()}")
+            return False
+        os.chmod(path, 0o600)
+        return True
+
+    def stop(self):
+        self.server.close()
+        QLocalServer.removeServer(control_socket_path())
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self.on_ready_read(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def on_ready_read(self, connection):
+        if not connection.canReadLine():
+            return
+        line = bytes(connection.readLine()).decode(errors='replace')
+        try:
+            request = json.loads(line)
+            result = self.handle_command(request.get('command'), request.get('args', []))
+            response = {'ok': True, 'result': result}
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        connection.write((json.dumps(response, ensure_ascii=False) + '\n').encode())
+        connection.flush()
+        connection.disconnectFromServer()
+
+    def handle_command(self, command, args):
+        """Run one control command and return its JSON-serializable result"""
+        self._debug_log(f"Control command: {command} {args}")
+        if command == 'set':
+            if len(args) != 2:
+                raise ValueError("usage: set <name> <value>")
+            settings().set(args[0], args[1])
+            return settings().values
+        if command == 'get':
+            if args:
+                return settings().get(settings().normalize_name(args[0]))
+            return settings().values
+        if command == 'reload':
+            if not settings().load_user_config():
+                raise ValueError("could not read user config, keeping current settings")
+            return settings().values
+        if command == 'pause':
+            self.pause()
+            return 'paused'
+        if command == 'resume':
+            self.resume()
+            return 'resumed'
+        if command == 'status':
+            return {
+                'paused': self.paused,
+                'pets': [{'claude_pid': pet.claude_pid, 'variant': pet.variant,
+                          'session': pet.session_info.to_dict() if pet.session_info else None}
+                         for pet in self.pets],
+                'process_scan': process_scanner().task.stats(),
+                'stalls': self.watchdog.stalls if self.watchdog else None,
+                'settings': settings().values,
+            }
+        if command == 'show':
+            return self.show_pets()
+        if command == 'quit':
+            # Reply first, then leave the event loop
+            QTimer.singleShot(0, QApplication.instance().quit)
+            return 'quitting'
+        if command == 'stats':
+            return {
+                'watchdog': self.watchdog.stats() if self.watchdog else None,
+                'process_scan': process_scanner().task.stats(),
+                'scheduler': scheduler().stats(),
+                'slots': profiler().stats() if profiler() else None,
+            }
+        if command == 'profile':
+            if profiler() is None:
+                raise ValueError("profiling is off, start Yadon with --profile")
+            if args:
+                # Report comes when the window closes
+                if not profiler().start_window(float(args[0])):
+                    raise ValueError("a cProfile window is already running")
+                return f"profiling for {float(args[0]):g}s"
+            return profiler().write_report()
+        if command == 'hud':
+            if args and args[0] not in ('on', 'off'):
+                raise ValueError("usage: hud [on|off]")
+            show = args[0] == 'on' if args else None
+            for pet in self.pets:
+                pet.toggle_hud(show)
+            return {'shown': sum(1 for pet in self.pets if pet.hud and pet.hud.isVisible())}
+        if command == 'hook':
+            # A hook datagram a socket-activated launch read before handing over to us
+            if len(args) != 2:
+                raise ValueError("usage: hook <claude_pid or ''> <hook line>")
+            claude_pid = hook_inbox().put(int(args[0]) if str(args[0]).isdigit() else None, args[1])
+            self.hook_received.emit(claude_pid)
+            return {'claude_pid': claude_pid}
+        if command == 'watchdog':
+            if args and args[0] not in ('on', 'off'):
+                raise ValueError("usage: watchdog [on|off]")
+            if args:
+                self.set_watchdog(args[0] == 'on')
+            return {'armed': self.watchdog in self.services,
+                    'stats': self.watchdog.stats() if self.watchdog else None}
+        raise ValueError(f"unknown command: {command}")
+
+    def set_watchdog(self, enabled):
+        """Arm or disarm the event loop watchdog, keeping its counts"""
+        if enabled and self.watchdog not in self.services:
+            if self.watchdog is None:
+                self.watchdog = Watchdog()
+            self.services.append(self.watchdog)
+            if not self.paused:
+                self.watchdog.start()
+        elif not enabled and self.watchdog in self.services:
+            self.services.remove(self.watchdog)
+            self.watchdog.stop()
+
+    def show_pets(self):
+        """Bring the pets of live sessions to the front"""
+        shown = 0
+        for pet in self.pets:
+            if pet.claude_code_active or not pet.claude_pid:
+                pet.show()
+                pet.raise_()
+                shown += 1
+        return {'shown': shown}
+
+    def pause(self):
+        """Stop every timer without losing pet state"""
+        self.paused = True
+        for service in self.services:
+            service.stop()
+        for pet in self.pets:
+            pet.pause()
+
+    def resume(self):
+        self.paused = False
+        for pet in self.pets:
+            pet.resume()
+        for service in self.services:
+            service.start()
+
+    def _debug_log(self, message):
+        """Write debug message to log file"""
+        debug_log(message)
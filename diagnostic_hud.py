@@ -0,0 +1,166 @@
+"""On-pet diagnostic overlay for Yadon Desktop Pet
+
+Right-click a pet (or press D while it has focus, or run
+`yadon_ctl.py hud`) to show a small panel beside it with what that pet
+costs: its last repaint, its wakeups per second, the last process scan,
+hooks and bubbles waiting, the last hook's latency and the Claude
+session's CPU. Every number is a counter the app already keeps; the
+panel only reads them once a second while it is shown.
+
+A pet's wakeups are its own timer fires (face, bubble queue, mover), the
+runs of its scheduler tasks and an even share of the runs of tasks no
+pet owns, such as the process monitor. Other pets' tasks and every HUD's
+refresh are left out.
+"""
+
+import time
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPainter, QColor, QFont
+
+from config import HUD_INTERVAL, HUD_FONT_SIZE, HUD_PADDING
+from screen_geometry import screen_geometry
+from scheduler import scheduler
+from workers import process_scanner
+from hook_handler import hook_inbox
+
+
+_hud_font = None
+
+
+def hud_font():
+    """Return the shared HUD font, creating it on first use"""
+    global _hud_font
+    if _hud_font is None:
+        _hud_font = QFont('Monospace', HUD_FONT_SIZE)
+        _hud_font.setStyleHint(QFont.StyleHint.TypeWriter)
+    return _hud_font
+
+
+def format_ms(value):
+    return '-' if value is None else f"{value:.1f}ms"
+
+
+class DiagnosticHud(QWidget):
+    """A pet's live overhead, drawn next to it"""
+    def __init__(self, pet):
+        super().__init__()
+        self.pet = pet
+        self.frame_time = None  # ms, the pet's last paintEvent
+        self.max_frame_time = 0.0
+        self.last_fires = None  # (pet timer fires, clock.now()) at the previous refresh
+        self.last_runs = {}  # scheduler Task -> runs at the previous refresh
+        self.lines = []
+
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.ToolTip |
+            Qt.WindowType.X11BypassWindowManagerHint
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setFont(hud_font())
+
+        self.task = scheduler().add('diagnostic hud', self.refresh, HUD_INTERVAL, start=False)
+
+    def toggle(self):
+        if self.isVisible():
+            self.stop()
+        else:
+            self.start()
+
+    def start(self):
+        self.last_fires = None
+        self.last_runs = {}
+        self.refresh()
+        self.show()
+        self.task.resume()
+
+    def stop(self):
+        self.task.pause()
+        self.hide()
+
+    def close(self):
+        self.task.stop()
+        super().close()
+
+    def paint_finished(self, started):
+        """Called at the end of the pet's paintEvent with its perf_counter() start"""
+        self.frame_time = (time.perf_counter() - started) * 1000
+        self.max_frame_time = max(self.max_frame_time, self.frame_time)
+
+    def task_runs(self):
+        """Scheduler task runs since the last refresh that count for this pet"""
+        runs = {task: task.runs for task in scheduler().tasks}
+        own = shared = 0
+        pets = {self.pet}
+        for task, count in runs.items():
+            owner = getattr(task.callback, '__self__', None)
+            delta = count - self.last_runs.get(task, 0)
+            if owner is self.pet:
+                own += delta
+            elif isinstance(owner, type(self.pet)):
+                pets.add(owner)
+            elif not isinstance(owner, DiagnosticHud):
+                shared += delta
+        self.last_runs = runs
+        return own + shared / len(pets)
+
+    def refresh(self):
+        pet = self.pet
+        now = pet.clock.now()
+        task_runs = self.task_runs()
+        rate = None
+        if self.last_fires is not None and now > self.last_fires[1]:
+            fires = pet.timer_fires - self.last_fires[0] + task_runs
+            rate = fires / (now - self.last_fires[1])
+        self.last_fires = (pet.timer_fires, now)
+
+        scan = process_scanner().last_duration
+        latency = pet.hook_handler.last_hook_latency
+        hooks = hook_inbox().depth(int(pet.claude_pid)) if pet.claude_pid else 0
+        stats = pet.session_stats
+        self.lines = [
+            f"frame   {format_ms(self.frame_time)} (max {self.max_frame_time:.1f})",
+            f"wakeups {'-' if rate is None else f'{rate:.1f}'}/s",
+            f"scan    {format_ms(None if scan is None else scan * 1000)}",
+            f"queue   {hooks} hooks, {pet.bubble_queue.depth()} bubbles",
+            f"hook    {format_ms(None if latency is None else latency * 1000)}",
+            f"cpu     {f'{stats.cpu_percent():.0f}%' if stats else '-'} "
+            f"(pid {pet.claude_pid or 'N/A'})",
+        ]
+        metrics = self.fontMetrics()
+        width = max(metrics.horizontalAdvance(line) for line in self.lines) + HUD_PADDING * 2
+        height = metrics.height() * len(self.lines) + HUD_PADDING * 2
+        if (width, height) != (self.width(), self.height()):
+            self.resize(width, height)
+        self.follow()
+        self.update()
+
+    def follow(self):
+        """Sit beside the pet, on the side facing the middle of its screen"""
+        pet_geometry = self.pet.frameGeometry()
+        screen = screen_geometry().screen_for_rect(pet_geometry)
+        if pet_geometry.center().x() > screen.center().x():
+            x = pet_geometry.left() - self.width() - 8
+        else:
+            x = pet_geometry.right() + 8
+        y = min(max(pet_geometry.top(), screen.top()), screen.bottom() - self.height())
+        self.move(x, y)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setBrush(QColor(0, 0, 0, 190))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(self.rect(), 6, 6)
+
+        painter.setPen(QColor(255, 255, 255))
+        line_height = self.fontMetrics().height()
+        for i, line in enumerate(self.lines):
+            rect = QRect(HUD_PADDING, HUD_PADDING + i * line_height,
+                         self.width() - HUD_PADDING * 2, line_height)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, line)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Persistent hook event history for Yadon Desktop Pet.
+
+Events are queued by the GUI thread and written by a background thread in
+one transaction per flush, into SQLite in WAL mode. The writer sleeps until
+an event arrives and then waits EVENT_FLUSH_INTERVAL to batch the rest, so
+an idle store causes no wakeups. Retention is capped by
+age and row count. Run as a script to query the history:
+
+    python3 event_store.py stats [--type notification] [--since 24h]
+    python3 event_store.py events [--session PID] [--since 1h] [--limit 50]
+    python3 event_store.py prune
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import sqlite3
+import argparse
+import threading
+
+from config import (
+    EVENT_DB, EVENT_FLUSH_INTERVAL, EVENT_RETENTION_DAYS, EVENT_MAX_ROWS
+)
+from workers import debug_log
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session_pid INTEGER,
+    hook_type TEXT NOT NULL,
+    detail TEXT,
+    fields TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_session_ts ON events (session_pid, ts);
+"""
+
+# Prune after this many flushes rather than on every write
+PRUNE_EVERY = 100
+
+
+def parse_duration(text):
+    """Parse '90s', '15m', '24h' or '7d' into seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+class EventStore:
+    """Batched, off-thread SQLite writer plus a small query API"""
+    def __init__(self, path=EVENT_DB):
+        self.path = os.path.expanduser(path)
+        self.pending = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        self.wake = threading.Event()  # set when there is something to write
+        self.thread = None
+        self.start_lock = threading.Lock()  # hook polls record from worker threads
+        self.flushes = 0
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        # Databases from before structured hooks lack the fields column
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(events)')}
+        if 'fields' not in columns:
+            conn.execute('ALTER TABLE events ADD COLUMN fields TEXT')
+        return conn
+
+    def record(self, session_pid, hook_type, detail='', timestamp=None, fields=None):
+        """Queue an event; never blocks on disk I/O
+
+        fields are a structured hook's event, tool and session, kept as JSON.
+        """
+        if self.thread is None:
+            with self.start_lock:
+                if self.thread is None:
+                    self.start()
+        pid = int(session_pid) if session_pid else None
+        fields = json.dumps(fields, ensure_ascii=False) if fields else None
+        self.pending.put((timestamp or time.time(), pid, hook_type, detail, fields))
+        self.wake.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='yadon-event-store', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            conn = self.connect()
+        except Exception as e:
+            self._debug_log(f"Event store disabled, cannot open {self.path}: {e}")
+            return
+        while not self.stop_event.is_set():
+            self.wake.wait()
+            # Let the rest of a burst arrive before writing
+            self.stop_event.wait(EVENT_FLUSH_INTERVAL)
+            self.wake.clear()
+            self.flush(conn)
+        self.flush(conn)
+        conn.close()
+
+    def flush(self, conn):
+        """Write everything queued so far in a single transaction"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO events (ts, session_pid, hook_type, detail, fields) VALUES (?, ?, ?, ?, ?)',
+                    batch
+                )
+            self.flushes += 1
+            if self.flushes % PRUNE_EVERY == 1:
+                self.prune(conn)
+        except Exception as e:
+            self._debug_log(f"Event store write failed, dropped {len(batch)} events: {e}")
+
+    def prune(self, conn):
+        """Enforce retention by age and by row count"""
+        cutoff = time.time() - EVENT_RETENTION_DAYS * 86400
+        with conn:
+            conn.execute('DELETE FROM events WHERE ts < ?', (cutoff,))
+            conn.execute(
+                'DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?',
+                (EVENT_MAX_ROWS,)
+            )
+
+    def close(self):
+        """Flush remaining events and stop the writer thread"""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.wake.set()
+            self.thread.join(timeout=5)
+            self.thread = None
+
+    # Query API
+
+    def counts_per_hour(self, hook_type=None, since=None):
+        """Return (hour, session_pid, hook_type, count) rows, oldest hour first"""
+        query = ("SELECT strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime') AS hour, "
+                 "session_pid, hook_type, COUNT(*) FROM events WHERE ts >= ?")
+        params = [since or 0]
+        if hook_type:
+            query += ' AND hook_type = ?'
+            params.append(hook_type)
+        query += ' GROUP BY hour, session_pid, hook_type ORDER BY hour, session_pid'
+        conn = self.connect()
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def events(self, since=None, session_pid=None, hook_type=None, limit=None):
+        """Return (ts, session_pid, hook_type, detail, fields) rows, oldest first
+
+        fields is the JSON text of a structured hook's fields, or None.
+        """
+        query = 'SELECT ts, session_pid, hook_type, detail, fields FROM events WHERE ts >= ?'
+        params = [since or 0]
+        if session_pid:
+            query += ' AND session_pid = ?'
+            params.append(int(session_pid))
+        if hook_type:
+            query += ' AND hook_type = ?'
+            params.append(hook_type)
+        query += ' ORDER BY ts'
+        if limit:
+            # Newest `limit` events, still returned oldest first
+            query = f'SELECT * FROM ({query} DESC LIMIT ?) ORDER BY ts'
+            params.append(int(limit))
+        conn = self.connect()
+        try:
+            return conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+    def last_row_id(self):
+        """Return the id of the newest event, 0 for an empty store"""
+        conn = self.connect()
+        try:
+            return conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+        finally:
+            conn.close()
+
+    def events_after(self, row_id):
+        """Return (id, ts, session_pid, hook_type, detail, fields) rows written after row_id
+
+        Ordered by id, i.e. write order: a batch that flushes late still
+        shows up here even when its ts is older than rows already seen.
+        """
+        conn = self.connect()
+        try:
+            return conn.execute(
+                'SELECT id, ts, session_pid, hook_type, detail, fields FROM events '
+                'WHERE id > ? ORDER BY id', (row_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def _debug_log(self, message):
+        """Write debug message to log file"""
+        debug_log(message)
+
+
+_event_store = None
+
+
+def get_event_store():
+    """Return the shared EventStore, creating it on first use"""
+    global _event_store
+    if _event_store is None:
+        _event_store = EventStore()
+    return _event_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query Yadon hook event history')
+    parser.add_argument('--db', default=EVENT_DB, help=f'database path (default {EVENT_DB})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats = commands.add_parser('stats', help='events per session per hour')
+    stats.add_argument('--type', help='only this hook type, e.g. notification')
+    stats.add_argument('--since', default='24h', help='time window, e.g. 90m, 24h, 7d')
+
+    events = commands.add_parser('events', help='list raw events')
+    events.add_argument('--type', help='only this hook type')
+    events.add_argument('--session', help='only this Claude PID')
+    events.add_argument('--since', default='1h', help='time window, e.g. 90m, 24h, 7d')
+    events.add_argument('--limit', type=int, default=100, help='newest N events')
+
+    commands.add_parser('prune', help='apply retention limits now')
+
+    args = parser.parse_args(argv)
+    store = EventStore(args.db)
+
+    if args.command == 'stats':
+        since = time.time() - parse_duration(args.since)
+        print(f"{'hour':16}  {'session':>8}  {'type':12}  count")
+        for hour, session_pid, hook_type, count in store.counts_per_hour(args.type, since):
+            print(f"{hour:16}  {session_pid or '-':>8}  {hook_type:12}  {count}")
+    elif args.command == 'events':
+        since = time.time() - parse_duration(args.since)
+        for ts, session_pid, hook_type, detail, _ in store.events(since, args.session, args.type, args.limit):
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))
+            print(f"{stamp}  {session_pid or '-':>8}  {hook_type}:{detail}")
+    elif args.command == 'prune':
+        conn = store.connect()
+        store.prune(conn)
+        conn.close()
+        print("Pruned")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
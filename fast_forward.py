@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Fast-forward simulation for Yadon Desktop Pet.
+
+Runs the real pets, process monitor and scheduler offscreen on a
+SimulatedClock, with Claude sessions coming from a FakeProcessSource and
+hooks dropped straight into the hook inbox. Virtual time only moves when
+the harness advances it, so a day of sessions appearing and disappearing
+plus hook traffic takes seconds. Because background work runs inline
+and everything random is seeded, the counts are exact and repeat
+from run to run:
+
+- wakeups: distinct instants at which any timer fired, and which slots
+  they went to
+- scans: process source scans
+- repaints: paintEvent calls on pets and bubbles
+
+Usage:
+    python3 fast_forward.py --hours 24
+    python3 fast_forward.py --hours 4 --max-sessions 8 --hook-rate 60 --seed 7
+"""
+
+import os
+import sys
+import time
+import heapq
+import random
+import argparse
+import tempfile
+
+from PyQt6.QtWidgets import QApplication
+
+import clock
+import settings
+import event_store
+from config import MAX_YADON_COUNT, PIXEL_SIZE
+
+HOOK_TYPES = ['notification', 'stop']
+
+
+def exponential(rate_per_hour):
+    """Seconds until the next event of a Poisson process"""
+    return random.expovariate(rate_per_hour / 3600) if rate_per_hour > 0 else float('inf')
+
+
+class FastForward:
+    def __init__(self, args, app):
+        self.args = args
+        self.app = app
+        self.sim = clock.SimulatedClock(epoch=0)
+        self.sessions = clock.FakeProcessSource()
+        # Must be in place before anything creates a timer, scheduler or scanner
+        clock._clock = self.sim
+        clock._process_source = self.sessions
+        self.events = []  # heap of (virtual time, sequence, action, pid)
+        self.sequence = 0
+        self.hooks_sent = 0
+        self.session_changes = 0
+        self.peak_pets = 0
+
+    def at(self, when, action, pid=None):
+        heapq.heappush(self.events, (when, self.sequence, action, pid))
+        self.sequence += 1
+
+    def start(self):
+        # Imported after the clock swap so module-level singletons use it
+        from yadon_pet import YadonPet, create_pet
+        from process_monitor import ProcessMonitor
+        from speech_bubble import SpeechBubble
+        from profiling import Profiler
+
+        self.profiler = Profiler()
+        self.profiler.install([YadonPet, SpeechBubble, ProcessMonitor])
+
+        for _ in range(self.args.sessions):
+            self.spawn(0)
+        claude_pids = [str(pid) for pid in self.sessions.pids]
+        count = max(1, min(len(claude_pids), MAX_YADON_COUNT))
+        self.pets = [create_pet(i, claude_pids, bool(claude_pids), pixel_size=PIXEL_SIZE, clock=self.sim)
+                     for i in range(count)]
+        self.monitor = ProcessMonitor(self.pets, self.sim)
+        self.monitor.start()
+        self.at(exponential(3600 / self.args.churn), 'churn')
+        # Let Qt paint and clean up after every wakeup
+        self.sim.on_wakeup = self.app.processEvents
+
+    def spawn(self, now):
+        pid = self.sessions.spawn()
+        self.at(now + exponential(self.args.hook_rate), 'hook', pid)
+
+    def run(self):
+        end = self.args.hours * 3600
+        while self.events and self.events[0][0] <= end:
+            when, _, action, pid = heapq.heappop(self.events)
+            self.sim.advance(when - self.sim.now())
+            if action == 'churn':
+                self.churn(when)
+                self.at(when + exponential(3600 / self.args.churn), 'churn')
+            elif action == 'hook' and pid in self.sessions.pids:
+                self.fire_hook(pid)
+                self.at(when + exponential(self.args.hook_rate), 'hook', pid)
+            self.peak_pets = max(self.peak_pets, len(self.pets))
+        self.sim.advance(end - self.sim.now())
+
+    def churn(self, now):
+        self.session_changes += 1
+        pids = self.sessions.pids
+        if pids and (len(pids) >= self.args.max_sessions or random.random() < 0.5):
+            self.sessions.kill(random.choice(pids))
+        if len(pids) < self.args.max_sessions and random.random() < 0.6:
+            self.spawn(now)
+
+    def fire_hook(self, pid):
+        from hook_handler import hook_inbox
+        hook_inbox().put(pid, f"{random.choice(HOOK_TYPES)}:fast forward {self.hooks_sent}")
+        self.hooks_sent += 1
+
+    def report(self, wall):
+        from scheduler import scheduler
+        hours = self.args.hours
+        minutes = hours * 60
+        calls = {name: stats.calls for name, stats in self.profiler.slots.items()}
+        repaints = calls.get('YadonPet.paintEvent', 0) + calls.get('SpeechBubble.paintEvent', 0)
+        print(f"Simulated {hours:g}h in {wall:.1f}s ({hours * 3600 / max(wall, 1e-9):,.0f}x): "
+              f"{self.session_changes} session changes, {self.hooks_sent} hooks, "
+              f"peak {self.peak_pets} Yadons")
+        print(f"  wakeups:  {self.sim.wakeups} ({self.sim.wakeups / minutes:.1f}/min), "
+              f"{self.sim.fired} timer fires")
+        for name, fired in sorted(self.sim.fired_by_name.items(), key=lambda item: -item[1])[:8]:
+            print(f"    {fired:9} {name}")
+        print(f"  scheduler: {scheduler().wakeups} wakeups, {scheduler().task_runs} task runs")
+        print(f"  scans:    {self.sessions.scans} ({self.sessions.scans / minutes:.2f}/min)")
+        print(f"  repaints: {repaints} (pets {calls.get('YadonPet.paintEvent', 0)}, "
+              f"bubbles {calls.get('SpeechBubble.paintEvent', 0)})")
+        from hook_handler import hook_inbox
+        waiting = sum(len(queue) for queue in hook_inbox().messages.values())
+        print(f"  hooks:    {self.hooks_sent - waiting} of {self.hooks_sent} read, "
+              f"{calls.get('YadonPet.on_hook_messages', 0)} hook polls")
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fast-forward Yadon through simulated sessions and hooks')
+    parser.add_argument('--hours', type=float, default=24, help='virtual hours to simulate')
+    parser.add_argument('--sessions', type=int, default=2, help='Claude sessions at start')
+    parser.add_argument('--max-sessions', type=int, default=MAX_YADON_COUNT, help='most sessions at once')
+    parser.add_argument('--churn', type=float, default=600,
+                        help='mean virtual seconds between session changes')
+    parser.add_argument('--hook-rate', type=float, default=30, help='hooks per virtual hour per session')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = QApplication(sys.argv[:1])
+
+    with tempfile.TemporaryDirectory(prefix='yadon_ff_') as tmpdir:
+        # Default settings, not the user's config.json, so runs compare across machines
+        settings._settings = settings.Settings(os.path.join(tmpdir, 'config.json'))
+        # Keep simulated events out of the user's hook history
+        event_store._event_store = event_store.EventStore(os.path.join(tmpdir, 'events.db'))
+
+        simulation = FastForward(args, app)
+        try:
+            started = time.perf_counter()
+            simulation.start()
+            simulation.run()
+            return simulation.report(time.perf_counter() - started)
+        finally:
+            event_store.get_event_store().close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Fast hook client for Yadon Desktop Pet.
+
+Finds the Claude process that owns this hook by walking our own parent
+chain instead of grepping `ps aux`, then writes the hook message for that
+Claude's Yadon. Keep this module free of Qt imports - it runs on every hook.
+
+Claude passes the hook's JSON on stdin. Only the event name, session id,
+tool name and message are picked out of it, and the pet gets them as one
+compact JSON line instead of `type:detail`. Without stdin (run by hand)
+the legacy line is sent.
+
+Usage: hook_client.py [notification|stop] [detail]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import fcntl
+import select
+import socket
+import subprocess
+
+from config import (
+    HOOK_CLIENT_FILE, HOOK_CLIENT_GENERIC_FILE, HOOK_CLIENT_LOG,
+    HOOK_PID_CACHE, HOOK_PID_CACHE_SIZE, HOOK_SOCKET, HOOK_SOCKET_MAX_MESSAGE,
+    HOOK_INPUT_CHUNK, HOOK_INPUT_TIMEOUT, HOOK_FIELD_MAX
+)
+from procfs import read_stat, proc_available, STAT_PPID, STAT_STARTTIME
+
+CLAUDE_NAMES = ('claude',)
+
+# Top-level keys of the hook's stdin JSON -> keys of the event sent to the pet
+HOOK_INPUT_KEYS = {
+    'hook_event_name': 'event',
+    'session_id': 'session',
+    'tool_name': 'tool',
+    'message': 'message',
+}
+# Keys worth reading on past the event name and session id, by event
+EVENT_INPUT_KEYS = {
+    'Notification': ('message',),
+    'PreToolUse': ('tool_name',),
+    'PostToolUse': ('tool_name',),
+}
+# Hook type for an event when none is given on the command line
+EVENT_TYPES = {'Stop': 'stop', 'SubagentStop': 'stop'}
+
+# The inside of a JSON string up to its closing quote, escapes and all
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_STRUCTURE = re.compile(rb'["{}\[\],]')
+_WHITESPACE = b' \t\r\n'
+
+
+def read_proc_cmdline(pid):
+    """Return argv of pid from /proc as a list of strings"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return [arg.decode(errors='replace') for arg in f.read().split(b'\0') if arg]
+    except OSError:
+        return []
+
+
+def is_claude_process(pid, comm):
+    """Check if pid is a Claude process (native binary or node wrapper)"""
+    if comm in CLAUDE_NAMES:
+        return True
+    # Node-based installs show up as `node /path/to/claude ...`
+    argv = read_proc_cmdline(pid)[:2]
+    return any(os.path.basename(arg) in CLAUDE_NAMES for arg in argv)
+
+
+def find_claude_ancestor_proc(pid):
+    """Walk the parent chain through /proc until a Claude process is found"""
+    while pid > 1:
+        stat = read_stat(pid)
+        if stat is None:
+            return None
+        comm, fields = stat
+        if is_claude_process(pid, comm):
+            return pid
+        pid = int(fields[STAT_PPID])
+    return None
+
+
+def find_claude_ancestor_ps(pid):
+    """Walk the parent chain using a single ps snapshot (no /proc, e.g. macOS)"""
+    try:
+        result = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,comm='],
+                                capture_output=True, text=True)
+    except Exception:
+        return None
+    parents = {}
+    names = {}
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) == 3:
+            parents[int(parts[0])] = int(parts[1])
+            names[int(parts[0])] = os.path.basename(parts[2].strip())
+    while pid > 1 and pid in parents:
+        if names[pid] in CLAUDE_NAMES:
+            return pid
+        pid = parents[pid]
+    return None
+
+
+def load_cache(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    """Write the cache atomically so concurrent hooks never see a partial file"""
+    # Keep only the newest entries (dicts preserve insertion order)
+    while len(cache) > HOOK_PID_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    tmp_path = f'{path}.{os.getpid()}'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def pid_alive(pid):
+    """Check that a process exists without signalling it"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists, owned by someone else
+    return True
+
+
+def resolve_claude_pid(session_id=None):
+    """Resolve the Claude PID that owns this hook, using the cache when possible"""
+    ppid = os.getppid()
+    use_proc = proc_available()
+
+    # Key the cache by parent PID and its start time so PID reuse can't hit it
+    key = None
+    if use_proc:
+        stat = read_stat(ppid)
+        if stat:
+            key = f'{ppid}:{int(stat[1][STAT_STARTTIME])}'
+    # The session id also names the Claude process, and works without /proc
+    session_key = f'session:{session_id}' if session_id else None
+
+    cache_path = HOOK_PID_CACHE.format(uid=os.getuid())
+    cache = load_cache(cache_path) if key or session_key else {}
+    if key in cache:
+        claude_pid = cache[key]
+    elif session_key in cache and pid_alive(cache[session_key]):
+        # A resumed session may live on in a new process, so check the old one
+        claude_pid = cache[session_key]
+    elif use_proc:
+        claude_pid = find_claude_ancestor_proc(ppid)
+    else:
+        claude_pid = find_claude_ancestor_ps(ppid)
+
+    if claude_pid and any(k and cache.get(k) != claude_pid for k in (key, session_key)):
+        for k in (key, session_key):
+            if k:
+                cache.pop(k, None)
+                cache[k] = claude_pid
+        save_cache(cache_path, cache)
+    return claude_pid
+
+
+class HookInputScanner:
+    """Pick a few top-level string fields out of the hook JSON as it streams in
+
+    Values of every other key (tool_input, tool_response, ...) are stepped
+    over with regex searches and dropped chunk by chunk, so a large payload
+    is never decoded or held in memory, and feed() reports done as soon as
+    the fields the event needs are in.
+    """
+    def __init__(self, max_length=HOOK_FIELD_MAX):
+        self.max_length = max_length
+        self.fields = {}  # HOOK_INPUT_KEYS values -> strings
+        self.done = False
+        self.state = 'start'
+        self.pending = b''  # an escape split across chunks
+        self.key = None
+        self.raw = bytearray()  # the string being read, still JSON-escaped
+        self.depth = 0  # nesting inside a skipped value
+        self.in_string = False
+
+    def feed(self, data):
+        """Scan the next chunk; True once nothing more is needed"""
+        buf = self.pending + data
+        self.pending = b''
+        pos = 0
+        end = len(buf)
+        while pos < end and not self.done:
+            state = self.state
+            if state in ('key_string', 'value_string'):
+                stop, closed = self._string(buf, pos, end)
+                self._keep(buf[pos:stop])
+                pos = end
+                if closed:
+                    pos = stop + 1
+                    self._end_string()
+            elif state == 'skip':
+                pos = self._skip(buf, pos, end)
+            else:
+                # Structural states: skip whitespace, then look at one byte
+                while pos < end and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == end:
+                    break
+                self._structure(buf[pos:pos + 1])
+                pos += 1
+        return self.done
+
+    def _string(self, buf, pos, end):
+        """Find where string contents starting at pos stop; (stop, whether the quote closed it)"""
+        stop = _STRING_BODY.match(buf, pos).end()
+        if stop == end:
+            return stop, False
+        if buf[stop] == 0x5c:  # a backslash left over: its escape continues in the next chunk
+            self.pending = buf[stop:]
+            return stop, False
+        return stop, True
+
+    def _skip(self, buf, pos, end):
+        """Step over part of a value nobody asked for, returning where to go on"""
+        if self.in_string:
+            stop, closed = self._string(buf, pos, end)
+            if not closed:
+                return end
+            self.in_string = False
+            if self.depth == 0:
+                self.state = 'next'
+            return stop + 1
+        match = _STRUCTURE.search(buf, pos)
+        if match is None:
+            return end
+        char = match.group()
+        if char == b'"':
+            self.in_string = True
+        elif char in b'{[':
+            self.depth += 1
+        elif self.depth == 0:
+            # ',' or '}' right after a number, true, false or null
+            self.state = 'next'
+            return match.start()
+        elif char in b'}]':
+            self.depth -= 1
+            if self.depth == 0:
+                self.state = 'next'
+        return match.end()
+
+    def _structure(self, char):
+        state = self.state
+        if state == 'start' and char == b'{':
+            self.state = 'key'
+        elif state == 'key' and char == b'"':
+            self.state = 'key_string'
+        elif state == 'colon' and char == b':':
+            self.state = 'value'
+        elif state == 'value':
+            if char == b'"' and self.key in HOOK_INPUT_KEYS:
+                self.state = 'value_string'
+            else:
+                self.state = 'skip'
+                self.in_string = char == b'"'
+                self.depth = 1 if char in b'{[' else 0
+        elif state == 'next' and char == b',':
+            self.state = 'key'
+        else:
+            # End of the object, or not the JSON we expected
+            self.done = True
+
+    def _keep(self, chunk):
+        # Room for max_length characters however they were escaped; keys
+        # only need to be long enough to tell the wanted ones apart
+        limit = 64 if self.state == 'key_string' else self.max_length * 6
+        room = limit - len(self.raw)
+        if room > 0:
+            self.raw += chunk[:room]
+
+    def _end_string(self):
+        text = decode_json_string(bytes(self.raw))
+        self.raw = bytearray()
+        if self.state == 'key_string':
+            self.key = text
+            self.state = 'colon'
+        else:
+            self.fields[HOOK_INPUT_KEYS[self.key]] = text[:self.max_length]
+            self.state = 'next'
+            self.done = self._complete()
+
+    def _complete(self):
+        event = self.fields.get('event')
+        if event is None or 'session' not in self.fields:
+            return False
+        return all(HOOK_INPUT_KEYS[key] in self.fields for key in EVENT_INPUT_KEYS.get(event, ()))
+
+
+def decode_json_string(raw):
+    """Decode the inside of a JSON string that may have been cut off mid-escape"""
+    # \uXXXX\uXXXX is the longest sequence a cut can leave broken
+    for end in range(len(raw), max(len(raw) - 12, 0) - 1, -1):
+        try:
+            return json.loads(b'"' + raw[:end] + b'"')
+        except ValueError:
+            continue
+    return ''
+
+
+def read_hook_input(fd=0, timeout=HOOK_INPUT_TIMEOUT):
+    """Scan the hook JSON Claude writes to stdin; {} when there is none"""
+    scanner = HookInputScanner()
+    try:
+        if os.isatty(fd):
+            return {}
+        while not scanner.done:
+            # Don't hang a hook run from somewhere that never closes stdin
+            if not select.select([fd], [], [], timeout / 1000)[0]:
+                break
+            chunk = os.read(fd, HOOK_INPUT_CHUNK)
+            if not chunk:
+                break
+            scanner.feed(chunk)
+    except OSError:
+        pass
+    return scanner.fields
+
+
+def drain_input(fd=0, timeout=HOOK_INPUT_TIMEOUT):
+    """Read and drop the rest of stdin, so Claude never writes into a closed pipe"""
+    try:
+        while select.select([fd], [], [], timeout / 1000)[0] and os.read(fd, 1 << 16):
+            pass
+    except OSError:
+        pass
+
+
+def hook_file_for(claude_pid):
+    """Return the hook file the Yadon for claude_pid watches"""
+    if claude_pid:
+        return HOOK_CLIENT_FILE.format(pid=claude_pid)
+    # No Claude ancestor - fall back to the generic file
+    return HOOK_CLIENT_GENERIC_FILE
+
+
+def format_hook(hook_type, detail='', fields=None):
+    """The hook line: `type:detail`, or a compact JSON event when there are fields"""
+    if not fields:
+        return f'{hook_type}:{detail}'
+    event = {'type': hook_type}
+    event.update((key, value) for key, value in fields.items() if value is not None)
+    return json.dumps(event, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_hook(claude_pid, hook_type, detail='', fields=None):
+    """Deliver one hook message to the Yadon for claude_pid"""
+    hook_file = hook_file_for(claude_pid)
+    # Append under the lock HookHandler takes while consuming, so messages
+    # that arrive in quick succession queue up instead of overwriting each other
+    with open(hook_file, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(format_hook(hook_type, detail, fields) + '\n')
+    return hook_file
+
+
+def hook_socket_path():
+    """The hook socket; the uid keeps users sharing the /tmp fallback apart"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return HOOK_SOCKET.format(runtime_dir=runtime_dir, uid=os.getuid())
+
+
+def encode_datagram(claude_pid, hook_type, detail='', fields=None):
+    """One datagram: the Claude PID (may be empty) on the first line, the hook line after it"""
+    data = f'{claude_pid or ""}\n{format_hook(hook_type, detail, fields)}'.encode()
+    return data[:HOOK_SOCKET_MAX_MESSAGE]
+
+
+def decode_datagram(data):
+    """Return (claude_pid or None, hook line)"""
+    text = data.decode(errors='replace')
+    pid, _, message = text.partition('\n')
+    return (int(pid) if pid.strip().isdigit() else None), message.strip()
+
+
+def send_datagram(claude_pid, hook_type, detail='', fields=None):
+    """Send the hook over the hook socket; False if nobody is listening"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    # A full receive buffer blocks the send; don't hold up Claude for it
+    client.settimeout(1.0)
+    try:
+        client.sendto(encode_datagram(claude_pid, hook_type, detail, fields), hook_socket_path())
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def send_hook(hook_type, detail='', fields=None):
+    """Deliver a hook message to the owning Claude's Yadon
+
+    fields are what read_hook_input() found; with them the pet gets a
+    structured event carrying the Claude PID and the time it fired.
+    """
+    claude_pid = resolve_claude_pid(fields.get('session') if fields else None)
+    if fields:
+        fields = dict(fields, pid=claude_pid, ts=round(time.time(), 3))
+        if detail:
+            fields.setdefault('message', detail)
+    # The socket also starts the pet when systemd owns it; files are the fallback
+    if send_datagram(claude_pid, hook_type, detail, fields):
+        transport = 'socket'
+    else:
+        write_hook(claude_pid, hook_type, detail, fields)
+        transport = 'file'
+
+    try:
+        with open(HOOK_CLIENT_LOG, 'a') as log:
+            log.write(f"[{time.ctime()}] {hook_type.capitalize()} hook called, Claude PID: {claude_pid} ({transport})\n")
+    except OSError:
+        pass
+    return claude_pid
+
+
+def main():
+    fields = read_hook_input()
+    if len(sys.argv) >= 2:
+        hook_type = sys.argv[1]
+    elif fields.get('event'):
+        hook_type = EVENT_TYPES.get(fields['event'], 'notification')
+    else:
+        print(f"Usage: {sys.argv[0]} [notification|stop] [detail]", file=sys.stderr)
+        return 2
+    send_hook(hook_type, ' '.join(sys.argv[2:]), fields)
+    # Only after the pet has its event: the rest of a big payload costs nothing but reads
+    drain_input()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,100 +1,252 @@
 """Hook handling functionality for Yadon Desktop Pet"""
 
 import os
-import subprocess
-from config import HOOK_FILE_PATTERNS, HOOK_RESPONSES, DEBUG_LOG
+import re
+import json
+import fcntl
+import threading
+from collections import OrderedDict, deque
+from config import (
+    HOOK_FILE_PATTERNS, HOOK_RESPONSES, HOOK_TOOL_RESPONSE, HOOK_MESSAGE_RESPONSES,
+    EVENT_STORE_ENABLED, HOOK_INBOX_SIZE
+)
+from clock import get_clock
+from workers import debug_log
+
+
+# Claude's permission prompt names the tool it wants to run
+PERMISSION_PATTERN = re.compile(r'permission to use (\S+)')
+
+
+class HookEvent:
+    """One hook message: a legacy `type:detail` line or a JSON event from hook_client"""
+    def __init__(self, line, hook_type=None, detail='', event=None, tool=None,
+                 session_id=None, claude_pid=None, timestamp=None):
+        self.line = line
+        self.hook_type = hook_type  # e.g. 'notification', 'stop'; None for a bare message
+        self.detail = detail  # the message text
+        self.event = event  # Claude's hook_event_name, structured hooks only
+        self.tool = tool
+        self.session_id = session_id
+        self.claude_pid = claude_pid  # as resolved by the hook client
+        self.timestamp = timestamp  # wall time the hook fired
+    
+    @property
+    def structured(self):
+        return self.event is not None
+    
+    @classmethod
+    def parse(cls, line):
+        if line.startswith('{'):
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                pid = data.get('pid')
+                timestamp = data.get('ts')
+                return cls(line, str(data.get('type') or 'notification').lower(),
+                           str(data.get('message') or ''), str(data.get('event') or ''),
+                           data.get('tool') or None, data.get('session') or None,
+                           pid if isinstance(pid, int) else None,
+                           timestamp if isinstance(timestamp, (int, float)) else None)
+        if ':' in line:
+            hook_type, detail = line.split(':', 1)
+            return cls(line, hook_type.strip().lower(), detail.strip())
+        return cls(line, None, line)
+
+
+class HookInbox:
+    """Hook messages that arrived over the hook socket, waiting for their pet
+    
+    Structured hooks carry Claude's session id. The inbox remembers which
+    Claude PID each session came from, so a later hook whose PID the
+    client could not resolve still goes to that session's pet instead of
+    whichever pet answers generic hooks.
+    """
+    def __init__(self, size=HOOK_INBOX_SIZE):
+        self.size = size
+        self.messages = OrderedDict()  # Claude PID (None for generic) -> deque of hook lines
+        self.sessions = OrderedDict()  # session id -> Claude PID it last came from
+        self.lock = threading.Lock()
+    
+    def put(self, claude_pid, message):
+        """Queue a hook line for its pet, returning the Claude PID it was filed under"""
+        session_id = HookEvent.parse(message).session_id if message.startswith('{') else None
+        with self.lock:
+            claude_pid = self._route(claude_pid, session_id)
+            queue = self.messages.get(claude_pid)
+            if queue is None:
+                queue = self.messages[claude_pid] = deque(maxlen=self.size)
+                # Forget the longest-waiting sessions that never got a pet
+                while len(self.messages) > self.size:
+                    self.messages.popitem(last=False)
+            queue.append(message)
+        return claude_pid
+    
+    def route(self, claude_pid, session_id):
+        """Learn the session of a hook from a known Claude, or find the Claude of one from an unknown"""
+        with self.lock:
+            return self._route(claude_pid, session_id)
+    
+    def _route(self, claude_pid, session_id):
+        if not session_id:
+            return claude_pid
+        if claude_pid:
+            self.sessions[session_id] = claude_pid
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.size:
+                self.sessions.popitem(last=False)
+            return claude_pid
+        return self.sessions.get(session_id)
+    
+    def depth(self, claude_pid):
+        """Messages waiting for claude_pid's pet"""
+        with self.lock:
+            return len(self.messages.get(claude_pid, ()))
+    
+    def take(self, claude_pid):
+        with self.lock:
+            queue = self.messages.pop(claude_pid, None)
+        return list(queue) if queue else []
+
+
+_inbox = HookInbox()
+
+
+def hook_inbox():
+    return _inbox
 
 
 class HookHandler:
-    def __init__(self, claude_pid):
+    def __init__(self, claude_pid, clock=None):
         self.claude_pid = claude_pid
+        self.clock = clock or get_clock()
         self.last_hook_file = None
         self.last_hook_time = 0
+        self.last_hook_type = None  # type of the last hook message, e.g. 'stop'
+        self.last_hook_latency = None  # seconds from a structured hook firing to its pet reading it
+        # Generic hook files are handled by one pet only: the first one of
+        # this (single) Yadon instance, see ProcessMonitor.assign_generic_hooks
+        self.handles_generic = False
     
     def check_hook_messages(self):
-        """Check for Claude Code hook messages in temp files"""
+        """Check for Claude Code hook messages in temp files (first response only)"""
+        results = self.poll_hook_messages()
+        if results:
+            bubble_type, message, _ = results[0]
+            return (bubble_type, message)
+        return None
+    
+    def poll_hook_messages(self):
+        """Consume all pending hooks, returning (bubble_type, message, hook_type) for each"""
+        results = []
+        for hook_file, hook_message in self.read_hook_events():
+            event = HookEvent.parse(hook_message)
+            if event.timestamp:
+                self.last_hook_latency = max(0.0, self.clock.wall() - event.timestamp)
+            response = self._get_hook_response(event)
+            self._record_event(event)
+            if response:
+                bubble_type, message = response
+                results.append((bubble_type, message, self.last_hook_type))
+        return results
+    
+    def read_hook_events(self):
+        """Consume pending raw hook messages, returning (hook_file, message) pairs"""
+        events = []
         try:
-            # Look for Claude Code hook files specific to this Claude PID
-            hook_locations = []
-            
-            # If we have a specific Claude PID, check PID-specific files first
-            if self.claude_pid:
-                for pattern in HOOK_FILE_PATTERNS:
-                    if '{pid}' in pattern:
-                        hook_locations.append(pattern.format(pid=self.claude_pid))
-                    else:
-                        # Add non-PID patterns as-is
-                        if pattern.startswith('~'):
-                            hook_locations.append(os.path.expanduser(pattern))
-                        else:
-                            hook_locations.append(pattern)
-            else:
-                # No PID, just check generic files
-                for pattern in HOOK_FILE_PATTERNS:
-                    if '{pid}' not in pattern:
-                        if pattern.startswith('~'):
-                            hook_locations.append(os.path.expanduser(pattern))
-                        else:
-                            hook_locations.append(pattern)
-            
             # Log to file for debugging
             self._debug_log(f"Yadon PID {os.getpid()} checking hooks for Claude PID {self.claude_pid}")
             
-            for hook_file in hook_locations:
-                if os.path.exists(hook_file):
-                    # Read file content first
-                    with open(hook_file, 'r') as f:
-                        hook_message = f.read().strip()
-                    
-                    # Only process if there's content
-                    if hook_message:
-                        self._debug_log(f"Found hook file: {hook_file}")
-                        self._debug_log(f"Hook message: {hook_message}")
-                        
-                        # For generic hook files, only the first Yadon responds
-                        if self._should_respond_to_generic_hook(hook_file):
-                            response = self._get_hook_response(hook_message)
-                            # Clear the hook file after processing
-                            with open(hook_file, 'w') as f:
-                                f.write('')
-                            return response
-                        elif self.claude_pid and f'_{self.claude_pid}' in hook_file:
-                            # PID-specific hook, always respond
-                            response = self._get_hook_response(hook_message)
-                            # Clear the hook file after processing
-                            with open(hook_file, 'w') as f:
-                                f.write('')
-                            return response
-                        
+            for hook_file in self._hook_locations():
+                # Only process if there's content
+                try:
+                    if os.path.getsize(hook_file) == 0:
+                        continue
+                except OSError:
+                    continue
+                
+                if self.claude_pid and f'_{self.claude_pid}' in hook_file:
+                    # PID-specific hook, always respond
+                    pass
+                elif not self.handles_generic:
+                    # For generic hook files, only the first Yadon responds
+                    continue
+                
+                pid_specific = self.claude_pid and f'_{self.claude_pid}' in hook_file
+                for hook_message in self._consume_hook_file(hook_file):
+                    self._debug_log(f"Found hook file: {hook_file}")
+                    self._debug_log(f"Hook message: {hook_message}")
+                    if self._reroute(hook_message, pid_specific):
+                        continue
+                    events.append((hook_file, hook_message))
+            
+            # Messages delivered over the hook socket
+            inboxes = [int(self.claude_pid)] if self.claude_pid else []
+            if self.handles_generic:
+                inboxes.append(None)
+            for claude_pid in inboxes:
+                for hook_message in hook_inbox().take(claude_pid):
+                    self._debug_log(f"Hook message (socket): {hook_message}")
+                    events.append(('socket', hook_message))
         except Exception as e:
             self._debug_log(f"Error in check_hook_messages: {e}")
         
-        return None
+        return events
     
-    def _should_respond_to_generic_hook(self, hook_file):
-        """Check if this Yadon instance should respond to generic hooks"""
-        # For generic hook files, only the first Yadon responds
-        if 'yadon_hook.txt' in hook_file or 'claude_hook.txt' in hook_file:
-            if '{pid}' not in hook_file:  # Make sure it's really generic
-                # Check if we're the first by having the lowest PID
-                try:
-                    result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-                    lines = result.stdout.strip().split('\n')
-                    yadon_pids = []
-                    for line in lines:
-                        if 'yadon_pet.py' in line and 'grep' not in line:
-                            parts = line.split()
-                            yadon_pids.append(int(parts[1]))
-                    
-                    # Only respond if we're the first (lowest PID) Yadon
-                    return yadon_pids and os.getpid() == min(yadon_pids)
-                except Exception:
-                    pass
-        return False
+    def _reroute(self, hook_message, pid_specific):
+        """Hand a generic-file hook from a known session to that session's pet; True if moved"""
+        if not hook_message.startswith('{'):
+            return False
+        event = HookEvent.parse(hook_message)
+        own_pid = int(self.claude_pid) if self.claude_pid else None
+        owner = hook_inbox().route(own_pid if pid_specific else event.claude_pid, event.session_id)
+        if owner is None or owner == own_pid:
+            return False
+        self._debug_log(f"Hook for session {event.session_id} goes to Claude PID {owner}")
+        hook_inbox().put(owner, hook_message)
+        return True
+    
+    def _hook_locations(self):
+        """Hook files to check, PID-specific ones first"""
+        # Look for Claude Code hook files specific to this Claude PID
+        hook_locations = []
+        
+        # If we have a specific Claude PID, check PID-specific files first
+        if self.claude_pid:
+            for pattern in HOOK_FILE_PATTERNS:
+                if '{pid}' in pattern:
+                    hook_locations.append(pattern.format(pid=self.claude_pid))
+                else:
+                    # Add non-PID patterns as-is
+                    hook_locations.append(os.path.expanduser(pattern))
+        else:
+            # No PID, just check generic files
+            for pattern in HOOK_FILE_PATTERNS:
+                if '{pid}' not in pattern:
+                    hook_locations.append(os.path.expanduser(pattern))
+        return hook_locations
+    
+    def _consume_hook_file(self, hook_file):
+        """Read and clear a hook file under an exclusive lock, one message per line"""
+        # Writers (hook_client.write_hook) append under the same lock, so a
+        # message written while we read lands after the truncate instead of
+        # being wiped out by it.
+        with open(hook_file, 'r+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            content = f.read()
+            f.seek(0)
+            f.truncate()
+        return [line.strip() for line in content.splitlines() if line.strip()]
     
-    def _get_hook_response(self, hook_message):
-        """Get appropriate response for a hook message"""
-        self._debug_log(f"get_hook_response called with: {hook_message}")
+    def _get_hook_response(self, event):
+        """Get appropriate response for a hook event"""
+        self._debug_log(f"get_hook_response called with: {event.line}")
+        self.last_hook_type = event.hook_type
+        if event.structured:
+            return ('hook', self._structured_response(event))
+        hook_message = event.line
         
         # Split message by colon to get type and optional detail
         if ':' in hook_message:
@@ -106,10 +258,7 @@ class HookHandler:
                 if keyword == f"{hook_type}:" or keyword == hook_type:
                     # If detail is provided and it's Japanese, use it
                     if detail and any(ord(c) > 127 for c in detail):
-                        if detail.endswith('やぁん'):
-                            response = detail  # Already has やぁん
-                        else:
-                            response = f"{detail}やぁん"
+                        response = self._yadon_speak(detail)
                         self._debug_log(f"Using detail as response: {response}")
                     else:
                         self._debug_log(f"Using default response: {response}")
@@ -127,10 +276,40 @@ class HookHandler:
         
         return None
     
+    def _structured_response(self, event):
+        """Pick a bubble from the event's tool and message instead of its type alone"""
+        message = event.detail
+        tool = event.tool
+        if not tool and message:
+            match = PERMISSION_PATTERN.search(message)
+            tool = match.group(1) if match else None
+        if tool and event.hook_type != 'stop':
+            return HOOK_TOOL_RESPONSE.format(tool=tool)
+        message_lower = message.lower()
+        for phrase, response in HOOK_MESSAGE_RESPONSES.items():
+            if phrase in message_lower:
+                return response
+        if message and any(ord(c) > 127 for c in message):
+            return self._yadon_speak(message)
+        return HOOK_RESPONSES.get(f"{event.hook_type}:", HOOK_RESPONSES['notification:'])
+    
+    def _yadon_speak(self, text):
+        return text if text.endswith('やぁん') else f"{text}やぁん"
+    
+    def _record_event(self, event):
+        """Add the hook to the persistent event history"""
+        if not EVENT_STORE_ENABLED:
+            return
+        # sqlite3 only loads with the first hook, not with the first frame
+        from event_store import get_event_store
+        fields = None
+        if event.structured:
+            fields = {key: value for key, value in
+                      (('event', event.event), ('tool', event.tool), ('session', event.session_id))
+                      if value}
+        get_event_store().record(event.claude_pid or self.claude_pid, event.hook_type or 'message',
+                                 event.detail or event.tool or '', self.clock.wall(), fields)
+    
     def _debug_log(self, message):
         """Write debug message to log file"""
-        try:
-            with open(DEBUG_LOG, 'a') as log:
-                log.write(f"{message}\n")
-        except Exception:
-            pass
\ No newline at end of file
+        debug_log(message)
\ No newline at end of file
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Record hook events and replay them against a running Yadon pet.
+
+Recording exports the persistent hook history (see event_store.py) to a
+JSON Lines file, one hook event per line with the keys hook_client sends:
+type, message, event, tool, session, pid and ts. Replay sends each event
+the way the hook client does, through the hook files or the hook socket,
+at 1x, Nx or full speed, and reports how many events the pet consumed,
+how many it never read, and how long consumption took. Structured events
+go out as JSON lines stamped with the replay time; legacy ones as
+`type:detail`.
+
+With the file transport an event counts as consumed once the pet empties
+its hook file. The socket gives no such signal, so socket replay watches
+the event store for the pet's record of each hook instead.
+
+Usage:
+    python3 hook_replay.py record -o burst.jsonl --since 2h [--session PID]
+    python3 hook_replay.py replay burst.jsonl --speed 100 --target-pid 12345
+    python3 hook_replay.py replay burst.jsonl --speed 0 --map 111=12345
+    python3 hook_replay.py replay burst.jsonl --transport socket --target-pid 12345
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from config import EVENT_DB, EVENT_STORE_ENABLED, EVENT_FLUSH_INTERVAL, HOOK_CHECK_MAX_INTERVAL
+from event_store import EventStore, parse_duration
+from hook_client import write_hook, hook_file_for, send_datagram
+
+POLL_INTERVAL = 0.005  # seconds between consumption checks
+STORE_POLL_INTERVAL = 0.1  # seconds between event store queries
+GRACE_MARGIN = 1.0  # seconds on top of the longest the pet may take to look
+
+
+def record(args):
+    store = EventStore(args.db)
+    since = time.time() - parse_duration(args.since)
+    rows = store.events(since=since, session_pid=args.session)
+    with open(args.output, 'w') as f:
+        for ts, session_pid, hook_type, detail, fields in rows:
+            event = {'type': hook_type, 'message': detail}
+            if fields:
+                event.update(json.loads(fields))
+                # The store keeps the tool as the detail of a hook without a message
+                if detail == event.get('tool'):
+                    event['message'] = ''
+            event.update(pid=session_pid, ts=ts)
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+    print(f"Recorded {len(rows)} events to {args.output}")
+    return 0
+
+
+def load_events(path):
+    events = []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                # Recordings from before structured hooks
+                if 'hook_type' in event:
+                    event = {'type': event['hook_type'], 'message': event.get('detail') or '',
+                             'pid': event.get('session_pid'), 'ts': event['ts']}
+                events.append(event)
+    events.sort(key=lambda event: event['ts'])
+    return events
+
+
+def event_key(hook_type, detail):
+    """What the pet's event store row for a hook looks like"""
+    return (hook_type or 'message').lower(), (detail or '').strip()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ReplayTracker:
+    """Track which written hook files the pet has consumed"""
+    def __init__(self):
+        self.pending = {}  # hook file -> write times of events not yet read
+        self.latencies = []
+
+    def is_consumed(self, hook_file):
+        try:
+            return os.path.getsize(hook_file) == 0
+        except OSError:
+            return True
+
+    def poll(self):
+        now = time.monotonic()
+        for hook_file, written_at in list(self.pending.items()):
+            if self.is_consumed(hook_file):
+                self.latencies.extend(now - t for t in written_at)
+                del self.pending[hook_file]
+
+    def wrote(self, claude_pid, key):
+        self.pending.setdefault(hook_file_for(claude_pid), []).append(time.monotonic())
+
+    def unread(self):
+        return sum(len(times) for times in self.pending.values())
+
+
+class StoreTracker:
+    """Track which sent hooks the pet has recorded in the event store"""
+    def __init__(self, db):
+        self.store = EventStore(db)
+        self.last_id = self.store.last_row_id()  # newest store row already looked at
+        self.pending = []  # (event_key, time.time() it was sent), oldest first
+        self.latencies = []
+        self.last_query = 0.0
+
+    def poll(self):
+        now = time.monotonic()
+        if not self.pending or now - self.last_query < STORE_POLL_INTERVAL:
+            return
+        self.last_query = now
+        for row_id, ts, _, hook_type, detail, _ in self.store.events_after(self.last_id):
+            self.last_id = row_id
+            key = event_key(hook_type, detail)
+            for i, (sent_key, sent_at) in enumerate(self.pending):
+                if sent_key == key:
+                    self.latencies.append(max(0.0, ts - sent_at))
+                    del self.pending[i]
+                    break
+
+    def wrote(self, claude_pid, key):
+        self.pending.append((key, time.time()))
+
+    def unread(self):
+        return len(self.pending)
+
+
+def send_file(claude_pid, hook_type, detail, fields):
+    write_hook(claude_pid, hook_type, detail, fields)
+    return True
+
+
+TRANSPORTS = {
+    'file': send_file,
+    'socket': send_datagram,
+}
+
+
+def replay(args):
+    events = load_events(args.file)
+    if not events:
+        print("No events to replay")
+        return 1
+
+    pid_map = {}
+    for mapping in args.map:
+        old, new = mapping.split('=', 1)
+        pid_map[int(old)] = int(new)
+
+    if args.transport == 'socket':
+        if not EVENT_STORE_ENABLED:
+            print("Socket replay counts consumed hooks in the event store; enable EVENT_STORE_ENABLED")
+            return 1
+        tracker = StoreTracker(args.db)
+    else:
+        tracker = ReplayTracker()
+    send = TRANSPORTS[args.transport]
+    if args.grace is None:
+        # How long the pet may take to look: its slowest hook poll for files,
+        # the event store's write batching for the socket
+        wait = EVENT_FLUSH_INTERVAL if args.transport == 'socket' else HOOK_CHECK_MAX_INTERVAL / 1000
+        args.grace = wait + GRACE_MARGIN
+    lateness = []
+    undelivered = 0
+    first_ts = events[0]['ts']
+    start = time.monotonic()
+
+    for event in events:
+        if args.speed > 0:
+            due = start + (event['ts'] - first_ts) / args.speed
+            while True:
+                tracker.poll()
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, POLL_INTERVAL))
+            lateness.append(time.monotonic() - due)
+        else:
+            tracker.poll()
+
+        recorded_pid = event.get('pid')
+        claude_pid = args.target_pid or pid_map.get(recorded_pid, recorded_pid)
+        hook_type = event.get('type') or 'notification'
+        detail = event.get('message') or ''
+        fields = None
+        if event.get('event'):
+            # Like hook_client: the pet measures latency from ts, so stamp the send time
+            fields = {key: event.get(key) for key in ('event', 'tool', 'session', 'message')}
+            fields.update(pid=claude_pid, ts=round(time.time(), 3))
+        if not send(claude_pid, hook_type, detail, fields):
+            undelivered += 1
+            continue
+        tracker.wrote(claude_pid, event_key(hook_type, detail or event.get('tool')))
+
+    # Give the pet a chance to pick up the last events
+    deadline = time.monotonic() + args.grace
+    while tracker.pending and time.monotonic() < deadline:
+        tracker.poll()
+        time.sleep(POLL_INTERVAL)
+
+    elapsed = time.monotonic() - start
+    consumed = len(tracker.latencies)
+    print(f"Replayed {len(events)} events in {elapsed:.2f}s "
+          f"(speed {args.speed or 'max'}, {args.transport} transport)")
+    print(f"  consumed: {consumed}")
+    print(f"  unread:   {tracker.unread()}")
+    if undelivered:
+        print(f"  undelivered: {undelivered} (nobody listening on the hook socket)")
+    if consumed:
+        print(f"  consume latency p50 {percentile(tracker.latencies, 0.5) * 1000:.0f}ms, "
+              f"p95 {percentile(tracker.latencies, 0.95) * 1000:.0f}ms, "
+              f"max {max(tracker.latencies) * 1000:.0f}ms")
+    if lateness:
+        print(f"  send lateness max {max(lateness) * 1000:.1f}ms")
+    return 0 if not tracker.pending and not undelivered else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record and replay Yadon hook events')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rec = commands.add_parser('record', help='export hook history to a JSON Lines file')
+    rec.add_argument('-o', '--output', required=True)
+    rec.add_argument('--since', default='1h', help='time window, e.g. 90m, 24h, 7d')
+    rec.add_argument('--session', help='only this Claude PID')
+    rec.add_argument('--db', default=EVENT_DB)
+
+    rep = commands.add_parser('replay', help='replay a recording against the running pet')
+    rep.add_argument('file')
+    rep.add_argument('--speed', type=float, default=1.0,
+                     help='time scale, e.g. 1 or 100; 0 replays as fast as possible')
+    rep.add_argument('--target-pid', type=int, help='send every event to this Claude PID')
+    rep.add_argument('--map', action='append', default=[], metavar='OLD=NEW',
+                     help='map a recorded session PID to a live Claude PID')
+    rep.add_argument('--transport', choices=sorted(TRANSPORTS), default='file',
+                     help='deliver through hook files or the hook socket, like hook_client')
+    rep.add_argument('--grace', type=float,
+                     help='seconds to wait for the pet after the last event '
+                          '(default: its longest poll or store flush plus a margin)')
+    rep.add_argument('--db', default=EVENT_DB, help='event store the socket transport watches')
+
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        return record(args)
+    return replay(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
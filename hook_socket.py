@@ -0,0 +1,170 @@
+"""Hook socket and socket activation for Yadon Desktop Pet
+
+hook_client.py sends each hook as one datagram to HOOK_SOCKET before
+falling back to the hook files. The pet either binds that socket itself
+or, when started by systemd (see systemd/), takes the listening socket
+systemd passed in via LISTEN_FDS/LISTEN_PID. In the second case the pet
+can also exit once no Claude session has been seen for IDLE_EXIT_TIMEOUT;
+systemd keeps the socket and starts it again on the next hook.
+"""
+
+import os
+import socket
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from config import HOOK_SOCKET_MAX_MESSAGE, IDLE_EXIT_TIMEOUT
+from hook_client import hook_socket_path, decode_datagram
+from hook_handler import hook_inbox
+from workers import debug_log, process_scanner
+
+SD_LISTEN_FDS_START = 3
+
+
+def inherited_socket():
+    """Return the socket systemd passed to this process, or None"""
+    if os.environ.get('LISTEN_PID') != str(os.getpid()):
+        return None
+    try:
+        count = int(os.environ.get('LISTEN_FDS', '0'))
+    except ValueError:
+        return None
+    # Don't pass them on to anything we start
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+    if count < 1:
+        return None
+    return socket.socket(fileno=SD_LISTEN_FDS_START)
+
+
+def drain_inherited_socket():
+    """Read every datagram queued on the socket systemd passed in, or [] if there is none
+
+    For a launch that hands over to an instance that is already running:
+    unread datagrams would make systemd start the unit again.
+    """
+    sock = inherited_socket()
+    if sock is None:
+        return []
+    sock.setblocking(False)
+    datagrams = []
+    try:
+        while True:
+            datagrams.append(sock.recv(HOOK_SOCKET_MAX_MESSAGE))
+    except (BlockingIOError, InterruptedError):
+        pass
+    except OSError as e:
+        debug_log(f"Hook socket receive failed: {e}")
+    # Only our copy of the descriptor: systemd keeps listening
+    sock.close()
+    return datagrams
+
+
+def is_socket_listening(path):
+    """Check if some process has a datagram socket bound at path"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class HookSocketServer(QObject):
+    """Receive hook datagrams and queue them for the pets"""
+    # Claude PID the hook is for (None for generic hooks)
+    received = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.sock = None
+        self.notifier = None
+        self.activated = False  # socket came from systemd
+        self.path = hook_socket_path()
+
+    def start(self):
+        sock = inherited_socket()
+        if sock is not None:
+            self.activated = True
+        else:
+            if is_socket_listening(self.path):
+                # e.g. the systemd socket unit: don't steal its path
+                debug_log(f"Hook socket {self.path} belongs to another process, using hook files only")
+                return False
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                # Nobody is listening, so the file is left over from a crash
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                sock.bind(self.path)
+                os.chmod(self.path, 0o600)
+            except OSError as e:
+                debug_log(f"Could not bind hook socket {self.path}: {e}")
+                sock.close()
+                return False
+        sock.setblocking(False)
+        self.sock = sock
+        self.notifier = QSocketNotifier(sock.fileno(), QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self.on_readable)
+        # Hooks queued before we started, e.g. the one that activated us
+        QTimer.singleShot(0, self.on_readable)
+        return True
+
+    def on_readable(self):
+        if self.sock is None:
+            return
+        while True:
+            try:
+                data = self.sock.recv(HOOK_SOCKET_MAX_MESSAGE)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                debug_log(f"Hook socket receive failed: {e}")
+                break
+            claude_pid, message = decode_datagram(data)
+            if message:
+                # Filed under the session's Claude when the client couldn't resolve it
+                claude_pid = hook_inbox().put(claude_pid, message)
+                self.received.emit(claude_pid)
+
+    def close(self):
+        if self.notifier:
+            self.notifier.setEnabled(False)
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+            # systemd owns an activated socket's file
+            if not self.activated:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+
+class IdleExit(QObject):
+    """Quit once no Claude session has been seen for a while"""
+    def __init__(self, timeout=IDLE_EXIT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.quit)
+        process_scanner().scanned.connect(self.on_scan)
+
+    def start(self):
+        self.timer.start(self.timeout)
+
+    def stop(self):
+        self.timer.stop()
+
+    def on_scan(self, scan):
+        # Every scan that still finds a session restarts the countdown
+        if scan.claude_pids and self.timer.isActive():
+            self.timer.start(self.timeout)
+
+    def quit(self):
+        debug_log(f"No Claude sessions for {self.timeout // 1000}s, exiting")
+        QApplication.instance().quit()
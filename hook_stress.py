@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Concurrent hook stress test for Yadon Desktop Pet.
+
+Simulates N Claude sessions firing hooks at a fixed rate from separate
+threads or processes while one HookHandler per session consumes them the
+way a pet does. Every event carries a sequence number and send time, so
+the report can count delivered, lost and duplicated events and give
+delivery latency percentiles. Exits non-zero when more events are lost
+than --max-loss allows, so it doubles as a regression check for the
+hook file read/clear race.
+
+Usage:
+    python3 hook_stress.py --sessions 8 --rate 20 --duration 10
+    python3 hook_stress.py --transport legacy-overwrite   # the old `echo >` writer
+    python3 hook_stress.py --transport socket             # datagrams, like hook_client
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import multiprocessing
+
+from config import HOOK_CHECK_INTERVAL, HOOK_SOCKET_MAX_MESSAGE
+from hook_client import write_hook, hook_file_for, send_datagram, hook_socket_path, decode_datagram
+from hook_handler import HookHandler, hook_inbox
+from clock import FakeProcessSource
+
+# Fake Claude PIDs, above PID_MAX_LIMIT so no real process can have them
+BASE_PID = FakeProcessSource.FIRST_PID
+
+
+def write_legacy_overwrite(claude_pid, hook_type, detail):
+    """What hook_notify.sh used to do: `echo ... > file`"""
+    with open(hook_file_for(claude_pid), 'w') as f:
+        f.write(f'{hook_type}:{detail}\n')
+
+
+def write_socket(claude_pid, hook_type, detail):
+    """What hook_client does when the pet listens on the hook socket"""
+    if not send_datagram(claude_pid, hook_type, detail):
+        write_hook(claude_pid, hook_type, detail)
+
+
+TRANSPORTS = {
+    'file': write_hook,
+    'legacy-overwrite': write_legacy_overwrite,
+    'socket': write_socket,
+}
+
+
+class SocketReceiver(threading.Thread):
+    """Stand-in for the pet's HookSocketServer: move datagrams into the hook inbox"""
+    def __init__(self, path):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(path)
+        self.sock.settimeout(0.1)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                data = self.sock.recv(HOOK_SOCKET_MAX_MESSAGE)
+            except socket.timeout:
+                continue
+            claude_pid, message = decode_datagram(data)
+            hook_inbox().put(claude_pid, message)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+        self.sock.close()
+
+
+def run_session(session, claude_pid, rate, duration, transport):
+    """Fire hooks for one simulated session, returning the number sent"""
+    send = TRANSPORTS[transport]
+    interval = 1.0 / rate
+    start = time.monotonic()
+    seq = 0
+    while time.monotonic() - start < duration:
+        send(claude_pid, 'notification', f'stress {session} {seq} {time.time():.6f}')
+        seq += 1
+        # Pace against the start time so slow writes don't lower the rate
+        next_due = start + seq * interval
+        time.sleep(max(0.0, next_due - time.monotonic()))
+    return seq
+
+
+def session_process(session, claude_pid, rate, duration, transport, results):
+    results.put((session, run_session(session, claude_pid, rate, duration, transport)))
+
+
+class Consumer(threading.Thread):
+    """Poll one session's hooks the way a pet's hook timer does"""
+    def __init__(self, claude_pid, poll_interval, stop_event):
+        super().__init__(daemon=True)
+        self.handler = HookHandler(str(claude_pid))
+        self.poll_interval = poll_interval
+        self.stop_event = stop_event
+        self.received = []  # (session, seq, latency)
+
+    def poll(self):
+        now = time.time()
+        for _, message in self.handler.read_hook_events():
+            parts = message.split(':', 1)[-1].split()
+            if len(parts) == 4 and parts[0] == 'stress':
+                self.received.append((int(parts[1]), int(parts[2]), now - float(parts[3])))
+
+    def run(self):
+        while not self.stop_event.wait(self.poll_interval):
+            self.poll()
+        # Drain whatever is left
+        self.poll()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stress the Yadon hook path with concurrent sessions')
+    parser.add_argument('--sessions', type=int, default=4, help='simulated Claude sessions')
+    parser.add_argument('--rate', type=float, default=10.0, help='hooks per second per session')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds to fire hooks')
+    parser.add_argument('--mode', choices=['threads', 'processes'], default='threads')
+    parser.add_argument('--transport', choices=sorted(TRANSPORTS), default='file')
+    parser.add_argument('--poll-interval', type=float, default=HOOK_CHECK_INTERVAL / 1000,
+                        help='consumer poll interval in seconds (default: the pet\'s)')
+    parser.add_argument('--max-loss', type=int, default=0, help='lost events tolerated before failing')
+    args = parser.parse_args(argv)
+
+    pids = [BASE_PID + session for session in range(args.sessions)]
+    for pid in pids:
+        try:
+            os.remove(hook_file_for(pid))
+        except OSError:
+            pass
+
+    receiver = None
+    if args.transport == 'socket':
+        # A private socket so a running pet never sees the stress traffic
+        os.environ['XDG_RUNTIME_DIR'] = tempfile.mkdtemp(prefix='yadon_stress_')
+        receiver = SocketReceiver(hook_socket_path())
+        receiver.start()
+
+    stop_event = threading.Event()
+    consumers = [Consumer(pid, args.poll_interval, stop_event) for pid in pids]
+    for consumer in consumers:
+        consumer.start()
+
+    sent = {}
+    print(f"Firing {args.rate:g} hooks/s from {args.sessions} sessions for {args.duration:g}s "
+          f"({args.mode}, {args.transport} transport)...")
+    if args.mode == 'threads':
+        def session_thread(session, pid):
+            sent[session] = run_session(session, pid, args.rate, args.duration, args.transport)
+        threads = [threading.Thread(target=session_thread, args=(session, pid))
+                   for session, pid in enumerate(pids)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=session_process,
+                                             args=(session, pid, args.rate, args.duration,
+                                                   args.transport, results))
+                     for session, pid in enumerate(pids)]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            session, count = results.get()
+            sent[session] = count
+        for process in processes:
+            process.join()
+
+    # Let the consumers catch up with the last writes
+    time.sleep(args.poll_interval * 2)
+    if receiver:
+        receiver.stop()
+        os.remove(hook_socket_path())
+        os.rmdir(os.path.dirname(hook_socket_path()))
+    stop_event.set()
+    for consumer in consumers:
+        consumer.join()
+    for pid in pids:
+        try:
+            os.remove(hook_file_for(pid))
+        except OSError:
+            pass
+
+    total_sent = sum(sent.values())
+    seen = set()
+    duplicated = 0
+    latencies = []
+    for consumer in consumers:
+        for session, seq, latency in consumer.received:
+            if (session, seq) in seen:
+                duplicated += 1
+            else:
+                seen.add((session, seq))
+                latencies.append(latency)
+    delivered = len(seen)
+    lost = total_sent - delivered
+
+    print(f"  sent:       {total_sent}")
+    print(f"  delivered:  {delivered}")
+    print(f"  lost:       {lost} ({lost / total_sent:.1%})" if total_sent else "  lost:       0")
+    print(f"  duplicated: {duplicated}")
+    if latencies:
+        print(f"  latency p50 {percentile(latencies, 0.5) * 1000:.0f}ms, "
+              f"p90 {percentile(latencies, 0.9) * 1000:.0f}ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.0f}ms, "
+              f"max {max(latencies) * 1000:.0f}ms")
+
+    if lost > args.max_loss or duplicated:
+        print("✗ Hook delivery lost or duplicated events")
+        return 1
+    print("✓ Every hook was delivered exactly once")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Pet and bubble placement for Yadon Desktop Pet
+
+Pets get numbered home slots: rows filled right to left from the
+bottom-right corner of the primary screen, stacking upwards, then the
+same on each other screen. Freed slots go on a heap so a new pet takes
+the lowest free slot in O(log n), and when sessions go away the
+remaining pets are re-packed into the lowest slots. A pet the user has
+dragged somewhere is pinned: it keeps its place and new pets avoid it.
+
+Every pet and bubble on screen is also kept in a uniform grid index, so
+"does this rect overlap anything?" only looks at the few cells the rect
+covers instead of at every widget.
+"""
+
+import heapq
+
+from PyQt6.QtCore import QRect, QPoint
+
+from config import LAYOUT_MARGIN, LAYOUT_SPACING, LAYOUT_CELL
+from screen_geometry import screen_geometry
+
+
+class SpatialGrid:
+    """Rects bucketed into fixed-size cells for fast overlap queries"""
+    def __init__(self, cell=LAYOUT_CELL):
+        self.cell = cell
+        self.cells = {}  # (column, row) -> set of keys
+        self.rects = {}  # key -> QRect
+        self.kinds = {}  # key -> 'pet' or 'bubble'
+
+    def cells_for(self, rect):
+        left = rect.left() // self.cell
+        right = rect.right() // self.cell
+        top = rect.top() // self.cell
+        bottom = rect.bottom() // self.cell
+        return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+    def insert(self, key, rect, kind):
+        if key in self.rects:
+            if self.rects[key] == rect:
+                return
+            self.remove(key)
+        self.rects[key] = QRect(rect)
+        self.kinds[key] = kind
+        for cell in self.cells_for(rect):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        self.kinds.pop(key, None)
+        if rect is None:
+            return
+        for cell in self.cells_for(rect):
+            keys = self.cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+
+    def query(self, rect, kinds=None, ignore=()):
+        """Keys whose rects intersect rect"""
+        found = set()
+        for cell in self.cells_for(rect):
+            for key in self.cells.get(cell, ()):
+                if key in found or key in ignore:
+                    continue
+                if kinds is not None and self.kinds[key] not in kinds:
+                    continue
+                if self.rects[key].intersects(rect):
+                    found.add(key)
+        return found
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def __len__(self):
+        return len(self.rects)
+
+
+class Layout:
+    """Assign pets non-overlapping home slots and keep the grid index current"""
+    def __init__(self, margin=LAYOUT_MARGIN, spacing=LAYOUT_SPACING):
+        self.margin = margin
+        self.spacing = spacing
+        self.grid = SpatialGrid()
+        self.slots = {}  # pet -> slot index
+        self.pinned = set()  # pets the user dragged into place
+        self.free = []  # heap of released slot indices
+        self.next_slot = 0  # lowest slot never handed out since the last repack
+        screen_geometry().changed.connect(self.repack)
+
+    def screens(self):
+        """Available geometry of every screen, primary first"""
+        geometry = screen_geometry()
+        return [geometry.primary] + [rect for rect in geometry.screens if rect != geometry.primary]
+
+    def slot_rect(self, index, size):
+        """Where slot index is for a widget of size, or None past the last screen"""
+        width = size.width() + self.spacing
+        height = size.height() + self.spacing
+        for screen in self.screens():
+            columns = max(1, (screen.width() - 2 * self.margin + self.spacing) // width)
+            rows = max(1, (screen.height() - 2 * self.margin + self.spacing) // height)
+            if index < columns * rows:
+                row, column = divmod(index, columns)
+                x = screen.x() + screen.width() - self.margin - size.width() - column * width
+                y = screen.y() + screen.height() - self.margin - size.height() - row * height
+                return QRect(QPoint(x, y), size)
+            index -= columns * rows
+        return None
+
+    def take_slot(self, pet, ignore=()):
+        """Lowest free slot that no other pet is sitting on"""
+        skipped = []
+        while True:
+            if self.free:
+                index = heapq.heappop(self.free)
+            else:
+                index = self.next_slot
+                self.next_slot += 1
+            rect = self.slot_rect(index, pet.size())
+            if rect is None:
+                # Every screen is full: stack on the last slot
+                rect = self.slot_rect(max(0, index - 1), pet.size()) or QRect(QPoint(), pet.size())
+                break
+            if not self.grid.query(rect, kinds=('pet',), ignore=ignore or (pet,)):
+                break
+            skipped.append(index)
+        # Slots blocked by pinned or wandering pets stay free for later
+        for blocked in skipped:
+            heapq.heappush(self.free, blocked)
+        return index, rect
+
+    def place_pet(self, pet):
+        """Move a new pet to its home slot"""
+        index, rect = self.take_slot(pet)
+        self.slots[pet] = index
+        pet.move(rect.topLeft())
+        self.update(pet)
+
+    def remove(self, pet):
+        """Forget a pet that is going away"""
+        index = self.slots.pop(pet, None)
+        if index is not None:
+            heapq.heappush(self.free, index)
+        self.pinned.discard(pet)
+        self.grid.remove(pet)
+
+    def pin(self, pet):
+        """The user put this pet somewhere: leave it there"""
+        index = self.slots.pop(pet, None)
+        if index is not None:
+            heapq.heappush(self.free, index)
+        self.pinned.add(pet)
+        self.update(pet)
+
+    def repack(self, *args):
+        """Move the slotted pets into the lowest slots, keeping their order"""
+        pets = sorted(self.slots, key=self.slots.get)
+        self.slots = {}
+        self.free = []
+        self.next_slot = 0
+        # Only pinned pets block slots; the others are all about to move
+        moving = set(pets)
+        for pet in pets:
+            index, rect = self.take_slot(pet, moving)
+            self.slots[pet] = index
+            if pet.pos() != rect.topLeft():
+                pet.move(rect.topLeft())
+            self.update(pet)
+
+    def update(self, widget, kind='pet'):
+        """Record where a visible pet or bubble is now"""
+        self.grid.insert(widget, widget.frameGeometry(), kind)
+
+    def forget(self, widget):
+        self.grid.remove(widget)
+
+    def is_free(self, rect, ignore=(), kinds=None):
+        return not self.grid.query(rect, kinds=kinds, ignore=ignore)
+
+    def overlapping(self, rect, ignore=(), kinds=None):
+        """Rects of the pets and bubbles that rect would cover"""
+        return [self.grid.rects[key] for key in self.grid.query(rect, kinds=kinds, ignore=ignore)]
+
+
+_layout = None
+
+
+def layout():
+    """Return the shared Layout, creating it on first use"""
+    global _layout
+    if _layout is None:
+        _layout = Layout()
+    return _layout
@@ -0,0 +1,54 @@
+"""Stepped low-frame-rate movement for Yadon Desktop Pet"""
+
+from PyQt6.QtCore import QObject, QPoint
+
+from clock import get_clock
+
+
+class SteppedMover(QObject):
+    """Move a widget towards a target in whole sprite pixels at a low frame rate"""
+    def __init__(self, widget, step_size, fps, clock=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.step_size = step_size
+        self.fps = fps
+        self.start_pos = QPoint()
+        self.steps = 0
+        self.step_index = 0
+        self.delta_x = 0
+        self.delta_y = 0
+
+        # One timer per pet, reused for every move
+        self.timer = (clock or get_clock()).timer(self)
+        self.timer.timeout.connect(self.step)
+
+    def move_to(self, target, duration):
+        """Drift to target over roughly duration milliseconds"""
+        self.timer.stop()
+        self.start_pos = self.widget.pos()
+        # Snap the distance to whole sprite pixels so the pet stays on its grid
+        self.delta_x = round((target.x() - self.start_pos.x()) / self.step_size)
+        self.delta_y = round((target.y() - self.start_pos.y()) / self.step_size)
+        self.steps = max(abs(self.delta_x), abs(self.delta_y))
+        self.step_index = 0
+        if self.steps == 0:
+            return
+        # One tick per visible step, but never faster than the configured rate
+        interval = max(1000 // self.fps, duration // self.steps)
+        self.timer.start(interval)
+
+    def step(self):
+        self.step_index += 1
+        progress = self.step_index / self.steps
+        new_x = self.start_pos.x() + round(self.delta_x * progress) * self.step_size
+        new_y = self.start_pos.y() + round(self.delta_y * progress) * self.step_size
+        if new_x != self.widget.x() or new_y != self.widget.y():
+            self.widget.move(new_x, new_y)
+        if self.step_index >= self.steps:
+            self.timer.stop()
+
+    def stop(self):
+        self.timer.stop()
+
+    def is_moving(self):
+        return self.timer.isActive()
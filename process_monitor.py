@@ -1,37 +1,73 @@
 """Process monitoring functionality for Yadon Desktop Pet"""
 
 import subprocess
-from PyQt6.QtCore import QTimer
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject
 
-from config import VARIANT_ORDER, MAX_YADON_COUNT
+from config import VARIANT_ORDER, MAX_YADON_COUNT, PIXEL_SIZE, PROCESS_SCAN_MAX_INTERVAL
+from layout import layout
+from settings import settings
+from scheduler import scheduler
+from clock import get_clock
+from workers import ProcessScan, process_scanner
 
 
-class ProcessMonitor(QTimer):
+class ProcessMonitor(QObject):
     """Monitor Claude Code processes and manage Yadon instances"""
-    def __init__(self, initial_pets):
+    def __init__(self, initial_pets, clock=None):
         super().__init__()
+        self.clock = clock or get_clock()
         self.pets = initial_pets
+        # New Yadons match the size of the ones we started with
+        self.pixel_size = initial_pets[0].pixel_size if initial_pets else PIXEL_SIZE
         self.last_count = len(initial_pets)
-        self.timeout.connect(self.check_processes)
-        self.setInterval(5000)  # Check every 5 seconds
+        self.last_pids = None
+        self.assign_generic_hooks()
+        self.task = scheduler().add('process monitor', self.check_processes,
+                                    settings().get('process_scan_interval'), PROCESS_SCAN_MAX_INTERVAL,
+                                    start=False)
+        settings().changed.connect(self.apply_setting)
+        process_scanner().scanned.connect(self.apply_scan)
+    
+    def start(self):
+        self.task.resume()
+    
+    def stop(self):
+        self.task.pause()
+    
+    def apply_setting(self, name, value):
+        if name == 'process_scan_interval':
+            self.task.set_interval(value)
     
     def check_processes(self):
-        current_count = count_claude_processes()
+        """Ask for a process scan; apply_scan runs when it comes back"""
+        # Answered by a scan that just finished: nothing new, back off
+        if not process_scanner().request(self):
+            return False
+    
+    def apply_scan(self, scan):
+        # One scan serves both the count and the PID list
+        claude_pids = scan.claude_pids
+        # Scan often while sessions come and go, less while nothing changes;
+        # scans other pets asked for don't move our interval
+        if self in scan.requesters:
+            if claude_pids != self.last_pids:
+                self.task.reset()
+            else:
+                self.task.backoff()
+        self.last_pids = claude_pids
+        current_count = len(claude_pids)
         current_count = min(current_count, MAX_YADON_COUNT) if current_count > 0 else 0
         
         # Always update PIDs for existing Yadons
-        claude_pids = get_claude_pids()
         for i, pet in enumerate(self.pets):
             if i < len(claude_pids):
                 new_pid = claude_pids[i]
                 if pet.claude_pid != new_pid:
-                    # Update PID if it changed
-                    pet.claude_pid = new_pid
-                    # Also update hook handler with new PID
-                    if hasattr(pet, 'hook_handler'):
-                        pet.hook_handler.claude_pid = new_pid
-                    pet.update()  # Trigger redraw to show new PID
+                    # Update PID (and hook handler and label) if it changed
+                    pet.set_claude_pid(new_pid)
+                    # A Yadon hidden when it lost its session has one again
+                    if not pet.isVisible():
+                        pet.show()
             else:
                 # No corresponding Claude process for this Yadon
                 # Hide it immediately to prevent showing N/A
@@ -42,15 +78,6 @@ class ProcessMonitor(QTimer):
             # Process count changed, update Yadon instances
             if current_count > self.last_count:
                 # Add more Yadons
-                screen = QApplication.primaryScreen().geometry()
-                
-                # Calculate positions for bottom-right alignment
-                margin = 20  # Margin from screen edges
-                spacing = 10  # Space between Yadons
-                
-                # Already got PIDs above, reuse them
-                # claude_pids = get_claude_pids()
-                
                 for i in range(self.last_count, current_count):
                     # Import here to avoid circular import
                     from yadon_pet import YadonPet
@@ -59,13 +86,11 @@ class ProcessMonitor(QTimer):
                     claude_pid = claude_pids[i] if i < len(claude_pids) else None
                     # Randomly select variant with equal probability
                     variant = random.choice(VARIANT_ORDER)
-                    pet = YadonPet(claude_pid=claude_pid, variant=variant)
+                    pet = YadonPet(claude_pid=claude_pid, variant=variant, pixel_size=self.pixel_size,
+                                   clock=self.clock)
                     
-                    # Position in bottom-right, stacking from right to left
-                    from config import WINDOW_WIDTH, WINDOW_HEIGHT
-                    x_pos = screen.width() - margin - (WINDOW_WIDTH + spacing) * (len(self.pets) + 1)
-                    y_pos = screen.height() - margin - WINDOW_HEIGHT
-                    pet.move(x_pos, y_pos)
+                    # Lowest free slot; never on top of an existing Yadon
+                    layout().place_pet(pet)
                     
                     self.pets.append(pet)
                     pet.show()
@@ -76,56 +101,40 @@ class ProcessMonitor(QTimer):
                     # Close any open speech bubbles first
                     if hasattr(pet, 'bubble') and pet.bubble:
                         pet.bubble.close()
-                    # Stop all timers
-                    if hasattr(pet, 'timer'):
-                        pet.timer.stop()
-                    if hasattr(pet, 'action_timer'):
-                        pet.action_timer.stop()
-                    if hasattr(pet, 'monitor_timer'):
-                        pet.monitor_timer.stop()
-                    if hasattr(pet, 'hook_timer'):
-                        pet.hook_timer.stop()
                     # Hide immediately before closing to prevent N/A display
                     pet.hide()
                     # Close the widget
                     pet.close()
                     pet.deleteLater()  # Ensure proper cleanup
+                # Close the gaps the removed Yadons left
+                layout().repack()
             
             self.last_count = current_count
+            self.assign_generic_hooks()
+    
+    def assign_generic_hooks(self):
+        """Let only the first pet answer the generic (PID-less) hook files"""
+        for i, pet in enumerate(self.pets):
+            pet.hook_handler.handles_generic = i == 0
 
 
-def count_claude_processes():
-    """Count the number of Claude Code processes running"""
+def scan_processes():
+    """Run `ps aux` once and return a ProcessScan (blocking; see workers.py)"""
     try:
-        # Use ps to get more detailed info and filter properly
         result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        lines = result.stdout.strip().split('\n')
-        claude_count = 0
-        for line in lines:
-            # Count only actual claude processes (not node wrapper, not yadon)
-            if 'claude' in line and 'yadon' not in line and 'grep' not in line and 'node' not in line:
-                # Look for the actual claude binary process
-                parts = line.split()
-                # Check if the command is just "claude" (not a path or other command)
-                # The command may be at different column positions depending on process state
-                if len(parts) > 10:
-                    command_start = 10
-                    # Check if it's actually the claude binary
-                    if parts[command_start] == 'claude' or (len(parts) > 11 and parts[11] == 'claude'):
-                        claude_count += 1
-        return claude_count
     except Exception:
-        return 0
+        return ProcessScan([], False)
+    return parse_ps_output(result.stdout)
 
 
-def get_claude_pids():
-    """Get list of Claude process PIDs"""
+def parse_ps_output(output):
+    """Find Claude processes in `ps aux` output"""
+    claude_pids = []
+    claude_running = False
     try:
-        result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        lines = result.stdout.strip().split('\n')
-        claude_pids = []
-        for line in lines:
+        for line in output.strip().split('\n'):
             if 'claude' in line and 'yadon' not in line and 'node' not in line and 'grep' not in line:
+                claude_running = True
                 parts = line.split()
                 # Check if the command is just "claude" (actual claude process)
                 # The command may be at different column positions depending on process state
@@ -135,21 +144,7 @@ def get_claude_pids():
                     # Check if it's actually the claude binary
                     if parts[command_start] == 'claude' or (len(parts) > 11 and parts[11] == 'claude'):
                         claude_pids.append(parts[1])  # PID is second column
-        return claude_pids
-    except Exception:
-        return []
-
-
-def find_claude_pid():
-    """Find a Claude process PID"""
-    try:
-        result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        lines = result.stdout.strip().split('\n')
-        for line in lines:
-            if 'claude' in line and 'yadon' not in line and 'node' not in line and 'grep' not in line:
-                parts = line.split()
-                if len(parts) > 1:
-                    return parts[1]  # Return PID (second column)
     except Exception:
         pass
-    return None
\ No newline at end of file
+    return ProcessScan(claude_pids, claude_running)
+
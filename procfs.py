@@ -0,0 +1,48 @@
+"""/proc readers shared by the hook client, session info and session sampler
+
+Keep this module free of Qt imports - hook_client.py uses it on every hook.
+"""
+
+import os
+
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+# Indexes into the fields read_stat() returns. fields[0] is state (field 3
+# in proc(5)), so field N is fields[N - 3].
+STAT_PPID = 1
+STAT_TTY_NR = 4
+STAT_UTIME = 11
+STAT_STIME = 12
+STAT_STARTTIME = 19
+
+
+def proc_available():
+    return os.path.exists('/proc/self/stat')
+
+
+def read_stat(pid):
+    """Return (comm, fields after comm) from /proc/<pid>/stat, or None if it is gone"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses, so split on the last ')'
+    close_paren = data.rindex(b')')
+    comm = data[data.index(b'(') + 1:close_paren].decode(errors='replace')
+    return comm, data[close_paren + 2:].split()
+
+
+def read_starttime(pid):
+    """Return the start time of pid in clock ticks after boot, or None"""
+    stat = read_stat(pid)
+    return int(stat[1][STAT_STARTTIME]) if stat else None
+
+
+def read_cpu_ticks(pid):
+    """Return utime + stime of pid in clock ticks, or None if it is gone"""
+    stat = read_stat(pid)
+    if stat is None:
+        return None
+    fields = stat[1]
+    return int(fields[STAT_UTIME]) + int(fields[STAT_STIME])
@@ -0,0 +1,168 @@
+"""Opt-in slot profiling for Yadon Desktop Pet
+
+With `--profile` (or YADON_PROFILE=1) the timer slots and event handlers
+listed in PROFILED_SLOTS are wrapped on their classes before any pet
+exists, so every call is counted and timed with two perf_counter() reads.
+A cProfile window of the GUI thread can be added on top, at startup with
+`--profile-window SECONDS` or later with `yadon_ctl.py profile SECONDS`.
+
+The ranked report goes to PROFILE_REPORT on exit and whenever the process
+gets SIGUSR1:
+
+    kill -USR1 $(pgrep -f yadon_pet.py)
+"""
+
+import io
+import os
+import time
+import pstats
+import signal
+import cProfile
+import functools
+
+from PyQt6.QtCore import QTimer
+
+from config import PROFILE_REPORT, PROFILE_TOP
+from workers import debug_log
+
+# Class name -> methods to wrap
+PROFILED_SLOTS = {
+    'YadonPet': ['animate_face', 'paintEvent', 'moveEvent', 'check_claude_code', 'on_process_scan',
+                 'check_hook_messages', 'on_hook_messages', 'on_session_sample', 'random_action'],
+    'ProcessMonitor': ['check_processes', 'apply_scan'],
+    'SpeechBubble': ['update_position', 'paintEvent'],
+    'SessionSampler': ['sample'],
+    'SteppedMover': ['step'],
+    'Scheduler': ['run_due'],
+}
+
+
+class SlotStats:
+    """Call count and time spent in one slot"""
+    __slots__ = ('calls', 'total', 'max')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0  # seconds
+        self.max = 0.0
+
+
+class Profiler:
+    """Per-slot counters plus an optional cProfile window"""
+    def __init__(self):
+        self.slots = {}  # 'Class.method' -> SlotStats
+        self.started = time.monotonic()
+        self.profile = None  # cProfile.Profile while a window is open
+        self.window_stats = None  # pstats.Stats of the last finished window
+        self.window_timer = None
+
+    def wrap(self, cls, name):
+        """Replace cls.name with a timed wrapper"""
+        method = cls.__dict__.get(name)
+        if method is None or getattr(method, '__wrapped__', None) is not None:
+            return
+        stats = self.slots.setdefault(f"{cls.__name__}.{name}", SlotStats())
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stats.calls += 1
+                stats.total += elapsed
+                if elapsed > stats.max:
+                    stats.max = elapsed
+
+        setattr(cls, name, timed)
+
+    def install(self, classes):
+        for cls in classes:
+            for name in PROFILED_SLOTS.get(cls.__name__, ()):
+                self.wrap(cls, name)
+
+    def start_window(self, seconds):
+        """Run cProfile on the GUI thread for the next seconds"""
+        if self.profile is not None:
+            return False
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        if self.window_timer is None:
+            self.window_timer = QTimer()
+            self.window_timer.setSingleShot(True)
+            self.window_timer.timeout.connect(self.stop_window)
+        self.window_timer.start(int(seconds * 1000))
+        debug_log(f"cProfile window started for {seconds:g}s")
+        return True
+
+    def stop_window(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        self.window_stats = pstats.Stats(self.profile, stream=io.StringIO())
+        self.profile = None
+        self.write_report()
+
+    def ranked(self):
+        """[(name, SlotStats)] by total time, busiest first"""
+        return sorted(((name, stats) for name, stats in self.slots.items() if stats.calls),
+                      key=lambda item: item[1].total, reverse=True)
+
+    def report(self):
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        lines = [f"Yadon slot profile, pid {os.getpid()}, {elapsed:.0f}s "
+                 f"(nested slots, e.g. Scheduler.run_due, include their callees)",
+                 f"{'slot':36} {'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>8} {'% wall':>7}"]
+        for name, stats in self.ranked():
+            lines.append(f"{name:36} {stats.calls:8} {stats.total * 1000:10.1f} "
+                         f"{stats.total / stats.calls * 1000:9.3f} {stats.max * 1000:8.1f} "
+                         f"{stats.total / elapsed * 100:7.2f}")
+        if self.window_stats is not None:
+            stream = io.StringIO()
+            self.window_stats.stream = stream
+            self.window_stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+            lines.append('')
+            lines.append('cProfile window (GUI thread):')
+            lines.append(stream.getvalue().rstrip())
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, *args):
+        path = PROFILE_REPORT.format(pid=os.getpid())
+        try:
+            with open(path, 'w') as f:
+                f.write(self.report())
+        except OSError as e:
+            debug_log(f"Could not write profile report {path}: {e}")
+            return None
+        debug_log(f"Profile report written to {path}")
+        return path
+
+    def stats(self):
+        return {name: {'calls': stats.calls, 'total_ms': round(stats.total * 1000, 1),
+                       'max_ms': round(stats.max * 1000, 1)}
+                for name, stats in self.ranked()}
+
+
+_profiler = None
+
+
+def profiler():
+    """Return the Profiler, or None unless profiling was enabled"""
+    return _profiler
+
+
+def enable(app, classes, window=0):
+    """Wrap the slots of classes and report on exit and on SIGUSR1"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    _profiler.install(classes)
+    if window:
+        _profiler.start_window(window)
+    app.aboutToQuit.connect(_profiler.stop_window)
+    app.aboutToQuit.connect(_profiler.write_report)
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, lambda sig, frame: _profiler.write_report())
+    return _profiler
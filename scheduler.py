@@ -0,0 +1,167 @@
+"""Shared periodic task scheduler for Yadon Desktop Pet
+
+All background polling (process scans, hook file polling, session
+sampling, random actions, ...) runs as tasks on one single-shot QTimer
+instead of a QTimer per job per pet. Due times are rounded up to a
+SCHEDULER_SLOT grid so tasks that come due close together run in the
+same wakeup, and tasks that keep finding nothing new back off
+exponentially until activity resets them. Face animation and movement
+keep their own timers since they are frame-accurate.
+"""
+
+from PyQt6.QtCore import QObject, Qt
+
+from config import SCHEDULER_SLOT, SCHEDULER_BACKOFF
+from clock import get_clock
+from workers import debug_log
+
+
+class Task:
+    """One periodic job on the scheduler"""
+    def __init__(self, scheduler, name, callback, interval, max_interval=None):
+        self.scheduler = scheduler
+        self.name = name
+        self.callback = callback
+        self.base_interval = interval  # ms
+        self.max_interval = max_interval or interval  # backoff ceiling
+        self.interval = interval  # current, grows while idle
+        self.next_due = None  # clock.now() seconds, None while paused
+        self.runs = 0
+
+    def set_interval(self, interval, max_interval=None):
+        """Change the base interval (e.g. from a setting)"""
+        self.base_interval = interval
+        if max_interval is not None:
+            self.max_interval = max_interval
+        self.max_interval = max(self.max_interval, interval)
+        self.interval = interval
+        if self.next_due is not None:
+            self.scheduler.reschedule(self)
+
+    def backoff(self):
+        """Nothing changed: wait longer next time, up to max_interval"""
+        self.interval = min(self.max_interval, int(self.interval * SCHEDULER_BACKOFF))
+
+    def reset(self):
+        """Something happened: poll at the base interval again, starting now"""
+        if self.interval != self.base_interval:
+            self.interval = self.base_interval
+            if self.next_due is not None:
+                self.scheduler.reschedule(self)
+
+    def pause(self):
+        self.next_due = None
+
+    def resume(self):
+        if self.next_due is None:
+            self.scheduler.reschedule(self)
+
+    @property
+    def active(self):
+        return self.next_due is not None
+
+    def stop(self):
+        """Remove the task from the scheduler for good"""
+        self.scheduler.remove(self)
+
+
+class Scheduler(QObject):
+    """Run periodic tasks from one timer, batching wakeups on a slot grid"""
+    def __init__(self, slot=SCHEDULER_SLOT, clock=None):
+        super().__init__()
+        self.clock = clock or get_clock()
+        self.slot = slot / 1000  # seconds
+        self.tasks = []
+        self.timer = self.clock.timer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.run_due)
+        self.started = self.clock.now()
+        self.wakeups = 0
+        self.task_runs = 0
+
+    def add(self, name, callback, interval, max_interval=None, start=True):
+        """Run callback every interval ms
+
+        The callback may return True (activity: reset to the base
+        interval), False (nothing new: back off) or None (keep the
+        interval as it is).
+        """
+        task = Task(self, name, callback, interval, max_interval)
+        self.tasks.append(task)
+        if start:
+            self.reschedule(task)
+        return task
+
+    def remove(self, task):
+        task.next_due = None
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def align(self, due):
+        """Round a due time up to the next slot boundary"""
+        slots = -(-(due - self.started) // self.slot)
+        return self.started + slots * self.slot
+
+    def reschedule(self, task, now=None):
+        now = self.clock.now() if now is None else now
+        task.next_due = self.align(now + task.interval / 1000)
+        self.arm(now)
+
+    def arm(self, now=None):
+        """Point the timer at the earliest due task"""
+        due = [task.next_due for task in self.tasks if task.next_due is not None]
+        if not due:
+            self.timer.stop()
+            return
+        now = self.clock.now() if now is None else now
+        delay = max(0, round((min(due) - now) * 1000))
+        if not self.timer.isActive() or self.timer.remainingTime() > delay:
+            self.timer.start(delay)
+
+    def run_due(self):
+        self.wakeups += 1
+        now = self.clock.now()
+        # Anything due within this slot runs now
+        horizon = now + self.slot / 2
+        for task in list(self.tasks):
+            if task.next_due is None or task.next_due > horizon:
+                continue
+            task.runs += 1
+            self.task_runs += 1
+            try:
+                result = task.callback()
+            except Exception as e:
+                debug_log(f"Scheduled task {task.name} failed: {e}")
+                result = None
+            if result is True:
+                task.interval = task.base_interval
+            elif result is False:
+                task.backoff()
+            # The callback may have paused or removed the task
+            if task.next_due is not None and task in self.tasks:
+                task.next_due = self.align(now + task.interval / 1000)
+        self.timer.stop()
+        self.arm()
+
+    def stats(self):
+        elapsed = max(1e-9, self.clock.now() - self.started)
+        return {
+            'tasks': len(self.tasks),
+            'active': sum(1 for task in self.tasks if task.active),
+            'wakeups': self.wakeups,
+            'wakeups_per_minute': round(self.wakeups / elapsed * 60, 1),
+            'task_runs': self.task_runs,
+            'intervals': {task.name: task.interval for task in self.tasks if task.active},
+        }
+
+
+_scheduler = None
+
+
+def scheduler():
+    """Return the shared Scheduler, creating it on first use"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler()
+    return _scheduler
@@ -0,0 +1,67 @@
+"""Cached multi-monitor screen geometry for Yadon Desktop Pet"""
+
+from PyQt6.QtCore import QObject, QRect, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+
+class ScreenGeometry(QObject):
+    """Keep every screen's available geometry and answer point lookups from the cache"""
+    # Emitted after the cached geometries were re-read
+    changed = pyqtSignal()
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.screens = []  # available geometry of each screen
+        self.primary = QRect()
+        self.last_hit = None  # pets and bubbles usually stay on one screen
+
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.refresh)
+        app.primaryScreenChanged.connect(self.refresh)
+        for screen in app.screens():
+            self.watch_screen(screen)
+        self.refresh()
+
+    def watch_screen(self, screen):
+        screen.geometryChanged.connect(self.refresh)
+        screen.availableGeometryChanged.connect(self.refresh)
+
+    def on_screen_added(self, screen):
+        self.watch_screen(screen)
+        self.refresh()
+
+    def refresh(self, *args):
+        """Re-read all screen geometries (only called from screen signals)"""
+        self.screens = [screen.availableGeometry() for screen in self.app.screens()]
+        primary_screen = self.app.primaryScreen()
+        self.primary = primary_screen.availableGeometry() if primary_screen else QRect()
+        self.last_hit = None
+        self.changed.emit()
+
+    def screen_at(self, point):
+        """Return the available geometry of the screen containing point"""
+        # Common case: same screen as last time
+        if self.last_hit is not None and self.last_hit.contains(point):
+            return self.last_hit
+        for rect in self.screens:
+            if rect.contains(point):
+                self.last_hit = rect
+                return rect
+        # Point is off every screen (e.g. in a gap between monitors)
+        return self.primary
+
+    def screen_for_rect(self, rect):
+        """Return the available geometry of the screen containing rect's center"""
+        return self.screen_at(rect.center())
+
+
+_screen_geometry = None
+
+
+def screen_geometry():
+    """Return the shared ScreenGeometry, creating it on first use"""
+    global _screen_geometry
+    if _screen_geometry is None:
+        _screen_geometry = ScreenGeometry(QApplication.instance())
+    return _screen_geometry
@@ -0,0 +1,200 @@
+"""Claude session metadata for Yadon Desktop Pet
+
+Collects the working directory, terminal, project (git toplevel) and start
+time of a Claude process from /proc. Results are cached per
+(pid, starttime), so a reused PID is never mistaken for the old session,
+and they are resolved in a BackgroundTask so the GUI thread never
+touches /proc or walks the filesystem.
+"""
+
+import os
+import time
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from hook_client import is_claude_process
+from procfs import CLK_TCK, STAT_STARTTIME, STAT_TTY_NR, read_stat, read_starttime, proc_available
+from workers import BackgroundTask
+
+
+class SessionInfo:
+    """What we know about one Claude process"""
+    def __init__(self, pid, starttime, is_claude=True, cwd=None, tty=None,
+                 project_root=None, started_at=None):
+        self.pid = pid
+        self.starttime = starttime  # clock ticks after boot, unique per PID reuse
+        self.is_claude = is_claude
+        self.cwd = cwd
+        self.tty = tty
+        self.project_root = project_root
+        self.started_at = started_at  # epoch seconds
+
+    @property
+    def key(self):
+        return (self.pid, self.starttime)
+
+    @property
+    def project(self):
+        root = self.project_root or self.cwd
+        return os.path.basename(root.rstrip('/')) if root else None
+
+    def summary(self):
+        lines = []
+        if self.project:
+            lines.append(self.project)
+        if self.cwd:
+            lines.append(self.cwd)
+        details = [f"PID {self.pid}"]
+        if self.tty:
+            details.append(self.tty)
+        if self.started_at:
+            details.append(time.strftime('started %H:%M', time.localtime(self.started_at)))
+        lines.append(', '.join(details))
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {'pid': self.pid, 'project': self.project, 'cwd': self.cwd, 'tty': self.tty,
+                'started_at': self.started_at}
+
+
+_boot_time = None
+
+
+def boot_time():
+    global _boot_time
+    if _boot_time is None:
+        try:
+            with open('/proc/stat', 'rb') as f:
+                for line in f:
+                    if line.startswith(b'btime '):
+                        _boot_time = int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return _boot_time
+
+
+def tty_name(pid, tty_nr):
+    """Name of the controlling terminal, e.g. 'pts/3'"""
+    try:
+        target = os.readlink(f'/proc/{pid}/fd/0')
+        if target.startswith('/dev/'):
+            return target[len('/dev/'):]
+    except OSError:
+        pass
+    if not tty_nr:
+        return None
+    # Device number layout from <linux/kdev_t.h>
+    major = (tty_nr >> 8) & 0xfff
+    minor = (tty_nr & 0xff) | ((tty_nr >> 12) & 0xfff00)
+    if 136 <= major <= 143:
+        return f'pts/{(major - 136) * 256 + minor}'
+    if major == 4:
+        return f'tty{minor}'
+    return None
+
+
+def find_git_toplevel(path):
+    """Walk up from path to the directory containing .git"""
+    while path:
+        if os.path.exists(os.path.join(path, '.git')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return None
+
+
+def read_session_info(pid):
+    """Collect SessionInfo for pid from /proc, or None if it is gone"""
+    stat = read_stat(pid)
+    if stat is None:
+        return None
+    comm, fields = stat
+    starttime = int(fields[STAT_STARTTIME])
+    if not is_claude_process(pid, comm):
+        return SessionInfo(pid, starttime, is_claude=False)
+    try:
+        cwd = os.readlink(f'/proc/{pid}/cwd')
+    except OSError:
+        cwd = None
+    btime = boot_time()
+    return SessionInfo(
+        pid, starttime,
+        cwd=cwd,
+        tty=tty_name(pid, int(fields[STAT_TTY_NR])),
+        project_root=find_git_toplevel(cwd) if cwd else None,
+        started_at=btime + starttime / CLK_TCK if btime else None,
+    )
+
+
+class SessionResolver(QObject):
+    """Resolve SessionInfo off the GUI thread, cached by (pid, starttime)"""
+    # Emitted on the GUI thread with the SessionInfo, or None when the pid is gone
+    resolved = pyqtSignal(int, object)
+
+    def __init__(self, clock=None):
+        super().__init__()
+        self.cache = {}  # (pid, starttime) -> SessionInfo
+        self.wanted = set()  # pids waiting for the next lookup
+        self.lock = threading.Lock()
+        self.task = BackgroundTask(self.resolve_wanted, 'session info', clock)
+        self.task.finished.connect(self.on_resolved)
+
+    def request(self, pid):
+        """Look up pid in the background; the answer arrives via `resolved`"""
+        if not pid or not proc_available():
+            return
+        with self.lock:
+            self.wanted.add(int(pid))
+        # While a lookup is running, on_resolved starts the next one
+        self.task.run()
+
+    def resolve_wanted(self):
+        """Worker side: resolve every pid requested since the last run"""
+        with self.lock:
+            pids, self.wanted = self.wanted, set()
+        return [(pid, self.resolve(pid)) for pid in sorted(pids)]
+
+    def on_resolved(self, results):
+        for pid, info in results:
+            self.resolved.emit(pid, info)
+        if self.wanted:
+            self.task.run()
+
+    def resolve(self, pid):
+        """One stat read when cached, a full lookup when the key is new"""
+        try:
+            starttime = read_starttime(pid)
+            info = None
+            if starttime is None:
+                with self.lock:
+                    for key in [key for key in self.cache if key[0] == pid]:
+                        del self.cache[key]
+            else:
+                with self.lock:
+                    info = self.cache.get((pid, starttime))
+                if info is None:
+                    info = read_session_info(pid)
+                    if info is not None:
+                        with self.lock:
+                            # A new key for this pid means the old process is gone
+                            for key in [key for key in self.cache if key[0] == pid]:
+                                del self.cache[key]
+                            self.cache[info.key] = info
+        except Exception:
+            info = None
+        return info
+
+
+_resolver = None
+
+
+def session_resolver():
+    """Return the shared SessionResolver, creating it on first use"""
+    global _resolver
+    if _resolver is None:
+        _resolver = SessionResolver()
+    return _resolver
@@ -0,0 +1,164 @@
+"""Per-session CPU/RSS sampling for Yadon Desktop Pet
+
+Reads /proc/<pid>/stat and /proc/<pid>/statm directly (no ps, no fork) and
+keeps a short history of each tracked Claude session in ring buffers.
+"""
+
+import os
+from collections import deque
+
+from PyQt6.QtCore import QObject
+
+from config import (
+    SAMPLE_HISTORY, SAMPLE_CHILDREN, BUSY_CPU_PERCENT, IDLE_CPU_PERCENT,
+    IDLE_SAMPLES_BEFORE_DOZE
+)
+from settings import settings
+from scheduler import scheduler
+from clock import get_clock
+from procfs import (
+    CLK_TCK, STAT_UTIME, STAT_STIME, STAT_STARTTIME, proc_available, read_stat, read_cpu_ticks
+)
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+
+
+def read_rss(pid):
+    """Return resident set size of pid in bytes, or None if it is gone"""
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def read_children(pid):
+    """Return the direct children of pid (needs CONFIG_PROC_CHILDREN)"""
+    children = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tid}/children', 'rb') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def process_tree(pid):
+    """Return pid and all of its descendants"""
+    pids = [pid]
+    i = 0
+    while i < len(pids):
+        pids.extend(read_children(pids[i]))
+        i += 1
+    return pids
+
+
+def sparkline(values):
+    """Render values as a unicode sparkline"""
+    if not values:
+        return ''
+    top = max(max(values), 1e-9)
+    last = len(SPARK_CHARS) - 1
+    return ''.join(SPARK_CHARS[min(last, int(value / top * last))] for value in values)
+
+
+class SessionStats:
+    """Ring buffers of recent CPU and memory samples for one Claude session"""
+    def __init__(self, pid, starttime=None):
+        self.pid = pid
+        self.starttime = starttime  # clock ticks after boot, unique per PID reuse
+        self.cpu = deque(maxlen=SAMPLE_HISTORY)  # percent of one core
+        self.rss = deque(maxlen=SAMPLE_HISTORY)  # bytes
+        self.last_ticks = None
+        self.last_time = None
+        self.idle_samples = 0
+
+    def add_sample(self, ticks, rss, now):
+        if self.last_ticks is not None and now > self.last_time:
+            # Children exiting can make the subtree total go down
+            delta = max(0, ticks - self.last_ticks)
+            cpu = delta / CLK_TCK / (now - self.last_time) * 100
+            self.cpu.append(cpu)
+            self.idle_samples = self.idle_samples + 1 if cpu < IDLE_CPU_PERCENT else 0
+        self.last_ticks = ticks
+        self.last_time = now
+        self.rss.append(rss)
+
+    def cpu_percent(self):
+        return self.cpu[-1] if self.cpu else 0.0
+
+    def rss_mb(self):
+        return self.rss[-1] / (1024 * 1024) if self.rss else 0.0
+
+    def activity(self):
+        """'busy', 'dozing' or 'normal'"""
+        if self.cpu_percent() >= BUSY_CPU_PERCENT:
+            return 'busy'
+        if self.idle_samples >= IDLE_SAMPLES_BEFORE_DOZE:
+            return 'dozing'
+        return 'normal'
+
+    def summary(self):
+        return (f"CPU {self.cpu_percent():.0f}% {sparkline(list(self.cpu))}\n"
+                f"RSS {self.rss_mb():.0f}MB")
+
+
+class SessionSampler(QObject):
+    """Sample every pet's Claude session and tell the pet how busy it is"""
+    def __init__(self, pets, clock=None):
+        super().__init__()
+        self.pets = pets
+        self.clock = clock or get_clock()
+        # (pid, starttime) -> SessionStats, so a recycled PID starts a fresh history
+        self.stats = {}
+        # CPU percentages need evenly spaced samples, so this one never backs off
+        self.task = scheduler().add('session sample', self.sample, settings().get('sample_interval'),
+                                    start=False)
+        settings().changed.connect(self.apply_setting)
+
+    def apply_setting(self, name, value):
+        if name == 'sample_interval':
+            self.task.set_interval(value)
+
+    def start(self):
+        # Without /proc (e.g. macOS) there is nothing cheap to sample
+        if proc_available():
+            self.task.resume()
+
+    def stop(self):
+        self.task.pause()
+
+    def sample(self):
+        now = self.clock.now()
+        seen = set()
+        for pet in self.pets:
+            if not pet.claude_pid:
+                continue
+            pid = int(pet.claude_pid)
+            stat = read_stat(pid)
+            if stat is None:
+                continue
+            fields = stat[1]
+            key = (pid, int(fields[STAT_STARTTIME]))
+            seen.add(key)
+            ticks = int(fields[STAT_UTIME]) + int(fields[STAT_STIME])
+            rss = read_rss(pid) or 0
+            if SAMPLE_CHILDREN:
+                for member in process_tree(pid)[1:]:
+                    member_ticks = read_cpu_ticks(member)
+                    if member_ticks is None:
+                        continue
+                    ticks += member_ticks
+                    rss += read_rss(member) or 0
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = SessionStats(*key)
+            stats.add_sample(ticks, rss, now)
+            pet.on_session_sample(stats)
+
+        # Forget sessions that no pet tracks any more
+        for key in list(self.stats):
+            if key not in seen:
+                del self.stats[key]
@@ -0,0 +1,117 @@
+"""Runtime-tunable settings for Yadon Desktop Pet"""
+
+import os
+import json
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import config
+from config import USER_CONFIG_FILE
+from workers import debug_log
+
+# Setting name -> config.py constant that provides its default
+TUNABLE_SETTINGS = {
+    'face_interval': 'FACE_ANIMATION_INTERVAL',
+    'hook_interval': 'HOOK_CHECK_INTERVAL',
+    'claude_check_interval': 'CLAUDE_CHECK_INTERVAL',
+    'process_scan_interval': 'PROCESS_SCAN_INTERVAL',
+    'bubble_display_time': 'BUBBLE_DISPLAY_TIME',
+    'bubble_min_dwell': 'BUBBLE_MIN_DWELL',
+    'random_action_min_interval': 'RANDOM_ACTION_MIN_INTERVAL',
+    'random_action_max_interval': 'RANDOM_ACTION_MAX_INTERVAL',
+    'movement_duration': 'MOVEMENT_DURATION',
+    'movement_fps': 'MOVEMENT_STEP_FPS',
+    'sample_interval': 'SAMPLE_INTERVAL',
+}
+
+
+class Settings(QObject):
+    """Current values of the tunable settings, with change notifications"""
+    changed = pyqtSignal(str, object)  # name, new value
+
+    def __init__(self, config_file=USER_CONFIG_FILE):
+        super().__init__()
+        self.config_file = config_file
+        self.values = self.defaults()
+        self.load_user_config()
+
+    @staticmethod
+    def defaults():
+        return {name: getattr(config, constant) for name, constant in TUNABLE_SETTINGS.items()}
+
+    def get(self, name):
+        return self.values[name]
+
+    def set(self, name, value):
+        """Set a setting and notify live timers; raises KeyError/ValueError on bad input"""
+        name, value = self.validate(name, value)
+        if self.values[name] != value:
+            self.values[name] = value
+            self.changed.emit(name, value)
+
+    @classmethod
+    def validate(cls, name, value):
+        """Return (setting name, value as a positive int); raises KeyError/ValueError"""
+        name = cls.normalize_name(name)
+        try:
+            value = int(value)
+        except TypeError:
+            raise ValueError(f"{name} must be a number")
+        if value <= 0:
+            raise ValueError(f"{name} must be positive")
+        return name, value
+
+    @staticmethod
+    def normalize_name(name):
+        """Accept both setting names and config.py constant names"""
+        if name in TUNABLE_SETTINGS:
+            return name
+        for setting, constant in TUNABLE_SETTINGS.items():
+            if name == constant:
+                return setting
+        raise KeyError(f"unknown setting: {name}")
+
+    def read_user_config(self):
+        """Read the user config file, returning {} if there is none"""
+        path = os.path.expanduser(self.config_file)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def load_user_config(self):
+        """Reset to defaults and apply the user config file on top"""
+        try:
+            overrides = self.read_user_config()
+        except Exception as e:
+            self._debug_log(f"Error reading {self.config_file}: {e}")
+            return False
+
+        new_values = self.defaults()
+        for name, value in overrides.items():
+            try:
+                name, value = self.validate(name, value)
+                new_values[name] = value
+            except (KeyError, ValueError) as e:
+                self._debug_log(f"Ignoring config entry {name}: {e}")
+
+        for name, value in new_values.items():
+            if self.values.get(name) != value:
+                self.values[name] = value
+                self.changed.emit(name, value)
+        return True
+
+    def _debug_log(self, message):
+        """Write debug message to log file"""
+        debug_log(message)
+
+
+_settings = None
+
+
+def settings():
+    """Return the shared Settings, creating it on first use"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
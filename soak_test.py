@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Soak test for Yadon Desktop Pet.
+
+Runs the real pets, process monitor and session sampler offscreen while
+fake Claude sessions come and go and fire hooks at them. Every timer is
+sped up by --speed, so a few minutes of wall time cover hours of normal
+use. Memory (RSS and the Python heap via tracemalloc), QObject wrappers
+reachable from Python, widgets, open file descriptors and threads are
+sampled throughout; after a warmup the trend of each must stay flat,
+otherwise the test fails.
+
+Fake sessions are real processes whose argv[0] is `claude` (a renamed
+`sleep`), so they go through the same `ps` scan as real ones. The scan
+keeps only the sessions the test spawned, so Claude sessions you have
+open while it runs are left alone.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python3 soak_test.py --duration 300 --speed 30
+    python3 soak_test.py --duration 60 --csv samples.csv
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QTimer
+
+import event_store
+from config import MAX_YADON_COUNT, PIXEL_SIZE
+import settings
+from settings import TUNABLE_SETTINGS
+from hook_client import write_hook, hook_file_for
+import clock
+from process_monitor import ProcessMonitor
+from workers import ProcessScan
+from session_sampler import SessionSampler
+from watchdog import Watchdog
+from scheduler import scheduler
+from yadon_pet import create_pet
+
+# Settings that are times, not rates, and get divided by --speed
+TIMED_SETTINGS = [name for name in TUNABLE_SETTINGS if name != 'movement_fps']
+MIN_INTERVAL = 10  # ms
+
+# Allowed growth after warmup, projected over the measured window. The
+# object counts leave room for sessions coming and going (up to
+# MAX_YADON_COUNT pets); a leak keeps growing past them on a long run.
+TOLERANCES = {
+    'rss_mb': 16.0,
+    'heap_mb': 4.0,
+    'py_qobjects': 50,
+    'widgets': 10,
+    'fds': 10,
+    'threads': 5,
+}
+
+HOOK_TYPES = ['notification', 'stop']
+
+
+class FakeSessions:
+    """Claude sessions that are really `sleep` processes named claude
+
+    Also the process source of the soak: a real `ps` scan narrowed down
+    to the sessions spawned here.
+    """
+    def __init__(self):
+        self.processes = []
+        self.ps = clock.PsProcessSource()
+
+    def spawn(self):
+        process = subprocess.Popen(['claude', '86400'], executable='/bin/sleep')
+        self.processes.append(process)
+        return process
+
+    def kill_one(self):
+        if self.processes:
+            process = self.processes.pop(random.randrange(len(self.processes)))
+            self.kill(process)
+
+    def kill(self, process):
+        process.kill()
+        process.wait()
+        try:
+            os.remove(hook_file_for(process.pid))
+        except OSError:
+            pass
+
+    def pids(self):
+        return [process.pid for process in self.processes]
+
+    def scan(self):
+        ours = {str(pid) for pid in self.pids()}
+        claude_pids = [pid for pid in self.ps.scan().claude_pids if pid in ours]
+        return ProcessScan(claude_pids, bool(claude_pids))
+
+    def close(self):
+        while self.processes:
+            self.kill(self.processes.pop())
+
+
+def count_fds():
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+
+def read_rss_mb():
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        return None
+
+
+def count_py_qobjects():
+    """QObject wrappers that are still reachable from Python
+
+    Objects Qt creates internally, or that Python dropped while Qt keeps
+    them alive, are not seen here; the widget count covers the windows.
+    """
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, QObject))
+
+
+def take_sample(started):
+    gc.collect()
+    return {
+        'time': time.monotonic() - started,
+        'rss_mb': read_rss_mb(),
+        'heap_mb': tracemalloc.get_traced_memory()[0] / (1024 * 1024),
+        'py_qobjects': count_py_qobjects(),
+        'widgets': len(QApplication.allWidgets()),
+        'fds': count_fds(),
+        'threads': threading.active_count(),
+    }
+
+
+def slope(points):
+    """Least-squares slope of (x, y) points"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def analyze(samples, warmup):
+    """Return [(metric, first, last, projected growth, tolerance, ok)]"""
+    steady = [sample for sample in samples if sample['time'] >= warmup]
+    if len(steady) < 3:
+        return []
+    window = steady[-1]['time'] - steady[0]['time']
+    results = []
+    for metric, tolerance in TOLERANCES.items():
+        points = [(sample['time'], sample[metric]) for sample in steady if sample[metric] is not None]
+        if len(points) < 3:
+            continue
+        growth = slope(points) * window
+        results.append((metric, points[0][1], points[-1][1], growth, tolerance, growth <= tolerance))
+    return results
+
+
+class Soak:
+    def __init__(self, args):
+        self.args = args
+        self.sessions = FakeSessions()
+        self.samples = []
+        self.hooks_sent = 0
+        self.churns = 0
+        self.started = time.monotonic()
+
+    def speed_up(self):
+        for name in TIMED_SETTINGS:
+            value = settings.settings().get(name)
+            settings.settings().set(name, max(MIN_INTERVAL, int(value / self.args.speed)))
+
+    def start(self):
+        for _ in range(self.args.sessions):
+            self.sessions.spawn()
+        self.speed_up()
+
+        scan = self.sessions.scan()
+        count = max(1, min(len(scan.claude_pids), MAX_YADON_COUNT))
+        self.pets = [create_pet(i, scan.claude_pids, scan.claude_running, pixel_size=PIXEL_SIZE)
+                     for i in range(count)]
+        for pet in self.pets:
+            pet.show()
+        self.monitor = ProcessMonitor(self.pets)
+        self.monitor.start()
+        self.sampler = SessionSampler(self.pets)
+        self.sampler.start()
+        self.watchdog = Watchdog()
+        self.watchdog.start()
+
+        # Sessions come and go every --churn simulated seconds
+        self.churn_timer = QTimer()
+        self.churn_timer.timeout.connect(self.churn)
+        self.churn_timer.start(max(MIN_INTERVAL, int(self.args.churn * 1000 / self.args.speed)))
+
+        # Hooks at --hook-rate per simulated minute per session
+        self.hook_timer = QTimer()
+        self.hook_timer.timeout.connect(self.fire_hooks)
+        self.hook_timer.start(max(MIN_INTERVAL, int(60000 / self.args.hook_rate / self.args.speed)))
+
+        self.sample_timer = QTimer()
+        self.sample_timer.timeout.connect(self.sample)
+        self.sample_timer.start(int(self.args.sample_interval * 1000))
+
+        QTimer.singleShot(int(self.args.duration * 1000), QApplication.quit)
+
+    def churn(self):
+        self.churns += 1
+        if self.sessions.processes and (len(self.sessions.processes) >= MAX_YADON_COUNT or random.random() < 0.5):
+            self.sessions.kill_one()
+        if len(self.sessions.processes) < MAX_YADON_COUNT and random.random() < 0.6:
+            self.sessions.spawn()
+
+    def fire_hooks(self):
+        for pid in self.sessions.pids():
+            write_hook(pid, random.choice(HOOK_TYPES), f'soak {self.hooks_sent}')
+            self.hooks_sent += 1
+
+    def sample(self):
+        sample = take_sample(self.started)
+        self.samples.append(sample)
+        if self.args.verbose:
+            print(f"  t={sample['time']:6.0f}s rss={sample['rss_mb']:.1f}MB heap={sample['heap_mb']:.2f}MB "
+                  f"py_qobjects={sample['py_qobjects']} widgets={sample['widgets']} fds={sample['fds']} "
+                  f"threads={sample['threads']}", flush=True)
+        if self.warmup_snapshot is None and sample['time'] >= self.warmup():
+            self.warmup_snapshot = tracemalloc.take_snapshot()
+
+    def warmup(self):
+        return self.args.duration * self.args.warmup
+
+    warmup_snapshot = None
+
+    def report(self):
+        simulated = self.args.duration * self.args.speed
+        print(f"Soaked {self.args.duration:g}s at {self.args.speed:g}x "
+              f"(~{simulated / 3600:.1f}h simulated): {self.hooks_sent} hooks, {self.churns} session changes, "
+              f"{len(self.samples)} samples")
+        print(f"  watchdog: {self.watchdog.stalls} stalls, max lag {self.watchdog.max_lag:.0f}ms")
+        print(f"  scheduler: {scheduler().stats()['wakeups_per_minute']:g} wakeups/min")
+
+        if self.args.csv:
+            with open(self.args.csv, 'w') as f:
+                columns = list(self.samples[0]) if self.samples else []
+                f.write(','.join(columns) + '\n')
+                for sample in self.samples:
+                    f.write(','.join(str(sample[column]) for column in columns) + '\n')
+
+        results = analyze(self.samples, self.warmup())
+        if not results:
+            print("✗ Not enough samples after warmup; run longer or sample more often")
+            return 2
+        failed = False
+        for metric, first, last, growth, tolerance, ok in results:
+            mark = '✓' if ok else '✗'
+            print(f"  {mark} {metric:11} {first:10.2f} -> {last:10.2f}  trend {growth:+.2f} (limit {tolerance:g})")
+            failed = failed or not ok
+
+        if self.warmup_snapshot is not None:
+            top = tracemalloc.take_snapshot().compare_to(self.warmup_snapshot, 'lineno')[:5]
+            print("  largest Python heap growth since warmup:")
+            for stat in top:
+                print(f"    {stat}")
+
+        if failed:
+            print("✗ Resource usage kept growing")
+            return 1
+        print("✓ Resource usage stayed flat")
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Soak-test Yadon under simulated sessions and hooks')
+    parser.add_argument('--duration', type=float, default=300, help='wall-clock seconds to run')
+    parser.add_argument('--speed', type=float, default=30, help='timer speed-up factor')
+    parser.add_argument('--sessions', type=int, default=2, help='fake Claude sessions at start')
+    parser.add_argument('--churn', type=float, default=600,
+                        help='simulated seconds between session changes')
+    parser.add_argument('--hook-rate', type=float, default=2,
+                        help='hooks per simulated minute per session')
+    parser.add_argument('--sample-interval', type=float, default=5, help='wall-clock seconds between samples')
+    parser.add_argument('--warmup', type=float, default=0.25, help='fraction of the run ignored for trends')
+    parser.add_argument('--csv', help='write all samples to this CSV file')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print every sample')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    tracemalloc.start()
+    app = QApplication(sys.argv[:1])
+
+    with tempfile.TemporaryDirectory(prefix='yadon_soak_') as tmpdir:
+        # Default settings, so speeding up the timers never touches the user's config.json
+        settings._settings = settings.Settings(os.path.join(tmpdir, 'config.json'))
+        # Keep soak events out of the user's hook history
+        event_store._event_store = event_store.EventStore(os.path.join(tmpdir, 'events.db'))
+
+        soak = Soak(args)
+        # Must be in place before anything creates the process scanner
+        clock._process_source = soak.sessions
+        try:
+            soak.start()
+            app.exec()
+            return soak.report()
+        finally:
+            soak.sessions.close()
+            event_store.get_event_store().close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
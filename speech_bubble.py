@@ -1,13 +1,33 @@
 """Speech bubble widget for Yadon Desktop Pet"""
 
-from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QTimer, QPoint
-from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QPolygon, QFont
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPoint, QRect
+from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QPolygon, QFont, QFontMetrics
 
 from config import (
     BUBBLE_MAX_WIDTH, BUBBLE_MIN_WIDTH, BUBBLE_HEIGHT,
     BUBBLE_PADDING, BUBBLE_FONT_FAMILY, BUBBLE_FONT_SIZE
 )
+from screen_geometry import screen_geometry
+from layout import layout
+
+
+_bubble_font = None
+
+
+def bubble_font():
+    """Return the shared bubble font, creating it on first use"""
+    global _bubble_font
+    if _bubble_font is None:
+        # Bigger Pokemon style monospace font
+        _bubble_font = QFont(BUBBLE_FONT_FAMILY, BUBBLE_FONT_SIZE, QFont.Weight.Bold)
+        _bubble_font.setStyleStrategy(QFont.StyleStrategy.NoAntialias)  # Pixelated look
+    return _bubble_font
+
+
+def preload_bubble_font():
+    """Load the bubble font's glyphs ahead of the first bubble"""
+    QFontMetrics(bubble_font()).horizontalAdvance("やぁん")
 
 
 class SpeechBubble(QWidget):
@@ -16,6 +36,7 @@ class SpeechBubble(QWidget):
         self.parent_widget = parent_widget
         self.text = text
         self.bubble_type = bubble_type  # 'normal' or 'hook'
+        self.last_parent_geometry = None
         
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
@@ -26,10 +47,16 @@ class SpeechBubble(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating, True)
         
-        # Bigger Pokemon style monospace font
-        font = QFont(BUBBLE_FONT_FAMILY, BUBBLE_FONT_SIZE, QFont.Weight.Bold)
-        font.setStyleStrategy(QFont.StyleStrategy.NoAntialias)  # Pixelated look
-        self.setFont(font)
+        self.setFont(bubble_font())
+        
+        # No timer of our own: the parent's moveEvent calls update_position
+        self.set_text(text, bubble_type)
+    
+    def set_text(self, text, bubble_type=None):
+        """Change the message, resizing the existing bubble instead of rebuilding it"""
+        self.text = text
+        if bubble_type:
+            self.bubble_type = bubble_type
         
         # Calculate size based on text with word wrapping
         metrics = self.fontMetrics()
@@ -65,12 +92,9 @@ class SpeechBubble(QWidget):
         self.setFixedSize(bubble_width, bubble_height)
         
         # Position above parent
+        self.last_parent_geometry = None
         self.update_position()
-        
-        # Timer to continuously update position during animation
-        self.follow_timer = QTimer()
-        self.follow_timer.timeout.connect(self.update_position)
-        self.follow_timer.start(50)  # Update every 50ms for smooth following
+        self.update()
     
     def update_position(self):
         if not self.parent_widget or not self.parent_widget.isVisible():
@@ -79,26 +103,34 @@ class SpeechBubble(QWidget):
             return
             
         parent_geometry = self.parent_widget.frameGeometry()
+        if parent_geometry == self.last_parent_geometry:
+            # Parent hasn't moved since the last update
+            return
+        self.last_parent_geometry = parent_geometry
         parent_x = parent_geometry.x()
         parent_y = parent_geometry.y()
         parent_width = parent_geometry.width()
         parent_height = parent_geometry.height()
         
-        # Get screen geometry
-        screen = QApplication.primaryScreen().geometry()
+        # Get the geometry of the screen the parent is on (cached, no Qt query)
+        screen = screen_geometry().screen_for_rect(parent_geometry)
+        screen_left = screen.x()
+        screen_top = screen.y()
+        screen_right = screen.x() + screen.width()
+        screen_bottom = screen.y() + screen.height()
         
         # Default position: above parent
         bubble_x = parent_x + (parent_width - self.width()) // 2
         bubble_y = parent_y - self.height() - 10
         
         # Smart positioning based on screen location
-        if bubble_y < 10:
+        if bubble_y < screen_top + 10:
             # No room above, try below
             bubble_y = parent_y + parent_height + 10
             
-            if bubble_y + self.height() > screen.height() - 10:
+            if bubble_y + self.height() > screen_bottom - 10:
                 # No room below either, show to the side
-                if parent_x > screen.width() // 2:
+                if parent_x > screen_left + screen.width() // 2:
                     # Parent on right side, show bubble on left
                     bubble_x = parent_x - self.width() - 10
                     bubble_y = parent_y + (parent_height - self.height()) // 2
@@ -108,16 +140,40 @@ class SpeechBubble(QWidget):
                     bubble_y = parent_y + (parent_height - self.height()) // 2
         
         # Final bounds check with margin
-        bubble_x = max(10, min(bubble_x, screen.width() - self.width() - 10))
-        bubble_y = max(10, min(bubble_y, screen.height() - self.height() - 10))
+        bubble_x = max(screen_left + 10, min(bubble_x, screen_right - self.width() - 10))
+        bubble_y = max(screen_top + 10, min(bubble_y, screen_bottom - self.height() - 10))
+        
+        # Don't cover another Yadon's bubble (or another Yadon): try the
+        # other sides of our Yadon that fit on the screen
+        obstacles = (self, self.parent_widget)
+        rect = QRect(bubble_x, bubble_y, self.width(), self.height())
+        if not layout().is_free(rect, ignore=obstacles):
+            usable = screen.adjusted(10, 10, -10, -10)
+            center_x = parent_x + (parent_width - self.width()) // 2
+            center_y = parent_y + (parent_height - self.height()) // 2
+            for x, y in ((center_x, parent_y - self.height() - 10),
+                         (center_x, parent_y + parent_height + 10),
+                         (parent_x - self.width() - 10, center_y),
+                         (parent_x + parent_width + 10, center_y)):
+                candidate = QRect(x, y, self.width(), self.height())
+                if usable.contains(candidate) and layout().is_free(candidate, ignore=obstacles):
+                    bubble_x, bubble_y = x, y
+                    break
+            else:
+                # Every side is taken: stack above whatever is in the way
+                while rect.top() > usable.top():
+                    covered = layout().overlapping(rect, ignore=obstacles)
+                    if not covered:
+                        bubble_y = rect.top()
+                        break
+                    rect.moveBottom(min(other.top() for other in covered) - 10)
         
         self.move(bubble_x, bubble_y)
+        layout().update(self, 'bubble')
     
     def close(self):
-        if hasattr(self, 'follow_timer') and self.follow_timer:
-            self.follow_timer.stop()
-            self.follow_timer = None
         self.parent_widget = None  # Clear parent reference
+        layout().forget(self)
         super().close()
     
     def paintEvent(self, event):
@@ -0,0 +1,75 @@
+"""Scaled sprite cache for Yadon Desktop Pet"""
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor
+
+from config import COLOR_SCHEMES
+from pixel_data import build_pixel_data
+
+SPRITE_SIZE = 16  # sprite width/height in sprite pixels
+FACE_ROWS = 10  # rows that move with the face animation
+
+# (variant, patch) -> 16x16 image, one image pixel per sprite pixel
+_base_images = {}
+
+# (variant, face_offset, patch, pixel_size, device_pixel_ratio) -> QPixmap
+_sprites = {}
+
+
+def _base_image(variant, patch=()):
+    """Build the unscaled sprite image for a variant with an animation patch applied"""
+    image = _base_images.get((variant, patch))
+    if image is None:
+        pixel_data = build_pixel_data(variant)
+        colors = COLOR_SCHEMES.get(variant, COLOR_SCHEMES['normal'])
+        for row, column, color in patch:
+            # Patch colors may be color roles like 'body'
+            pixel_data[row][column] = colors.get(color, color)
+        image = QImage(SPRITE_SIZE, SPRITE_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        for y, row in enumerate(pixel_data):
+            for x, color_hex in enumerate(row):
+                # White is the background
+                if color_hex != "#FFFFFF":
+                    image.setPixelColor(x, y, QColor(color_hex))
+        _base_images[(variant, patch)] = image
+    return image
+
+
+def _render_sprite(variant, face_offset, patch, pixel_size, device_pixel_ratio):
+    """Scale the sprite with nearest-neighbor and apply the face offset"""
+    size = round(SPRITE_SIZE * pixel_size * device_pixel_ratio)
+    scaled = _base_image(variant, patch).scaled(
+        size, size,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.FastTransformation
+    )
+    if face_offset:
+        # The face moves by one logical pixel, not one sprite pixel
+        shift = round(face_offset * device_pixel_ratio)
+        face_height = round(FACE_ROWS * pixel_size * device_pixel_ratio)
+        frame = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+        frame.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(frame)
+        painter.drawImage(shift, 0, scaled, 0, 0, size, face_height)
+        painter.drawImage(0, face_height, scaled, 0, face_height, size, size - face_height)
+        painter.end()
+        scaled = frame
+    pixmap = QPixmap.fromImage(scaled)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
+
+
+def get_sprite(variant, face_offset, pixel_size, device_pixel_ratio, patch=()):
+    """Return the sprite pixmap for a frame, rendering it on first use"""
+    key = (variant, face_offset, patch, pixel_size, device_pixel_ratio)
+    pixmap = _sprites.get(key)
+    if pixmap is None:
+        pixmap = _render_sprite(variant, face_offset, patch, pixel_size, device_pixel_ratio)
+        _sprites[key] = pixmap
+    return pixmap
+
+
+def clear_sprite_cache():
+    """Drop all rendered sprites (e.g. after a screen or DPI change)"""
+    _sprites.clear()
@@ -0,0 +1,150 @@
+"""Event loop lag monitor for Yadon Desktop Pet
+
+A heartbeat QTimer on the GUI thread measures how late each tick fires
+compared with when it was scheduled. A helper thread watches the
+heartbeat; when it goes quiet for longer than STALL_THRESHOLD it grabs
+the GUI thread's Python stack with sys._current_frames(), so the log
+says which slot (e.g. check_claude_code) was blocking the event loop.
+"""
+
+import sys
+import time
+import threading
+import traceback
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+from config import WATCHDOG_INTERVAL, STALL_THRESHOLD
+from workers import debug_log
+
+
+def slot_name(frame):
+    """Name the slot a GUI thread stack is in, returning (name, stack)
+
+    The slot is the frame Qt called from the event loop: the one right
+    after the frame sitting in `app.exec()`.
+    """
+    stack = traceback.extract_stack(frame)
+    entry = None
+    for i, summary in enumerate(stack):
+        if '.exec(' in (summary.line or ''):
+            entry = i
+    if entry is not None and entry + 1 < len(stack):
+        slot = stack[entry + 1]
+    elif stack:
+        slot = stack[-1]
+    else:
+        return 'unknown', stack
+    code = _code_for(frame, slot)
+    name = getattr(code, 'co_qualname', slot.name) if code else slot.name
+    return name, stack
+
+
+def _code_for(frame, summary):
+    """Find the code object of the frame a FrameSummary came from"""
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == summary.filename and code.co_name == summary.name:
+            return code
+        frame = frame.f_back
+    return None
+
+
+class Watchdog(QObject):
+    """Measure event loop latency and report stalls with the blocking slot"""
+    def __init__(self, interval=WATCHDOG_INTERVAL, threshold=STALL_THRESHOLD):
+        super().__init__()
+        self.interval = interval  # ms between heartbeats
+        self.threshold = threshold  # ms without a heartbeat that counts as a stall
+        self.gui_thread = threading.get_ident()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.last_beat = None  # time.monotonic() of the last heartbeat
+        self.stall_started = None
+        self.stall_slot = None
+        self.stall_stack = None
+
+        # Metrics
+        self.beats = 0
+        self.last_lag = 0.0  # ms
+        self.max_lag = 0.0
+        self.mean_lag = 0.0  # exponential moving average
+        self.stalls = 0
+        self.stall_time = 0.0  # ms
+        self.max_stall = 0.0
+        self.stalls_by_slot = {}
+
+    def start(self):
+        with self.lock:
+            self.last_beat = time.monotonic()
+        self.timer.start(self.interval)
+        if self.thread is None or not self.thread.is_alive():
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.watch, name='yadon-watchdog', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.stop_event.set()
+
+    def beat(self):
+        """Heartbeat on the GUI thread: measure lag and close any stall"""
+        now = time.monotonic()
+        with self.lock:
+            lag = max(0.0, (now - self.last_beat) * 1000 - self.interval)
+            self.last_beat = now
+            stall_started, slot, stack = self.stall_started, self.stall_slot, self.stall_stack
+            self.stall_started = self.stall_slot = self.stall_stack = None
+        self.beats += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.mean_lag += (lag - self.mean_lag) * 0.05
+        if stall_started is not None or lag >= self.threshold:
+            # A stall shorter than the helper's poll is counted without a stack
+            self.record_stall(lag + self.interval, slot or 'unknown', stack)
+
+    def watch(self):
+        """Helper thread: catch the GUI thread in the act while it is stalled"""
+        poll = self.threshold / 2000
+        while not self.stop_event.wait(poll):
+            with self.lock:
+                if self.stall_started is not None or self.last_beat is None:
+                    continue
+                silent = (time.monotonic() - self.last_beat) * 1000
+                if silent < self.threshold + self.interval:
+                    continue
+                started = self.stall_started = self.last_beat
+            # Format the stack outside the lock so beat() never waits on it
+            frame = sys._current_frames().get(self.gui_thread)
+            if frame is None:
+                continue
+            slot, stack = slot_name(frame)
+            del frame
+            with self.lock:
+                if self.stall_started == started:
+                    self.stall_slot, self.stall_stack = slot, stack
+
+    def record_stall(self, duration, slot, stack):
+        self.stalls += 1
+        self.stall_time += duration
+        self.max_stall = max(self.max_stall, duration)
+        self.stalls_by_slot[slot] = self.stalls_by_slot.get(slot, 0) + 1
+        where = ''.join(traceback.format_list(stack[-6:])) if stack else ''
+        debug_log(f"Event loop stalled {duration:.0f}ms in {slot}\n{where}".rstrip())
+
+    def stats(self):
+        return {
+            'beats': self.beats,
+            'last_lag_ms': round(self.last_lag, 1),
+            'mean_lag_ms': round(self.mean_lag, 1),
+            'max_lag_ms': round(self.max_lag, 1),
+            'stalls': self.stalls,
+            'stall_time_ms': round(self.stall_time),
+            'max_stall_ms': round(self.max_stall),
+            'stalls_by_slot': dict(self.stalls_by_slot),
+        }
@@ -0,0 +1,205 @@
+"""Background workers for Yadon Desktop Pet
+
+Everything that can block - `ps` scans, hook file reads and truncates,
+debug log appends - runs here instead of in Qt timer slots, so a slow
+`ps` or a stalled /tmp never freezes animation or dragging. Results come
+back to the GUI thread through queued signals.
+"""
+
+import time
+import queue
+import atexit
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from config import DEBUG_LOG, SCAN_MIN_AGE
+from clock import get_clock, get_process_source
+
+
+class _Job(QRunnable):
+    def __init__(self, task, args):
+        super().__init__()
+        self.task = task
+        self.args = args
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            result = self.task.fn(*self.args)
+            error = None
+        except Exception as e:
+            result = None
+            error = str(e)
+        try:
+            self.task._done.emit(result, error, time.perf_counter() - start)
+        except RuntimeError:
+            # The owner went away while we were running
+            pass
+
+
+class BackgroundTask(QObject):
+    """Run a function on the thread pool, at most one call at a time
+
+    `finished` is emitted on the GUI thread with the function's result.
+    Calls made while a previous one is still running are skipped rather
+    than queued, so a slow job can never pile up behind itself. On a
+    simulated clock the function runs inline instead.
+    """
+    finished = pyqtSignal(object)
+    _done = pyqtSignal(object, object, float)
+
+    def __init__(self, fn, name=None, clock=None):
+        super().__init__()
+        self.fn = fn
+        self.name = name or getattr(fn, '__name__', 'task')
+        self.clock = clock or get_clock()
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.last_duration = None  # seconds
+        self.last_finished = None  # clock.now()
+        self._done.connect(self._on_done)
+
+    def run(self, *args):
+        """Start the function in the background; False if it is still busy"""
+        if self.running:
+            self.skipped += 1
+            return False
+        self.running = True
+        job = _Job(self, args)
+        if self.clock.inline:
+            job.run()
+        else:
+            QThreadPool.globalInstance().start(job)
+        return True
+
+    def _on_done(self, result, error, duration):
+        self.running = False
+        self.runs += 1
+        self.last_duration = duration
+        self.last_finished = self.clock.now()
+        if error is not None:
+            debug_log(f"Background task {self.name} failed: {error}")
+            return
+        self.finished.emit(result)
+
+    def stats(self):
+        return {
+            'runs': self.runs,
+            'skipped': self.skipped,
+            'running': self.running,
+            'last_ms': round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+        }
+
+
+class ProcessScan:
+    """Result of one `ps` snapshot"""
+    def __init__(self, claude_pids, claude_running):
+        self.claude_pids = claude_pids  # PIDs of actual `claude` processes
+        self.claude_running = claude_running  # any Claude-looking process at all
+        self.requesters = set()  # who asked for this scan, filled in by ProcessScanner
+
+
+class ProcessScanner(QObject):
+    """One shared `ps` scan for the monitor and every pet
+
+    Everyone who needs process state calls request() and listens to
+    `scanned`. A request while a scan is in flight, or right after one
+    finished, is answered by that scan instead of starting another.
+    Requests name their requester, and each scan lists whose requests it
+    answers in `requesters`, so a periodic task backs off or resets on
+    its own scans only, not on every scan somebody else asked for.
+    """
+    scanned = pyqtSignal(object)
+
+    def __init__(self, source=None, clock=None):
+        super().__init__()
+        self.source = source or get_process_source()
+        self.clock = clock or get_clock()
+        self.requesters = set()  # waiting on the scan in flight
+        self.task = BackgroundTask(self.source.scan, 'process scan', self.clock)
+        self.task.finished.connect(self.on_scanned)
+
+    def request(self, requester=None):
+        """Ask for a scan; False if a recent one already answers it"""
+        last = self.task.last_finished
+        if last is not None and (self.clock.now() - last) * 1000 < SCAN_MIN_AGE:
+            return False
+        if requester is not None:
+            self.requesters.add(requester)
+        # Already running: the scan in flight answers this request too
+        self.task.run()
+        return True
+
+    def on_scanned(self, scan):
+        scan.requesters, self.requesters = self.requesters, set()
+        self.scanned.emit(scan)
+
+    @property
+    def last_duration(self):
+        return self.task.last_duration
+
+
+_scanner = None
+
+
+def process_scanner():
+    """Return the shared ProcessScanner, creating it on first use"""
+    global _scanner
+    if _scanner is None:
+        _scanner = ProcessScanner()
+    return _scanner
+
+
+class AsyncLog:
+    """Append lines to a log file from a background thread"""
+    def __init__(self, path):
+        self.path = path
+        self.pending = queue.SimpleQueue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def write(self, message):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name='yadon-log', daemon=True)
+                    self.thread.start()
+                    atexit.register(self.flush)
+        self.pending.put(message)
+
+    def run(self):
+        while True:
+            lines = [self.pending.get()]
+            self._write(lines)
+
+    def _write(self, lines):
+        # Batch whatever else has queued up into the same open/append
+        while True:
+            try:
+                lines.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        try:
+            with open(self.path, 'a') as log:
+                log.write(''.join(f"{line}\n" for line in lines))
+        except Exception:
+            pass
+
+    def flush(self):
+        """Write anything still queued (at exit, from the calling thread)"""
+        try:
+            self._write([])
+        except Exception:
+            pass
+
+
+_debug_log = AsyncLog(DEBUG_LOG)
+
+
+def debug_log(message):
+    """Queue a debug message for the log file without blocking the caller"""
+    _debug_log.write(message)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Control a running Yadon Desktop Pet without restarting it.
+
+Usage:
+    python3 yadon_ctl.py set hook_interval 250
+    python3 yadon_ctl.py get [name]
+    python3 yadon_ctl.py pause | resume | reload | status | stats | show | quit
+    python3 yadon_ctl.py profile [seconds]   (needs --profile)
+    python3 yadon_ctl.py hud [on|off]        (diagnostic overlay on every Yadon)
+    python3 yadon_ctl.py watchdog [on|off]   (event loop stall detection, off by default)
+    python3 yadon_ctl.py hook <pid> <line>    (deliver a hook line, as a socket-activated launch does)
+"""
+
+import os
+import sys
+import json
+import socket
+
+from config import CONTROL_SOCKET
+
+
+def control_socket_path():
+    """The control socket: private to this user, under $XDG_RUNTIME_DIR when there is one"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return CONTROL_SOCKET.format(runtime_dir=runtime_dir, uid=os.getuid())
+
+
+def is_server_running(path):
+    """Check if another instance is listening on the control socket"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        client.close()
+
+
+def send_command(command, args=(), timeout=2.0):
+    """Send one command to the running pet and return its decoded response"""
+    path = control_socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(path)
+        request = {'command': command, 'args': list(args)}
+        client.sendall((json.dumps(request) + '\n').encode())
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        client.close()
+    return json.loads(data.decode())
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(__doc__.strip())
+        return 2
+    try:
+        response = send_command(argv[0], argv[1:])
+    except (OSError, ValueError) as e:
+        print(f"Could not reach Yadon: {e}", file=sys.stderr)
+        return 1
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    print(json.dumps(response.get('result'), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
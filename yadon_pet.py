@@ -1,77 +1,135 @@
 #!/usr/bin/env python3
 import sys
+import time
 import random
 import signal
-import subprocess
 import os
+import socket
+import argparse
 from PyQt6.QtWidgets import QApplication, QWidget
-from PyQt6.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QRect
-from PyQt6.QtGui import QPainter, QColor, QMouseEvent, QFont
+from PyQt6.QtCore import Qt, QTimer, QSocketNotifier, QPoint, QPropertyAnimation, QRect, QRectF
+from PyQt6.QtGui import QPainter, QColor, QMouseEvent, QFont, QPixmap
 
 from config import (
     COLOR_SCHEMES, RANDOM_MESSAGES, WELCOME_MESSAGES, GOODBYE_MESSAGES,
-    PIXEL_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT,
-    FACE_ANIMATION_INTERVAL, RANDOM_ACTION_MIN_INTERVAL, RANDOM_ACTION_MAX_INTERVAL,
-    CLAUDE_CHECK_INTERVAL, HOOK_CHECK_INTERVAL, MOVEMENT_DURATION,
+    PIXEL_SIZE, PID_LABEL_HEIGHT,
+    FACE_ANIMATION_INTERVAL, MOVEMENT_MODE, BUSY_ANIMATION_FACTOR,
     TINY_MOVEMENT_RANGE, SMALL_MOVEMENT_RANGE, TINY_MOVEMENT_PROBABILITY,
-    BUBBLE_DISPLAY_TIME, PID_FONT_FAMILY, PID_FONT_SIZE,
-    VARIANT_ORDER, MAX_YADON_COUNT
+    PID_FONT_FAMILY, PID_FONT_SIZE,
+    VARIANT_ORDER, MAX_YADON_COUNT, WATCHDOG_ENABLED, CLAUDE_CHECK_MAX_INTERVAL, HOOK_CHECK_MAX_INTERVAL
 )
-from speech_bubble import SpeechBubble
-from process_monitor import ProcessMonitor, count_claude_processes, get_claude_pids, find_claude_pid
+from speech_bubble import SpeechBubble, preload_bubble_font
+from bubble_queue import BubbleQueue, PRIORITY_CHATTER, PRIORITY_NOTIFICATION, PRIORITY_STOP
+from process_monitor import ProcessMonitor, scan_processes
 from hook_handler import HookHandler
-from pixel_data import build_pixel_data
+from screen_geometry import screen_geometry
+from layout import layout
+from movement import SteppedMover
+from settings import settings
+from yadon_ctl import control_socket_path, is_server_running
+from session_info import session_resolver
+from workers import BackgroundTask, process_scanner, debug_log
+from scheduler import scheduler
+from clock import get_clock
+from sprite_cache import get_sprite, clear_sprite_cache, FACE_ROWS
+from animation import AnimationPlayer, load_animations, preload_frames, damaged_rows
+# The control channel, hook socket, session sampler, event store, watchdog,
+# HUD and profiler are imported where they are first used, so the first
+# frame does not pay for sqlite3, cProfile and friends
+
+_pid_font = None
+
+
+def pid_font():
+    """Return the shared PID label font, creating it on first use"""
+    global _pid_font
+    if _pid_font is None:
+        _pid_font = QFont(PID_FONT_FAMILY, PID_FONT_SIZE)
+        _pid_font.setBold(True)
+    return _pid_font
+
 
 class YadonPet(QWidget):
-    def __init__(self, claude_pid=None, variant='normal'):
+    def __init__(self, claude_pid=None, variant='normal', claude_running=None, defer_setup=False,
+                 pixel_size=PIXEL_SIZE, clock=None):
         super().__init__()
-        self.claude_pid = claude_pid if claude_pid else find_claude_pid()
+        self.clock = clock or get_clock()
+        # Never scan processes here: without a PID, the process monitor
+        # hands us one from the next shared scan
+        self.claude_pid = claude_pid
         self.variant = variant
+        self.pixel_size = pixel_size
+        self.pid_label = None  # pre-rendered PID label pixmap
         
-        # Build pixel data with variant colors
-        self.pixel_data = build_pixel_data(variant)
-        
-        self.face_offset = 0
-        self.animation_direction = 1
         self.drag_position = None
+        self.dragged = False  # moved by the user since the last press
         
         self.bubble = None
+        self.bubble_queue = BubbleQueue(self.show_bubble, self.hide_bubble, self.clock)
         self.prefer_edges = True  # Prefer screen edges where text is less likely
         
         # Claude Code detection
         self.claude_code_active = False
+        self.activity = 'normal'  # 'busy', 'normal' or 'dozing', from SessionSampler
+        self.session_stats = None
+        self.session_info = None  # SessionInfo for claude_pid, resolved in the background
+        self.hud = None  # DiagnosticHud, created on first toggle
+        self.timer_fires = 0  # face, bubble queue and mover timer fires, for the HUD
+        self.bubble_queue.timer.timeout.connect(self.count_timer_fire)
         
         # Hook handler
-        self.hook_handler = HookHandler(self.claude_pid)
+        self.hook_handler = HookHandler(self.claude_pid, self.clock)
         
         # Track PID for updates
         self.previous_pid = self.claude_pid
         
         self.init_ui()
-        self.setup_animation()
-        self.setup_random_actions()
-        self.setup_claude_code_monitor()
+        self.setup_animation(defer_setup)
+        self.setup_movement()
+        if defer_setup:
+            # Random actions are not needed for the first frame
+            self.clock.single_shot(0, self.setup_random_actions)
+        else:
+            self.setup_random_actions()
+        self.setup_claude_code_monitor(claude_running, defer_setup)
+        
+        # Apply setting changes from the control channel to live timers
+        settings().changed.connect(self.apply_setting)
+        
+        session_resolver().resolved.connect(self.on_session_info)
+        session_resolver().request(self.claude_pid)
     
     def closeEvent(self, event):
         """Clean up when closing the widget"""
+        try:
+            settings().changed.disconnect(self.apply_setting)
+            session_resolver().resolved.disconnect(self.on_session_info)
+            process_scanner().scanned.disconnect(self.on_process_scan)
+        except TypeError:
+            pass
         # Clean up bubble
+        self.bubble_queue.clear()
         if self.bubble:
             self.bubble.close()
             self.bubble = None
-        # Stop all timers
+        if self.hud:
+            self.hud.close()
+            self.hud = None
+        # Stop all timers and drop our scheduler jobs
         if hasattr(self, 'timer'):
             self.timer.stop()
-        if hasattr(self, 'action_timer'):
-            self.action_timer.stop()
-        if hasattr(self, 'monitor_timer'):
-            self.monitor_timer.stop()
-        if hasattr(self, 'hook_timer'):
-            self.hook_timer.stop()
+        for job in ('action_job', 'monitor_job', 'hook_job'):
+            if hasattr(self, job):
+                getattr(self, job).stop()
+        if hasattr(self, 'mover'):
+            self.mover.stop()
+        layout().remove(self)
         super().closeEvent(event)
     
     def init_ui(self):
         self.setWindowTitle('Yadon Desktop Pet')
-        self.setFixedSize(WINDOW_WIDTH, WINDOW_HEIGHT)  # Add space for PID display
+        # Add space for PID display below the sprite
+        self.setFixedSize(16 * self.pixel_size, 16 * self.pixel_size + PID_LABEL_HEIGHT)
         
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.setWindowFlags(
@@ -85,107 +143,341 @@ class YadonPet(QWidget):
         self.raise_()
         self.activateWindow()
         
-    def setup_animation(self):
-        self.timer = QTimer()
+        # Sprites are cached per device pixel ratio, so re-render on screen changes
+        if self.windowHandle():
+            self.windowHandle().screenChanged.connect(self.on_screen_changed)
+    
+    def on_screen_changed(self, screen):
+        """Drop cached sprites when moving to a screen with a different DPI"""
+        clear_sprite_cache()
+        self.pid_label = None
+        if self.frames_loaded:
+            self.preload_frames()
+        self.update()
+        
+    def setup_animation(self, defer_setup=False):
+        self.player = AnimationPlayer(load_animations(), self.base_animation(), self.clock)
+        self.player.speed = self.animation_speed()
+        self.frame = self.player.current_frame()
+        self.frames_loaded = False
+        # One single-shot timer, rescheduled for the next frame boundary
+        self.timer = self.clock.timer()
+        self.timer.setSingleShot(True)
+        # Coarse timers may fire early and land just before the frame boundary
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self.animate_face)
-        self.timer.start(FACE_ANIMATION_INTERVAL)
+        self.timer.timeout.connect(self.count_timer_fire)
+        if defer_setup:
+            # The first frame only needs the idle sprite
+            self.clock.single_shot(0, self.preload_frames)
+        else:
+            self.preload_frames()
+        self.schedule_frame()
+    
+    def preload_frames(self):
+        """Render every animation frame for this pet up front"""
+        preload_frames(self.variant, self.pixel_size, self.devicePixelRatioF())
+        self.frames_loaded = True
+    
+    def base_animation(self):
+        """Animation to loop when nothing else is playing"""
+        return 'sleep' if self.activity == 'dozing' else 'idle'
+    
+    def animation_speed(self):
+        """Playback speed from the face interval setting and session activity"""
+        speed = FACE_ANIMATION_INTERVAL / max(1, settings().get('face_interval'))
+        if self.activity == 'busy':
+            speed /= BUSY_ANIMATION_FACTOR
+        return speed
+    
+    def play_animation(self, name):
+        """Start a named animation; one-shot ones return to the base loop"""
+        self.player.play(name)
+        self.show_frame(self.player.current_frame())
+        if self.timer.isActive():
+            self.schedule_frame()
+    
+    def schedule_frame(self):
+        self.timer.start(max(1, int(self.player.time_to_next_frame()) + 1))
+    
+    def on_session_sample(self, stats):
+        """Animate faster while the Claude session works and doze when it idles"""
+        self.session_stats = stats
+        if stats.activity() != self.activity:
+            self.activity = stats.activity()
+            self.player.speed = self.animation_speed()
+            if self.player.animation.loop:
+                self.play_animation(self.base_animation())
+        if self.underMouse():
+            self.setToolTip(self.tooltip_text())
+    
+    def on_session_info(self, pid, info):
+        """Take resolved session metadata, noticing when the PID was reused"""
+        if not self.claude_pid or pid != int(self.claude_pid):
+            return
+        if info is not None and not info.is_claude:
+            # The PID now belongs to another program: let go of it and let
+            # the process monitor match us to a live session again
+            debug_log(f"PID {pid} is no longer Claude, detaching its Yadon")
+            self.set_claude_pid(None)
+            self.hide()
+            process_scanner().request()
+            return
+        old_key = self.session_info.key if self.session_info else None
+        if (info.key if info else None) == old_key:
+            return
+        if old_key is not None:
+            # Same PID, different process: nothing from the old session applies
+            self.session_stats = None
+        self.session_info = info
+        self.pid_label = None
+        self.update(self.label_rect())
+        if self.underMouse():
+            self.setToolTip(self.tooltip_text())
+    
+    def tooltip_text(self):
+        parts = []
+        if self.session_info:
+            parts.append(self.session_info.summary())
+        if self.session_stats:
+            parts.append(self.session_stats.summary())
+        return '\n'.join(parts)
+    
+    def enterEvent(self, event):
+        """Show the session's project and CPU sparkline on hover"""
+        self.setToolTip(self.tooltip_text())
+        super().enterEvent(event)
+    
+    def random_action_interval(self):
+        return random.randint(settings().get('random_action_min_interval'),
+                              max(settings().get('random_action_min_interval'),
+                                  settings().get('random_action_max_interval')))
+    
+    def apply_setting(self, name, value):
+        """Apply a changed setting to this pet's running timers"""
+        if name == 'face_interval':
+            self.player.advance()
+            self.player.speed = self.animation_speed()
+            if self.timer.isActive():
+                self.schedule_frame()
+        elif name == 'hook_interval':
+            self.hook_job.set_interval(value)
+        elif name == 'claude_check_interval':
+            self.monitor_job.set_interval(value)
+        elif name in ('random_action_min_interval', 'random_action_max_interval'):
+            if hasattr(self, 'action_job') and self.action_job.active:
+                self.action_job.set_interval(self.random_action_interval())
+        elif name == 'movement_fps' and hasattr(self, 'mover'):
+            self.mover.fps = value
+        elif name == 'movement_duration' and hasattr(self, 'animation'):
+            self.animation.setDuration(value)
+    
+    def pause(self):
+        """Stop all timers, keeping the pet on screen"""
+        self.timer.stop()
+        self.monitor_job.pause()
+        self.hook_job.pause()
+        if hasattr(self, 'action_job'):
+            self.action_job.pause()
+        if hasattr(self, 'mover'):
+            self.mover.stop()
+    
+    def resume(self):
+        # Don't fast-forward through the time spent paused
+        self.player.last_time = self.clock.now()
+        self.schedule_frame()
+        self.monitor_job.resume()
+        self.hook_job.resume()
+        if hasattr(self, 'action_job'):
+            self.action_job.resume()
+    
+    def count_timer_fire(self):
+        self.timer_fires += 1
+    
+    def setup_movement(self):
+        """Create the single animator this pet reuses for every move"""
+        if MOVEMENT_MODE == 'stepped':
+            self.mover = SteppedMover(self, self.pixel_size, settings().get('movement_fps'), self.clock)
+            self.mover.timer.timeout.connect(self.count_timer_fire)
+        else:
+            self.animation = QPropertyAnimation(self, b"pos")
+            self.animation.setDuration(settings().get('movement_duration'))
     
     def setup_random_actions(self):
-        self.action_timer = QTimer()
-        self.action_timer.timeout.connect(self.random_action)
-        self.action_timer.start(random.randint(RANDOM_ACTION_MIN_INTERVAL, RANDOM_ACTION_MAX_INTERVAL))
+        self.action_job = scheduler().add('random action', self.random_action, self.random_action_interval())
     
-    def setup_claude_code_monitor(self):
+    def setup_claude_code_monitor(self, claude_running=None, defer_setup=False):
         """Monitor Claude Code process and hook files"""
-        self.monitor_timer = QTimer()
-        self.monitor_timer.timeout.connect(self.check_claude_code)
-        self.monitor_timer.start(CLAUDE_CHECK_INTERVAL)
+        # Scans and hook file I/O run on the thread pool, results come back as signals
+        process_scanner().scanned.connect(self.on_process_scan)
+        self.hook_task = BackgroundTask(self.hook_handler.poll_hook_messages, 'hook poll', self.clock)
+        self.hook_task.finished.connect(self.on_hook_messages)
+        
+        # Both polls back off while nothing happens; see scheduler.py
+        self.monitor_job = scheduler().add('claude check', self.check_claude_code,
+                                           settings().get('claude_check_interval'), CLAUDE_CHECK_MAX_INTERVAL)
         
         # Setup separate hook monitor with faster interval
-        self.hook_timer = QTimer()
-        self.hook_timer.timeout.connect(self.check_hook_messages)
-        self.hook_timer.start(HOOK_CHECK_INTERVAL)
+        self.hook_job = scheduler().add('hook poll', self.check_hook_messages,
+                                        settings().get('hook_interval'), HOOK_CHECK_MAX_INTERVAL)
         
-        # Initial check
-        self.check_claude_code()
+        # Initial check (reuse the startup scan result when we have one)
+        if claude_running is None:
+            self.check_claude_code()
+        elif defer_setup:
+            # Welcome bubble (and its font) can wait for the event loop
+            self.clock.single_shot(0, lambda: self.update_claude_state(claude_running))
+        else:
+            self.update_claude_state(claude_running)
     
     def animate_face(self):
-        self.face_offset += self.animation_direction
-        if self.face_offset >= 1:
-            self.animation_direction = -1
-        elif self.face_offset <= -1:
-            self.animation_direction = 1
-        self.update()
+        self.player.advance()
+        if self.player.finished():
+            self.player.play(self.base_animation())
+        self.show_frame(self.player.current_frame())
+        self.schedule_frame()
+    
+    def show_frame(self, frame):
+        """Switch to a frame, repainting only the sprite rows that change"""
+        rows = damaged_rows(self.frame, frame, FACE_ROWS)
+        self.frame = frame
+        if rows:
+            self.update(QRect(0, 0, self.width(), rows * self.pixel_size))
     
     def paintEvent(self, event):
-        if not self.pixel_data:
-            return
-            
+        # Timed only while the HUD shows it
+        started = time.perf_counter() if self.hud and self.hud.isVisible() else None
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        damaged = event.rect()
         
-        # Clear background with transparency
-        painter.fillRect(self.rect(), QColor(0, 0, 0, 0))
+        # Sprites are pre-scaled for this DPI, so a frame is a blit of the damaged part
+        sprite_rect = self.sprite_rect()
+        sprite_damage = damaged.intersected(sprite_rect)
+        if not sprite_damage.isEmpty():
+            dpr = self.devicePixelRatioF()
+            sprite = get_sprite(self.variant, self.frame.face_offset, self.pixel_size, dpr,
+                                self.frame.patch)
+            source = QRectF(sprite_damage.x() * dpr, sprite_damage.y() * dpr,
+                            sprite_damage.width() * dpr, sprite_damage.height() * dpr)
+            painter.drawPixmap(QRectF(sprite_damage), sprite, source)
         
-        pixel_size = PIXEL_SIZE
+        # PID label is pre-rendered and only redrawn when the PID changes
+        label_rect = self.label_rect()
+        if damaged.intersects(label_rect):
+            if self.pid_label is None:
+                self.render_pid_label()
+            painter.drawPixmap(label_rect.topLeft(), self.pid_label)
+        painter.end()
+        if started is not None:
+            self.hud.paint_finished(started)
+    
+    def sprite_rect(self):
+        return QRect(0, 0, self.width(), 16 * self.pixel_size)
+    
+    def label_rect(self):
+        return QRect(0, 16 * self.pixel_size, self.width(), PID_LABEL_HEIGHT)
+    
+    def render_pid_label(self):
+        """Pre-render the PID label below Yadon"""
+        dpr = self.devicePixelRatioF()
+        label = QPixmap(round(self.width() * dpr), round(PID_LABEL_HEIGHT * dpr))
+        label.setDevicePixelRatio(dpr)
+        label.fill(Qt.GlobalColor.transparent)
         
-        for y in range(16):
-            for x in range(16):
-                color_hex = self.pixel_data[y][x]
-                
-                # Apply face offset only to face rows (top 10 rows)
-                # Move only by 1 pixel, not 1 block
-                if y < 10:
-                    draw_x = x * pixel_size + self.face_offset
-                else:
-                    draw_x = x * pixel_size
-                
-                draw_y = y * pixel_size
-                
-                # Draw non-white pixels
-                if color_hex != "#FFFFFF":
-                    color = QColor(color_hex)
-                    painter.fillRect(draw_x, draw_y, pixel_size, pixel_size, color)
-        
-        # Draw PID below Yadon with white background
+        painter = QPainter(label)
         pid_text = f"{self.claude_pid if self.claude_pid else 'N/A'}"
-        font = QFont(PID_FONT_FAMILY, PID_FONT_SIZE)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setFont(pid_font())
         
         # Calculate text size
         metrics = painter.fontMetrics()
+        project = self.session_info.project if self.session_info else None
+        if project:
+            # Shorten the project name, never the PID
+            room = self.width() - 6 - metrics.horizontalAdvance(f" {pid_text}")
+            project = metrics.elidedText(project, Qt.TextElideMode.ElideRight, room)
+            if project and project != '…':
+                pid_text = f"{project} {pid_text}"
         text_width = metrics.horizontalAdvance(pid_text)
         text_height = metrics.height()
         
         # Draw white background for PID
-        bg_rect = QRect((self.width() - text_width - 4) // 2, 66, text_width + 4, text_height + 2)
+        bg_rect = QRect((self.width() - text_width - 4) // 2, 2, text_width + 4, text_height + 2)
         painter.fillRect(bg_rect, QColor(255, 255, 255, 200))  # Semi-transparent white
         painter.setPen(QColor(0, 0, 0))  # Black border
         painter.drawRect(bg_rect)
         
         # Draw PID text
         painter.setPen(QColor(0, 0, 0))  # Black text
-        painter.drawText(self.rect().adjusted(0, 68, 0, 0), Qt.AlignmentFlag.AlignHCenter, pid_text)
+        painter.drawText(QRect(0, 4, self.width(), PID_LABEL_HEIGHT - 4), Qt.AlignmentFlag.AlignHCenter, pid_text)
+        painter.end()
+        self.pid_label = label
+    
+    def set_claude_pid(self, claude_pid):
+        """Follow a different Claude process"""
+        if claude_pid == self.claude_pid:
+            return
+        self.claude_pid = claude_pid
+        self.previous_pid = claude_pid
+        self.hook_handler.claude_pid = claude_pid
+        self.session_info = None
+        self.session_stats = None
+        session_resolver().request(claude_pid)
+        # Only the label changes
+        self.render_pid_label()
+        self.update(self.label_rect())
     
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
+            self.dragged = False
+            event.accept()
+        elif event.button() == Qt.MouseButton.RightButton:
+            self.toggle_hud()
+            event.accept()
+    
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_D:
+            self.toggle_hud()
             event.accept()
+        else:
+            super().keyPressEvent(event)
+    
+    def toggle_hud(self, show=None):
+        """Show or hide this pet's diagnostic overlay (flip it when show is None)"""
+        if self.hud is None:
+            if show is False:
+                return
+            from diagnostic_hud import DiagnosticHud
+            self.hud = DiagnosticHud(self)
+        if show is None:
+            self.hud.toggle()
+        elif show:
+            self.hud.start()
+        else:
+            self.hud.stop()
     
     def mouseMoveEvent(self, event: QMouseEvent):
         if event.buttons() == Qt.MouseButton.LeftButton and self.drag_position:
             self.move(event.globalPosition().toPoint() - self.drag_position)
+            self.dragged = True
             event.accept()
     
     def mouseReleaseEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self.drag_position = None
+            if self.dragged:
+                # Stay where the user put us, even when the others re-pack
+                layout().pin(self)
             event.accept()
     
     def random_action(self):
         # Yadon mostly does nothing or speaks, rarely moves
-        action = random.choice(['nothing', 'nothing', 'nothing', 'speak', 'speak', 'move', 'move_and_speak'])
+        action = random.choice(['nothing', 'nothing', 'nothing', 'speak', 'speak', 'move', 'move_and_speak',
+                                'blink', 'yawn'])
+        
+        if action in ['blink', 'yawn'] and self.player.animation.loop:
+            self.play_animation(action)
         
         if action in ['move', 'move_and_speak']:
             self.random_move()
@@ -193,12 +485,11 @@ class YadonPet(QWidget):
         if action in ['speak', 'move_and_speak']:
             self.show_message()
         
-        # Reset timer with new random interval (very long intervals)
-        self.action_timer.stop()
-        self.action_timer.start(random.randint(RANDOM_ACTION_MIN_INTERVAL, RANDOM_ACTION_MAX_INTERVAL))
+        # Next action after a new random interval (very long intervals)
+        self.action_job.set_interval(self.random_action_interval())
     
     def random_move(self):
-        screen = QApplication.primaryScreen().geometry()
+        screen = screen_geometry().screen_for_rect(self.frameGeometry())
         current_pos = self.pos()
         
         # Yadon moves very little - just tiny movements
@@ -212,118 +503,155 @@ class YadonPet(QWidget):
             new_x = current_pos.x() + random.randint(-SMALL_MOVEMENT_RANGE, SMALL_MOVEMENT_RANGE)
             new_y = current_pos.y() + random.randint(-SMALL_MOVEMENT_RANGE, SMALL_MOVEMENT_RANGE)
         
-        # Keep within screen bounds
-        new_x = max(0, min(new_x, screen.width() - self.width()))
-        new_y = max(0, min(new_y, screen.height() - self.height()))
+        # Keep within the bounds of the screen we are on
+        new_x = max(screen.left(), min(new_x, screen.x() + screen.width() - self.width()))
+        new_y = max(screen.top(), min(new_y, screen.y() + screen.height() - self.height()))
+        
+        # Don't wander onto another Yadon
+        target = QRect(int(new_x), int(new_y), self.width(), self.height())
+        if not layout().is_free(target, ignore=(self,), kinds=('pet',)):
+            return
         
         # Animate movement - extremely slow like Yadon
-        self.animation = QPropertyAnimation(self, b"pos")
-        self.animation.setDuration(MOVEMENT_DURATION)
-        self.animation.setStartValue(current_pos)
-        self.animation.setEndValue(QPoint(int(new_x), int(new_y)))
-        self.animation.start()
+        if MOVEMENT_MODE == 'stepped':
+            self.mover.move_to(QPoint(int(new_x), int(new_y)), settings().get('movement_duration'))
+        else:
+            self.animation.stop()
+            self.animation.setStartValue(current_pos)
+            self.animation.setEndValue(QPoint(int(new_x), int(new_y)))
+            self.animation.start()
     
     def show_message(self):
+        message = random.choice(RANDOM_MESSAGES)
+        self.bubble_queue.push(message, 'normal', PRIORITY_CHATTER)  # Normal bubble
+    
+    def show_bubble(self, text, bubble_type):
+        """Show text in this pet's bubble, reusing the open bubble if there is one"""
+        if self.bubble and self.bubble.parent_widget:
+            self.bubble.set_text(text, bubble_type)
+        else:
+            self.bubble = SpeechBubble(text, self, bubble_type=bubble_type)
+        self.bubble.show()
+    
+    def hide_bubble(self):
         if self.bubble:
             self.bubble.close()
             self.bubble = None
-        
-        message = random.choice(RANDOM_MESSAGES)
-        self.bubble = SpeechBubble(message, self, bubble_type='normal')  # Normal bubble
-        self.bubble.show()
-        
-        # Hide bubble after 5 seconds
-        def close_bubble():
-            if self.bubble:
-                self.bubble.close()
-                self.bubble = None
-        QTimer.singleShot(BUBBLE_DISPLAY_TIME, close_bubble)
     
     def moveEvent(self, event):
         """Update bubble position when Yadon moves"""
         super().moveEvent(event)
+        if self.isVisible():
+            layout().update(self)
         if self.bubble and self.bubble.isVisible():
             self.bubble.update_position()
-    
+        if self.hud and self.hud.isVisible():
+            self.hud.follow()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        layout().update(self)
+
+    def hideEvent(self, event):
+        # A hidden Yadon keeps its slot but is no obstacle for bubbles
+        super().hideEvent(event)
+        layout().forget(self)
+        self.hide_bubble()
+        if self.hud:
+            self.hud.stop()
+
     
     def check_claude_code(self):
         """Check if Claude Code is running"""
-        try:
-            # Check if PID changed and update hook handler
-            if self.claude_pid != self.previous_pid:
-                self.previous_pid = self.claude_pid
-                self.hook_handler.claude_pid = self.claude_pid
-            
-            # Check for Claude Code process (actual claude, not yadon)
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            lines = result.stdout.strip().split('\n')
-            claude_running = False
-            for line in lines:
-                if 'claude' in line and 'yadon' not in line and 'node' not in line and 'grep' not in line:
-                    claude_running = True
-                    break
-            
-            if claude_running and not self.claude_code_active:
-                # Claude Code just started
-                self.claude_code_active = True
-                self.show_welcome_message()
-                self.show()
-            elif not claude_running and self.claude_code_active:
-                # Claude Code stopped
-                self.claude_code_active = False
-                self.show_goodbye_message()
-                # Hide after goodbye message to prevent showing N/A
-                QTimer.singleShot(BUBBLE_DISPLAY_TIME, self.hide)
-            
-            # Hook messages are now checked by separate timer
-                
-        except Exception as e:
-            print(f"Error checking Claude Code: {e}")
+        # Check if PID changed and update hook handler
+        if self.claude_pid != self.previous_pid:
+            self.previous_pid = self.claude_pid
+            self.hook_handler.claude_pid = self.claude_pid
+        
+        # Cheap when cached; catches the PID being reused by another process
+        session_resolver().request(self.claude_pid)
+        
+        # The shared scanner answers through on_process_scan; when a scan
+        # that just finished answers instead there is nothing new: back off
+        if not process_scanner().request(self):
+            return False
+        
+        # Hook messages are now checked by separate timer
+    
+    def on_process_scan(self, scan):
+        """Check for Claude Code process (actual claude, not yadon)"""
+        if self.monitor_job.active:
+            # Only the scans we asked for move our interval
+            if self in scan.requesters:
+                if scan.claude_running != self.claude_code_active:
+                    self.monitor_job.reset()
+                else:
+                    self.monitor_job.backoff()
+            self.update_claude_state(scan.claude_running)
+    
+    def update_claude_state(self, claude_running):
+        """React to Claude Code starting or stopping"""
+        if claude_running and not self.claude_code_active:
+            # Claude Code just started
+            self.claude_code_active = True
+            self.show_welcome_message()
+            self.show()
+        elif not claude_running and self.claude_code_active:
+            # Claude Code stopped
+            self.claude_code_active = False
+            self.show_goodbye_message()
+            # Hide after goodbye message to prevent showing N/A
+            self.clock.single_shot(settings().get('bubble_display_time'), self.hide)
     
     def check_hook_messages(self):
         """Check for Claude Code hook messages in temp files"""
-        result = self.hook_handler.check_hook_messages()
-        if result:
-            bubble_type, message = result
-            if self.bubble:
-                self.bubble.close()
-                self.bubble = None
-            self.bubble = SpeechBubble(message, self, bubble_type=bubble_type)
-            self.bubble.show()
-            def close_bubble():
-                if self.bubble:
-                    self.bubble.close()
-                    self.bubble = None
-            QTimer.singleShot(BUBBLE_DISPLAY_TIME, close_bubble)
+        # A poll still stuck on a slow /tmp is not doubled up
+        self.hook_task.run()
+    
+    def on_hook_messages(self, messages):
+        # Poll the hook files quickly while hooks keep coming
+        if messages:
+            self.hook_job.reset()
+            self.play_animation('surprised')
+        else:
+            self.hook_job.backoff()
+        for bubble_type, message, hook_type in messages:
+            if hook_type == 'stop':
+                priority = PRIORITY_STOP
+            else:
+                priority = PRIORITY_NOTIFICATION
+            self.bubble_queue.push(message, bubble_type, priority)
     
     
     def show_welcome_message(self):
         """Show message when Claude Code starts"""
         message = random.choice(WELCOME_MESSAGES)
-        if self.bubble:
-            self.bubble.close()
-            self.bubble = None
-        self.bubble = SpeechBubble(message, self, bubble_type='normal')  # Normal bubble
-        self.bubble.show()
-        def close_bubble():
-            if self.bubble:
-                self.bubble.close()
-                self.bubble = None
-        QTimer.singleShot(BUBBLE_DISPLAY_TIME, close_bubble)
+        self.bubble_queue.push(message, 'normal', PRIORITY_NOTIFICATION)  # Normal bubble
     
     def show_goodbye_message(self):
         """Show message when Claude Code stops"""
         message = random.choice(GOODBYE_MESSAGES)
-        if self.bubble:
-            self.bubble.close()
-            self.bubble = None
-        self.bubble = SpeechBubble(message, self, bubble_type='normal')  # Normal bubble
-        self.bubble.show()
-        def close_bubble():
-            if self.bubble:
-                self.bubble.close()
-                self.bubble = None
-        QTimer.singleShot(BUBBLE_DISPLAY_TIME, close_bubble)
+        self.bubble_queue.push(message, 'normal', PRIORITY_NOTIFICATION)  # Normal bubble
+
+
+class StartupTimer:
+    """Record startup phase timings"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+    
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+    
+    def report(self):
+        total = (self.last - self.start) * 1000
+        parts = ', '.join(f"{phase} {ms:.1f}ms" for phase, ms in self.phases)
+        message = f"Startup: {parts} (total {total:.1f}ms)"
+        print(message, flush=True)
+        debug_log(message)
 
 
 def signal_handler(sig, frame):
@@ -332,51 +660,246 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def watch_signals(app):
+    """Wake the Qt event loop when a signal arrives so its Python handler runs
+
+    Python only runs signal handlers once control comes back from Qt;
+    the wakeup fd gets us there without polling.
+    """
+    receiver, sender = socket.socketpair()
+    sender.setblocking(False)
+    receiver.setblocking(False)
+    signal.set_wakeup_fd(sender.fileno())
+    notifier = QSocketNotifier(receiver.fileno(), QSocketNotifier.Type.Read, app)
+    notifier.activated.connect(lambda: receiver.recv(64))
+    # Keep the sockets alive as long as the app
+    app._signal_sockets = (receiver, sender)
+    return notifier
+
+
+def parse_args(argv):
+    """Parse our own options, leaving the rest for Qt"""
+    parser = argparse.ArgumentParser(description='Yadon Desktop Pet')
+    parser.add_argument('--fast-start', action='store_true',
+                        default=os.environ.get('YADON_FAST_START') == '1',
+                        help='scan processes once, show the first Yadon immediately and defer the rest')
+    parser.add_argument('--pixel-size', type=int,
+                        default=int(os.environ.get('YADON_PIXEL_SIZE', PIXEL_SIZE)),
+                        help=f'size of one sprite pixel in logical pixels (default {PIXEL_SIZE})')
+    parser.add_argument('--idle-exit', action='store_true',
+                        default=os.environ.get('YADON_IDLE_EXIT') == '1',
+                        help='quit after a while without Claude sessions (always on when socket-activated)')
+    parser.add_argument('--profile', action='store_true',
+                        default=os.environ.get('YADON_PROFILE') == '1',
+                        help='count and time every timer slot and event handler (report on exit or SIGUSR1)')
+    parser.add_argument('--profile-window', type=float, metavar='SECONDS',
+                        default=float(os.environ.get('YADON_PROFILE_WINDOW', 0)),
+                        help='with --profile, also run cProfile for the first SECONDS')
+    return parser.parse_known_args(argv[1:])
+
+
+# Commands a second launch forwards to the running instance
+INSTANCE_COMMANDS = ('show', 'reload', 'quit')
+
+
+def forward_to_running_instance(command):
+    """Send command to an already running Yadon; False if there is none"""
+    if not is_server_running(control_socket_path()):
+        return False
+    from yadon_ctl import send_command
+    try:
+        response = send_command(command)
+    except (OSError, ValueError) as e:
+        print(f"Yadon is already running but did not answer: {e}", file=sys.stderr)
+        return True
+    if response.get('ok'):
+        print(f"Yadon is already running: {command} -> {response.get('result')}")
+    else:
+        print(f"Yadon is already running: {command} failed: {response.get('error')}", file=sys.stderr)
+    return True
+
+
+def forward_inherited_hooks():
+    """Hand hooks queued on a systemd socket to the running instance
+
+    A socket-activated launch that finds Yadon already running must read
+    the datagram that started it, or systemd keeps starting the unit.
+    """
+    from hook_socket import drain_inherited_socket
+    from hook_client import decode_datagram
+    from yadon_ctl import send_command
+    for data in drain_inherited_socket():
+        claude_pid, message = decode_datagram(data)
+        if not message:
+            continue
+        try:
+            send_command('hook', [claude_pid or '', message])
+        except (OSError, ValueError) as e:
+            print(f"Could not hand a hook to the running Yadon: {e}", file=sys.stderr)
+
+
+def create_pet(index, claude_pids, claude_running=None, defer_setup=False,
+               pixel_size=PIXEL_SIZE, clock=None):
+    """Create the Yadon for Claude session index and move it into place"""
+    # Pass specific Claude PID to each Yadon
+    claude_pid = claude_pids[index] if index < len(claude_pids) else None
+    # Randomly select variant with equal probability
+    variant = random.choice(VARIANT_ORDER)
+    pet = YadonPet(claude_pid=claude_pid, variant=variant,
+                   claude_running=claude_running, defer_setup=defer_setup,
+                   pixel_size=pixel_size, clock=clock)
+    
+    # Lowest free slot, stacking from the bottom-right corner
+    layout().place_pet(pet)
+    return pet
+
+
+_services = []
+
+
+def deliver_socket_hook(pets, claude_pid):
+    """Have the pet a socket hook is for read it now instead of on its next poll"""
+    for pet in pets:
+        if claude_pid is None:
+            if pet.hook_handler.handles_generic:
+                pet.check_hook_messages()
+        elif pet.claude_pid and int(pet.claude_pid) == claude_pid:
+            pet.check_hook_messages()
+
+
+def start_services(pets, monitor, idle_exit=False):
+    """Start the control channel, hook socket, session sampler and watchdog for the given pets"""
+    from control import ControlServer
+    from hook_socket import HookSocketServer, IdleExit
+    from session_sampler import SessionSampler
+    from event_store import get_event_store
+    from watchdog import Watchdog
+    hook_socket = HookSocketServer()
+    if hook_socket.start():
+        hook_socket.received.connect(lambda claude_pid: deliver_socket_hook(pets, claude_pid))
+        QApplication.instance().aboutToQuit.connect(hook_socket.close)
+    
+    sampler = SessionSampler(pets)
+    sampler.start()
+    services = [monitor, sampler]
+    if idle_exit or hook_socket.activated:
+        # Started on demand: go away again when there is nothing to watch
+        idle = IdleExit()
+        idle.start()
+        services.append(idle)
+    watchdog = None
+    if WATCHDOG_ENABLED:
+        watchdog = Watchdog()
+        watchdog.start()
+        services.append(watchdog)
+    control_server = ControlServer(pets, services, watchdog)
+    control_server.hook_received.connect(lambda claude_pid: deliver_socket_hook(pets, claude_pid))
+    if control_server.start():
+        QApplication.instance().aboutToQuit.connect(control_server.stop)
+    elif is_server_running(control_socket_path()):
+        # Lost a startup race with another instance: leave the pets to it
+        debug_log("Another Yadon instance owns the control socket, exiting")
+        QTimer.singleShot(0, QApplication.instance().quit)
+    # Flush hook history on exit
+    QApplication.instance().aboutToQuit.connect(get_event_store().close)
+    # Keep references for the lifetime of the app
+    _services.extend([control_server, hook_socket] + services)
+
+
+def fast_start(app, timer, pixel_size=PIXEL_SIZE, idle_exit=False):
+    """Show the first Yadon right away and build everything else from the event loop"""
+    # Get Claude process PIDs with a single scan
+    scan = scan_processes()
+    claude_pids, claude_running = scan.claude_pids, scan.claude_running
+    timer.mark('process scan')
+    
+    num_pets = min(len(claude_pids), MAX_YADON_COUNT) if claude_pids else 1
+    
+    pets = [create_pet(0, claude_pids, claude_running, True, pixel_size)]
+    timer.mark('first pet')
+    
+    monitor = ProcessMonitor(pets)
+    monitor.last_count = num_pets
+    
+    def finish_startup():
+        for i in range(1, num_pets):
+            pets.append(create_pet(i, claude_pids, claude_running, True, pixel_size))
+        timer.mark('remaining pets')
+        preload_bubble_font()
+        timer.mark('bubble font')
+        monitor.start()
+        start_services(pets, monitor, idle_exit)
+        timer.report()
+    
+    # Runs once the event loop has started and the first pet is on screen
+    QTimer.singleShot(0, finish_startup)
+    return pets, monitor
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'ctl':
+        # `yadon_pet.py ctl ...` talks to the running instance
+        from yadon_ctl import main as ctl_main
+        sys.exit(ctl_main(sys.argv[2:]))
+    
+    # Only one instance runs; later launches hand their command to it
+    command = 'show'
+    if len(sys.argv) > 1 and sys.argv[1] in INSTANCE_COMMANDS:
+        command = sys.argv.pop(1)
+    if forward_to_running_instance(command):
+        forward_inherited_hooks()
+        sys.exit(0)
+    if command == 'quit':
+        print("Yadon is not running", file=sys.stderr)
+        sys.exit(1)
+    
+    startup_timer = StartupTimer()
+    options, qt_args = parse_args(sys.argv)
+    
     # Set up signal handler for clean exit
     signal.signal(signal.SIGINT, signal_handler)
     
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup_timer.mark('qapplication')
+    
+    if options.profile:
+        import profiling
+        from session_sampler import SessionSampler
+        from scheduler import Scheduler
+        # Pets created later by ProcessMonitor import this module by name
+        sys.modules.setdefault('yadon_pet', sys.modules[__name__])
+        # Wrap the slots before any pet connects them
+        profiling.enable(app, [YadonPet, ProcessMonitor, SpeechBubble, SessionSampler, SteppedMover, Scheduler],
+                         options.profile_window)
     
     # Also handle Ctrl+C in Qt event loop
-    timer = QTimer()
-    timer.timeout.connect(lambda: None)  # Dummy timer to process events
-    timer.start(500)
+    watch_signals(app)
+    
+    if options.fast_start:
+        pets, monitor = fast_start(app, startup_timer, options.pixel_size, options.idle_exit)
+        try:
+            sys.exit(app.exec())
+        except KeyboardInterrupt:
+            sys.exit(0)
     
-    # Create Yadon pets based on number of Claude Code processes
+    # One `ps` gives both the number of Yadons and their PIDs
     pets = []
-    claude_count = count_claude_processes()
+    scan = scan_processes()
+    claude_pids = scan.claude_pids
+    startup_timer.mark('process scan')
     
     # Create one Yadon for each Claude Code process (up to 4)
-    num_pets = min(claude_count, MAX_YADON_COUNT) if claude_count > 0 else 1
-    
-    screen = QApplication.primaryScreen().geometry()
-    
-    # Get Claude process PIDs (actual claude processes only)
-    claude_pids = get_claude_pids()
-    
-    # Calculate positions for bottom-right alignment
-    # Stack them horizontally from right to left at the bottom
-    margin = 20  # Margin from screen edges
-    spacing = 10  # Space between Yadons
+    num_pets = min(len(claude_pids), MAX_YADON_COUNT) if claude_pids else 1
     
     for i in range(num_pets):
-        # Pass specific Claude PID to each Yadon
-        claude_pid = claude_pids[i] if i < len(claude_pids) else None
-        # Randomly select variant with equal probability
-        variant = random.choice(VARIANT_ORDER)
-        pet = YadonPet(claude_pid=claude_pid, variant=variant)
-        
-        # Position in bottom-right, stacking from right to left
-        x_pos = screen.width() - margin - (WINDOW_WIDTH + spacing) * (i + 1)
-        y_pos = screen.height() - margin - WINDOW_HEIGHT
-        pet.move(x_pos, y_pos)
-        
-        pets.append(pet)
+        pets.append(create_pet(i, claude_pids, scan.claude_running, pixel_size=options.pixel_size))
+    startup_timer.mark('pets')
     
     # Monitor for changes in Claude Code processes
     monitor = ProcessMonitor(pets)
     monitor.start()
+    start_services(pets, monitor, options.idle_exit)
+    startup_timer.report()
     
     try:
         sys.exit(app.exec())
@@ -384,4 +907,4 @@ def main():
         sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()